@@ -0,0 +1,427 @@
+import argparse
+import functools
+import json
+import os
+import sys
+import time
+from typing import Callable, NamedTuple, Optional, TypeVar
+
+from Main.Game.classic_woodoku import ClassicWoodoku
+from Main.Game.piece import Piece
+from Main.Game.position import Position
+from Main.Solver.bellman import Bellman
+from Main.Solver.euler import Euler
+from Main.Solver.selector import Selector
+from Main.Util.generate_pieces import get_piece_by_id, get_piece_id
+
+T = TypeVar("T")
+
+BENCHMARK_SEEDS: tuple[int, ...] = tuple(range(8))
+MAX_MOVES: int = 300
+# the moves of the games that the engine benchmarks replay, stored so that the
+# workload stays the same when the solvers change
+GAMES_PATH: str = os.path.join(os.path.dirname(__file__), "benchmark_games.json")
+# the results that runs are compared against, which only mean anything on the
+# machine they were measured on, so they are written with --update-baseline
+# on that machine rather than kept in the repository
+BASELINE_PATH: str = os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+# the largest fraction of the baseline rate that a benchmark may lose before
+# it counts as a regression
+DEFAULT_THRESHOLD: float = 0.3
+# every timing is of enough calls to take at least this long, so that the
+# overhead and the resolution of the timer do not matter
+MIN_SECONDS: float = 0.05
+
+
+class BenchmarkResult(NamedTuple):
+    """The time that a benchmark took to do a number of operations
+    """
+    name: str
+    operations: int
+    seconds: float
+
+    @property
+    def rate(self) -> float:
+        """Returns the number of operations per second
+        """
+        return self.operations / self.seconds if self.seconds > 0 else 0.0
+
+
+class Regression(NamedTuple):
+    """A benchmark that got slower than it's baseline by more than the threshold
+    """
+    name: str
+    baseline_rate: float
+    rate: float
+
+    @property
+    def slowdown(self) -> float:
+        """Returns the fraction of the baseline rate that was lost
+        """
+        return 1 - self.rate / self.baseline_rate
+
+
+def record_game(seed: int, max_moves: int = MAX_MOVES) -> list[tuple[Piece, Position]]:
+    """Returns the moves of a game of ClassicWoodoku with the given seed,
+    played by a Bellman solver so that the game goes on long enough to cover
+    crowded boards as well as empty ones. This is only used to write the
+    stored games with --record-games.
+
+    Args:
+        seed (int): The seed of the game
+        max_moves (int, optional): The most moves to record. Defaults to
+        MAX_MOVES.
+
+    Returns:
+        list[tuple[Piece, Position]]: The moves of the game, until it is over
+        or max_moves have been made
+    """
+    game = ClassicWoodoku(seed=seed)
+    solver = Bellman(beam_width=4)
+    moves = []
+    while (not game.is_over() and len(moves) < max_moves):
+        move = solver.get_move(game)
+        game.place_piece(*move)
+        moves.append(move)
+    return moves
+
+
+def write_games(seeds: tuple[int, ...] = BENCHMARK_SEEDS, path: str = GAMES_PATH) -> None:
+    """Records a game of every seed and stores their moves, as the id of the
+    piece and the row and column of the position
+
+    Args:
+        seeds (tuple[int, ...], optional): The seeds of the games. Defaults
+        to BENCHMARK_SEEDS.
+        path (str, optional): The file to write. Defaults to GAMES_PATH.
+    """
+    games = {str(seed): [[get_piece_id(piece), pos.row, pos.col]
+                         for piece, pos in record_game(seed)]
+             for seed in seeds}
+    with open(path, "w") as games_file:
+        json.dump(games, games_file)
+        games_file.write("\n")
+
+
+@functools.lru_cache(maxsize=None)
+def load_game(seed: int, path: str = GAMES_PATH) -> tuple[tuple[Piece, Position], ...]:
+    """Returns the stored moves of the game of the given seed
+
+    Args:
+        seed (int): The seed of the game
+        path (str, optional): The file of the stored games. Defaults to
+        GAMES_PATH.
+
+    Returns:
+        tuple[tuple[Piece, Position], ...]: The moves of the game
+    """
+    with open(path, "r") as games_file:
+        moves = json.load(games_file)[str(seed)]
+    return tuple((get_piece_by_id(piece_id), Position(row, col)) for piece_id, row, col in moves)
+
+
+def game_states(seeds: tuple[int, ...] = BENCHMARK_SEEDS) -> list[tuple[ClassicWoodoku, tuple[Piece, Position]]]:
+    """Replays the stored game of every seed, and returns a copy of the state
+    before every move along with the move
+
+    Args:
+        seeds (tuple[int, ...], optional): The seeds of the games. Defaults
+        to BENCHMARK_SEEDS.
+
+    Returns:
+        list[tuple[ClassicWoodoku, tuple[Piece, Position]]]: Every state and
+        the move that is made in it
+    """
+    states = []
+    for seed in seeds:
+        game = ClassicWoodoku(seed=seed)
+        for move in load_game(seed):
+            states.append((game.copy(), move))
+            game.place_piece(*move)
+    return states
+
+
+def time_batches(name: str, prepare: Callable[[], T], run: Callable[[T], int],
+                 repeats: int = 5, min_seconds: float = MIN_SECONDS) -> BenchmarkResult:
+    """Times a benchmark the way timeit does. The benchmark is run over as
+    many batches as it takes to fill min_seconds in a single timing, and the
+    result is the median of a few such timings. The batches are prepared
+    before the timing starts, so that work which has to be done anew for
+    every run (e.g. copying the states that the run changes) is not timed.
+
+    Args:
+        name (str): The name of the benchmark
+        prepare (Callable[[], T]): Returns a new batch to run on
+        run (Callable[[T], int]): Does the work on a batch and returns the
+        number of operations it did
+        repeats (int, optional): The number of timings. Defaults to 5.
+        min_seconds (float, optional): The least time of a timing. Defaults
+        to MIN_SECONDS.
+
+    Returns:
+        BenchmarkResult: The timing with the median rate
+    """
+    def __time(number: int) -> BenchmarkResult:
+        batches = [prepare() for _ in range(number)]
+        start = time.perf_counter()
+        operations = sum(run(batch) for batch in batches)
+        return BenchmarkResult(name, operations, time.perf_counter() - start)
+
+    number = 1
+    result = __time(number)
+    while (result.seconds < min_seconds):
+        number *= 2
+        result = __time(number)
+    results = [result] + [__time(number) for _ in range(repeats - 1)]
+    return median_result(results)
+
+
+def median_result(results: list[BenchmarkResult]) -> BenchmarkResult:
+    """Returns the result with the median rate
+    """
+    return sorted(results, key=lambda result: result.rate)[len(results) // 2]
+
+
+def benchmark_place_piece(seeds: tuple[int, ...] = BENCHMARK_SEEDS,
+                          repeats: int = 5) -> BenchmarkResult:
+    """Times ClassicWoodoku.place_piece over the moves of the stored games
+    """
+    states = game_states(seeds)
+
+    def __place_pieces(batch: list[tuple[ClassicWoodoku, tuple[Piece, Position]]]) -> int:
+        for state, move in batch:
+            state.place_piece(*move)
+        return len(batch)
+
+    return time_batches("classic_place_piece",
+                        lambda: [(state.copy(), move) for state, move in states],
+                        __place_pieces, repeats)
+
+
+def benchmark_piece_will_fit(seeds: tuple[int, ...] = BENCHMARK_SEEDS,
+                             repeats: int = 5) -> BenchmarkResult:
+    """Times ClassicWoodoku.piece_will_fit for every available piece at every
+    position of the board, over the states of the stored games
+    """
+    states = [state for state, _ in game_states(seeds)]
+    positions = [Position(row, col) for row in range(9) for col in range(9)]
+
+    def __fit_everywhere(batch: list[ClassicWoodoku]) -> int:
+        operations = 0
+        for state in batch:
+            pieces = state.get_available_pieces()
+            for piece in pieces:
+                for pos in positions:
+                    state.piece_will_fit(piece, pos)
+            operations += len(pieces) * len(positions)
+        return operations
+
+    return time_batches("classic_piece_will_fit", lambda: states, __fit_everywhere, repeats)
+
+
+def benchmark_is_over(seeds: tuple[int, ...] = BENCHMARK_SEEDS,
+                      repeats: int = 5) -> BenchmarkResult:
+    """Times ClassicWoodoku.is_over over new copies of the states of the
+    stored games, so that nothing is cached from the last call
+    """
+    states = [state for state, _ in game_states(seeds)]
+
+    def __is_over(batch: list[ClassicWoodoku]) -> int:
+        for state in batch:
+            state.is_over()
+        return len(batch)
+
+    return time_batches("classic_is_over", lambda: [state.copy() for state in states],
+                        __is_over, repeats)
+
+
+def benchmark_copy(seeds: tuple[int, ...] = BENCHMARK_SEEDS,
+                   repeats: int = 5) -> BenchmarkResult:
+    """Times ClassicWoodoku.copy over the states of the stored games
+    """
+    states = [state for state, _ in game_states(seeds)]
+
+    def __copy(batch: list[ClassicWoodoku]) -> int:
+        for state in batch:
+            state.copy()
+        return len(batch)
+
+    return time_batches("classic_copy", lambda: states, __copy, repeats)
+
+
+def benchmark_legal_moves(seeds: tuple[int, ...] = BENCHMARK_SEEDS,
+                          repeats: int = 5) -> BenchmarkResult:
+    """Times Selector.get_legal_moves over new copies of the states of the
+    stored games, which is the first time that each copy is asked for them
+    """
+    states = [state for state, _ in game_states(seeds)]
+
+    def __legal_moves(batch: list[ClassicWoodoku]) -> int:
+        for state in batch:
+            Selector.get_legal_moves(state)
+        return len(batch)
+
+    return time_batches("selector_get_legal_moves", lambda: [state.copy() for state in states],
+                        __legal_moves, repeats)
+
+
+def benchmark_euler(seconds_per_move: float = 0.25, seeds: tuple[int, ...] = BENCHMARK_SEEDS,
+                    repeats: int = 5) -> BenchmarkResult:
+    """Times single searches of Euler from the first state of a game of every
+    seed, counting the iterations by the visits of the root. The searches run
+    for a fixed time, so the result is the median of a few repeats.
+
+    Args:
+        seconds_per_move (float, optional): The time budget of every search.
+        Defaults to 0.25.
+        seeds (tuple[int, ...], optional): The seeds of the games and the
+        solvers. Defaults to BENCHMARK_SEEDS.
+        repeats (int, optional): The number of times to search from every
+        state. Defaults to 5.
+
+    Returns:
+        BenchmarkResult: The repeat with the median rate
+    """
+    results = []
+    for _ in range(repeats):
+        operations = 0
+        seconds = 0.0
+        for seed in seeds:
+            solver = Euler(seconds_per_move=seconds_per_move, seed=seed, reuse_tree=False)
+            start = time.perf_counter()
+            root = solver.search(ClassicWoodoku(seed=seed))
+            seconds += time.perf_counter() - start
+            operations += root.times_visited
+        results.append(BenchmarkResult("euler_iterations", operations, seconds))
+    return median_result(results)
+
+
+def run_benchmarks(seeds: tuple[int, ...] = BENCHMARK_SEEDS, repeats: int = 5,
+                   euler_seconds: float = 0.25) -> list[BenchmarkResult]:
+    """Runs every benchmark, keeping the median of a few repeats of each to
+    cut down on noise from the rest of the machine
+
+    Args:
+        seeds (tuple[int, ...], optional): The seeds of the games. Defaults
+        to BENCHMARK_SEEDS.
+        repeats (int, optional): The number of timings of every benchmark.
+        Defaults to 5.
+        euler_seconds (float, optional): The time budget of every Euler
+        search. Defaults to 0.25.
+
+    Returns:
+        list[BenchmarkResult]: The median result of every benchmark
+    """
+    return [benchmark_place_piece(seeds, repeats),
+            benchmark_piece_will_fit(seeds, repeats),
+            benchmark_is_over(seeds, repeats),
+            benchmark_copy(seeds, repeats),
+            benchmark_legal_moves(seeds, repeats),
+            benchmark_euler(euler_seconds, seeds, repeats)]
+
+
+def results_to_json(results: list[BenchmarkResult]) -> dict:
+    """Returns the results as a dictionary that can be written as JSON
+
+    Args:
+        results (list[BenchmarkResult]): The results of the benchmarks
+
+    Returns:
+        dict: The operations, seconds and rate of every benchmark by name
+    """
+    return {"python": sys.version.split()[0],
+            "benchmarks": {result.name: {"operations": result.operations,
+                                         "seconds": result.seconds,
+                                         "rate": result.rate}
+                           for result in results}}
+
+
+def compare(results: list[BenchmarkResult], baseline: dict,
+            threshold: float = DEFAULT_THRESHOLD) -> list[Regression]:
+    """Returns the benchmarks whose rate fell below their baseline rate by
+    more than the threshold. Benchmarks that are not in the baseline are
+    skipped.
+
+    Args:
+        results (list[BenchmarkResult]): The results of the benchmarks
+        baseline (dict): The JSON of the baseline results
+        threshold (float, optional): The largest fraction of the baseline
+        rate that may be lost. Defaults to DEFAULT_THRESHOLD.
+
+    Returns:
+        list[Regression]: The benchmarks that regressed
+    """
+    regressions = []
+    for result in results:
+        entry = baseline.get("benchmarks", {}).get(result.name)
+        if (entry is None):
+            continue
+        if (result.rate < entry["rate"] * (1 - threshold)):
+            regressions.append(Regression(result.name, entry["rate"], result.rate))
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Runs the benchmarks, writes the results and compares them against the
+    baseline. The baseline is made for the machine that the benchmarks run on
+    by running once with --update-baseline, e.g.
+    python -m Main.Environment.benchmark --update-baseline, and running
+    without a baseline fails rather than passing without a comparison.
+
+    Args:
+        argv (list[str], optional): The command line arguments. Defaults to
+        the arguments of the process.
+
+    Returns:
+        int: The exit code, 1 if any benchmark regressed and 2 if there is no
+        baseline to compare against
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks the game engine and the solvers")
+    parser.add_argument("--output", help="the file to write the results to as JSON")
+    parser.add_argument("--baseline", default=BASELINE_PATH,
+                        help="the JSON file of the results to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="the largest fraction of a baseline rate that may be lost")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write the results to the baseline instead of comparing")
+    parser.add_argument("--record-games", action="store_true",
+                        help="record and store the games that are replayed, then exit")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--euler-seconds", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    if (args.record_games):
+        write_games()
+        return 0
+
+    if (not args.update_baseline and not os.path.exists(args.baseline)):
+        print(f"No baseline at {args.baseline}, create one on this machine with --update-baseline",
+              file=sys.stderr)
+        return 2
+
+    results = run_benchmarks(repeats=args.repeats, euler_seconds=args.euler_seconds)
+    for result in results:
+        print(f"{result.name}: {result.rate:.1f}/s ({result.operations} in {result.seconds:.3f}s)")
+
+    output = results_to_json(results)
+    if (args.output is not None):
+        with open(args.output, "w") as output_file:
+            json.dump(output, output_file, indent=2)
+            output_file.write("\n")
+
+    if (args.update_baseline):
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(output, baseline_file, indent=2)
+            baseline_file.write("\n")
+        return 0
+
+    with open(args.baseline, "r") as baseline_file:
+        regressions = compare(results, json.load(baseline_file), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression.name}: {regression.rate:.1f}/s is "
+              f"{regression.slowdown:.0%} slower than {regression.baseline_rate:.1f}/s")
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
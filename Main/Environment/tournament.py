@@ -0,0 +1,199 @@
+import argparse
+import inspect
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, NamedTuple, Optional
+
+import tqdm #type: ignore
+
+from Main.Game.bitboard_woodoku import BitboardWoodoku
+from Main.Game.classic_woodoku import ClassicWoodoku
+from Main.Game.woodoku_game import WoodokuGame
+from Main.Solver.bellman import Bellman
+from Main.Solver.boltzmann import Boltzmann
+from Main.Solver.euler import Euler
+from Main.Solver.laplace import Laplace
+from Main.Solver.pythagoras import Pythagoras
+from Main.Solver.solver import Solver
+
+SOLVERS: dict[str, type[Solver]] = {
+    "bellman": Bellman,
+    "boltzmann": Boltzmann,
+    "euler": Euler,
+    "laplace": Laplace,
+    "pythagoras": Pythagoras,
+}
+GAMES: dict[str, type[WoodokuGame]] = {
+    "bitboard": BitboardWoodoku,
+    "classic": ClassicWoodoku,
+}
+
+
+class SolverConfig(NamedTuple):
+    """A solver to play in a tournament, by the name of it's class in SOLVERS
+    and the keyword arguments to create it with, if any
+    """
+    label: str
+    solver: str
+    kwargs: Optional[dict[str, Any]] = None
+
+    @staticmethod
+    def parse(text: str) -> "SolverConfig":
+        """Returns the config written as the name of a solver, optionally
+        followed by a colon and a JSON object of it's keyword arguments, e.g.
+        euler:{"seconds_per_move": 0.1}. The text is also the label.
+
+        Args:
+            text (str): The config
+
+        Raises:
+            ValueError: If the solver is unknown, or the arguments are not a
+            JSON object
+
+        Returns:
+            SolverConfig: The parsed config
+        """
+        solver, _, kwargs = text.partition(":")
+        if (solver not in SOLVERS):
+            raise ValueError(f"Unknown solver {solver}, must be one of {sorted(SOLVERS)}")
+        parsed = json.loads(kwargs) if kwargs else {}
+        if (not isinstance(parsed, dict)):
+            raise ValueError("Invalid solver arguments, must be a JSON object")
+        return SolverConfig(text, solver, parsed)
+
+
+class GameResult(NamedTuple):
+    """The result of one game of a tournament
+    """
+    label: str
+    seed: int
+    score: int
+    moves: int
+    seconds: float
+    # the time that the solver took to choose every move
+    move_seconds: list[float]
+
+
+def play_game(config: SolverConfig, seed: int, game: str = "classic") -> GameResult:
+    """Plays one game with a new solver made from the config, timing every
+    move. Solvers that take a seed are given the seed of the game, unless the
+    config sets it.
+
+    Args:
+        config (SolverConfig): The solver to play with
+        seed (int): The seed of the game
+        game (str, optional): The name of the game type in GAMES. Defaults
+        to "classic".
+
+    Returns:
+        GameResult: The result of the game
+    """
+    solver_type = SOLVERS[config.solver]
+    kwargs = dict(config.kwargs or {})
+    if ("seed" not in kwargs and "seed" in inspect.signature(solver_type).parameters):
+        kwargs["seed"] = seed
+    solver = solver_type(**kwargs)
+    state = GAMES[game](seed=seed)
+
+    start = time.perf_counter()
+    score = 0
+    move_seconds = []
+    try:
+        while (not state.is_over()):
+            move_start = time.perf_counter()
+            piece, position = solver.get_move(state)
+            move_seconds.append(time.perf_counter() - move_start)
+            score += state.place_piece(piece, position)
+    finally:
+        close = getattr(solver, "close", None)
+        if (close is not None):
+            close()
+    return GameResult(config.label, seed, score, len(move_seconds),
+                      time.perf_counter() - start, move_seconds)
+
+
+def run_tournament(configs: list[SolverConfig], seeds: list[int], output_path: str,
+                   game: str = "classic", workers: Optional[int] = None,
+                   progress: bool = True) -> list[GameResult]:
+    """Plays a game of every seed with every solver, spread over a pool of
+    processes. Every result is written to the output as a line of JSON as
+    soon as it's game finishes, so a tournament that is stopped part of the
+    way through keeps the games that were played. A game that raises is
+    written as a line with the error instead, and the rest of the games go on.
+
+    Args:
+        configs (list[SolverConfig]): The solvers to play with
+        seeds (list[int]): The seeds of the games
+        output_path (str): The JSONL file to append the results to
+        game (str, optional): The name of the game type in GAMES. Defaults
+        to "classic".
+        workers (int, optional): The number of processes to play in. Defaults
+        to the number of processors.
+        progress (bool, optional): Whether to show a progress bar. Defaults
+        to True.
+
+    Returns:
+        list[GameResult]: The results of every game that finished without
+        raising, in the order that they finished
+    """
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool, \
+            open(output_path, "a") as output_file, \
+            tqdm.tqdm(total=len(configs) * len(seeds), disable=not progress) as progress_bar:
+        futures = {pool.submit(play_game, config, seed, game): (config, seed)
+                   for config in configs for seed in seeds}
+        for future in as_completed(futures):
+            config, seed = futures[future]
+            try:
+                result = future.result()
+            except Exception as error:
+                output_file.write(json.dumps({"label": config.label, "seed": seed,
+                                              "error": repr(error)}) + "\n")
+                progress_bar.set_postfix_str(f"{config.label} seed {seed}: {error!r}")
+            else:
+                output_file.write(json.dumps(result._asdict()) + "\n")
+                results.append(result)
+                progress_bar.set_postfix_str(f"{result.label} seed {result.seed}: {result.score}")
+            output_file.flush()
+            progress_bar.update()
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Runs a tournament from the command line, and prints the average score
+    of every solver
+
+    Args:
+        argv (list[str], optional): The command line arguments. Defaults to
+        the arguments of the process.
+
+    Returns:
+        int: The exit code
+    """
+    parser = argparse.ArgumentParser(description="Plays solvers against many seeds")
+    parser.add_argument("--solver", action="append", required=True, type=SolverConfig.parse,
+                        help='a solver, optionally with JSON arguments, e.g. euler:{"seconds_per_move": 0.1}')
+    parser.add_argument("--seeds", type=int, default=100, help="the number of seeds to play")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--game", choices=sorted(GAMES), default="classic")
+    parser.add_argument("--workers", type=int, help="defaults to the number of processors")
+    parser.add_argument("--output", default="tournament.jsonl", help="the JSONL file to append to")
+    args = parser.parse_args(argv)
+
+    seeds = list(range(args.first_seed, args.first_seed + args.seeds))
+    # a solver that is given more than once only plays once
+    configs = list({config.label: config for config in args.solver}.values())
+    results = run_tournament(configs, seeds, args.output, args.game, args.workers)
+    for config in configs:
+        scores = [result.score for result in results if result.label == config.label]
+        if (len(scores) == 0):
+            print(f"{config.label}: every game failed")
+            continue
+        print(f"{config.label}: average score {sum(scores) / len(scores):.1f} over {len(scores)} games")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
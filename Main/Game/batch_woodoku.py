@@ -0,0 +1,399 @@
+from typing import Callable, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from Main.Game.classic_woodoku import InvalidMoveError
+from Main.Game.piece import Piece
+from Main.Game.position import Position
+from Main.Game.woodoku_game import HAND_SIZE, WoodokuGame
+from Main.Util.generate_pieces import get_piece_id, get_pieces
+from Main.Util.random_stream import RandomStream
+
+SIZE: int = 9
+CELLS: int = SIZE * SIZE
+
+
+def _build_section_matrix() -> np.ndarray:
+    """Returns a (27, 81) boolean matrix whose rows are the 9 rows, then the
+    9 columns, then the 9 3x3 squares of the board
+    """
+    sections = np.zeros((27, SIZE, SIZE), dtype=bool)
+    for i in range(SIZE):
+        sections[i, i, :] = True
+        sections[SIZE + i, :, i] = True
+        box_row, box_col = (i // 3) * 3, (i % 3) * 3
+        sections[2 * SIZE + i, box_row:box_row + 3, box_col:box_col + 3] = True
+    return sections.reshape(27, CELLS)
+
+
+def _build_placement_tensor() -> np.ndarray:
+    """Returns a (pieces, 81, 81) boolean tensor, where entry [p, a] is the
+    mask of the tiles covered by catalog piece p when anchored at the flat
+    index a, or all False if the piece would not be in bounds there
+    """
+    pieces = get_pieces()
+    placements = np.zeros((len(pieces), CELLS, CELLS), dtype=bool)
+    for piece_id, piece in enumerate(pieces):
+        max_row = max(row for row, _ in piece.cells)
+        max_col = max(col for _, col in piece.cells)
+        for row in range(SIZE - max_row):
+            for col in range(SIZE - max_col):
+                for cell_row, cell_col in piece.cells:
+                    placements[piece_id, row * SIZE + col,
+                               (row + cell_row) * SIZE + col + cell_col] = True
+    return placements
+
+
+SECTIONS: np.ndarray = _build_section_matrix()
+PLACEMENTS: np.ndarray = _build_placement_tensor()
+IN_BOUNDS: np.ndarray = PLACEMENTS.any(axis=2)
+FILLED: np.ndarray = np.array([piece.filled for piece in get_pieces()])
+
+
+def pack_boards(boards: np.ndarray) -> np.ndarray:
+    """Packs boards into two 64 bit words each, so that testing a placement
+    against a board is a couple of bitwise operations
+
+    Args:
+        boards (np.ndarray): The boards, with the 81 tiles along the last axis
+
+    Returns:
+        np.ndarray: The packed boards, with the 2 words along the last axis
+    """
+    packed = np.packbits(boards, axis=-1, bitorder="little")
+    padding = np.zeros(packed.shape[:-1] + (16 - packed.shape[-1],), dtype=np.uint8)
+    return np.concatenate([packed, padding], axis=-1).view(np.uint64)
+
+
+PACKED_PLACEMENTS: np.ndarray = pack_boards(PLACEMENTS)
+# the number of tiles every placement adds to each section, (pieces, 81, 27)
+PLACEMENT_SECTION_COUNTS: np.ndarray = (
+    PLACEMENTS.astype(np.int16) @ SECTIONS.T.astype(np.int16)).astype(np.int8)
+
+_SECTION_MATRIX = SECTIONS.T.astype(np.float32)
+
+
+def section_counts(boards: np.ndarray) -> np.ndarray:
+    """Returns the number of filled tiles in each of the 27 sections
+
+    Args:
+        boards (np.ndarray): The boards, with the 81 tiles along the last axis
+
+    Returns:
+        np.ndarray: The int8 counts of the sections of every board
+    """
+    return (boards.astype(np.float32) @ _SECTION_MATRIX).astype(np.int8)
+
+
+def _build_piece_patterns() -> np.ndarray:
+    """Returns a (pieces, n, n) boolean tensor of the filled tiles of every
+    catalog piece, where n is the largest height or width of any piece
+    """
+    pieces = get_pieces()
+    pattern_size = max(max(piece.get_size()) for piece in pieces)
+    patterns = np.zeros((len(pieces), pattern_size, pattern_size), dtype=bool)
+    for piece_id, piece in enumerate(pieces):
+        for row, col in piece.cells:
+            patterns[piece_id, row, col] = True
+    return patterns
+
+
+PIECE_PATTERNS: np.ndarray = _build_piece_patterns()
+_PATTERN_MATRIX = PIECE_PATTERNS.reshape(len(PIECE_PATTERNS), -1).T.astype(np.float32)
+
+
+def legal_move_masks(boards: np.ndarray) -> np.ndarray:
+    """Returns, for a batch of boards, every anchor where each piece in the
+    catalog fits. The boards are padded with filled tiles so that pieces
+    hanging off the board overlap them, and every piece is tested against the
+    sliding windows of the padded boards at once.
+
+    Args:
+        boards (np.ndarray): A (boards, 9, 9) boolean array of the boards
+
+    Returns:
+        np.ndarray: A (boards, pieces, 81) boolean array, which is True at
+        [b, p, a] iff catalog piece p can be placed on board b with the
+        top-left corner of it's bounding box at the flat index a
+    """
+    padding = PIECE_PATTERNS.shape[1] - 1
+    padded = np.pad(boards.astype(np.float32), ((0, 0), (0, padding), (0, padding)),
+                    constant_values=1)
+    windows = sliding_window_view(padded, PIECE_PATTERNS.shape[1:], axis=(1, 2))
+    overlaps = windows.reshape(len(boards) * CELLS, -1) @ _PATTERN_MATRIX
+    return (overlaps == 0).reshape(len(boards), CELLS, -1).transpose(0, 2, 1)
+
+
+def batch_is_over(boards: np.ndarray, hands: np.ndarray) -> np.ndarray:
+    """Returns whether or not the game is over for each of a batch of boards
+
+    Args:
+        boards (np.ndarray): A (boards, 9, 9) boolean array of the boards
+        hands (np.ndarray): A (boards, pieces in hand) array of the catalog
+        ids of the available pieces of every board, with -1 for no piece
+
+    Returns:
+        np.ndarray: A boolean array which is True for every board where none
+        of the available pieces can be placed
+    """
+    masks = legal_move_masks(boards)
+    legal = masks[np.arange(len(boards))[:, None], np.maximum(hands, 0)]
+    return ~(legal.any(axis=2) & (hands >= 0)).any(axis=1)
+
+
+def get_legal_moves_batch(states: list[WoodokuGame]) -> list[list[tuple[Piece, Position]]]:
+    """Returns the legal moves of every given game state, in the same order as
+    Selector.get_legal_moves, using one batched computation for all of them
+
+    Args:
+        states (list[WoodokuGame]): The game states to get the legal moves of,
+        which may only have catalog pieces available
+
+    Raises:
+        ValueError: If a state has a piece available that is not in the
+        catalog
+
+    Returns:
+        list[list[tuple[Piece, Position]]]: The legal moves of every state
+    """
+    if (len(states) == 0):
+        return []
+    masks = legal_move_masks(np.array([state.board for state in states], dtype=bool))
+    all_moves: list[list[tuple[Piece, Position]]] = []
+    for state, mask in zip(states, masks):
+        moves: list[tuple[Piece, Position]] = []
+        for piece in state.get_available_pieces():
+            piece_id = get_piece_id(piece)
+            if (piece_id >= mask.shape[0]):
+                raise ValueError(f"Invalid piece, {piece_id} is not the id of a catalog piece")
+            moves.extend((piece, Position.from_index(anchor))
+                         for anchor in np.flatnonzero(mask[piece_id]))
+        all_moves.append(moves)
+    return all_moves
+
+
+def cleared_sections(section_counts: np.ndarray) -> np.ndarray:
+    """Returns which sections are cleared after a placement, given the number
+    of filled tiles in each of the 27 sections after the piece is added.
+
+    ClassicWoodoku clears full rows, then full columns, then full squares, one
+    group after the other, so a column only clears if no row was cleared (every
+    row crosses every column), and a square only clears if no row crossing it
+    and no column crossing it was cleared.
+
+    Args:
+        section_counts (np.ndarray): The tile counts of the sections, with the
+        27 sections along the last axis
+
+    Returns:
+        np.ndarray: A boolean array with the same shape as section_counts that
+        is True for every section that is cleared
+    """
+    full = section_counts == SIZE
+    rows = full[..., :SIZE]
+    cols = full[..., SIZE:2 * SIZE] & ~rows.any(axis=-1, keepdims=True)
+    band_cleared = rows.reshape(rows.shape[:-1] + (3, 3)).any(axis=-1)
+    stack_cleared = cols.reshape(cols.shape[:-1] + (3, 3)).any(axis=-1)
+    blocked = (band_cleared[..., :, None] | stack_cleared[..., None, :])
+    boxes = full[..., 2 * SIZE:] & ~blocked.reshape(blocked.shape[:-2] + (SIZE,))
+    return np.concatenate([rows, cols, boxes], axis=-1)
+
+
+class BatchWoodoku:
+    """Simulates many classic Woodoku games at once. The boards, hands and
+    consecutive clear counters of every game are stored as arrays, and every
+    step applies one move to each game that is not over, computing the
+    placements, clears, rewards and game overs of the whole batch with array
+    operations. Each game draws it's pieces from it's own RNG stream, so a
+    game in the batch plays out exactly like ClassicWoodoku(seed=seed) would
+    given the same moves.
+
+    Hands hold the catalog ids of the pieces (see get_pieces), with -1 for a
+    piece that has already been used this turn. Moves are given as the index
+    of the piece in the hand and the flat index row * 9 + col of the position.
+    """
+
+    def __init__(self, seeds: list[int]):
+        """Creates a batch of new games with empty boards
+
+        Args:
+            seeds (list[int]): The seed of the RNG of every game in the batch
+        """
+        self.__rngs = [RandomStream(seed) for seed in seeds]
+        self.__boards = np.zeros((len(seeds), CELLS), dtype=bool)
+        self.__hands = np.full((len(seeds), HAND_SIZE), -1, dtype=np.int64)
+        self.__consecutive_clears = np.zeros(len(seeds), dtype=np.int64)
+        self.__scores = np.zeros(len(seeds), dtype=np.int64)
+        self.__moves = np.zeros(len(seeds), dtype=np.int64)
+        self.__legal_moves = np.zeros((len(seeds), HAND_SIZE, CELLS), dtype=bool)
+        self.__refill(np.arange(len(seeds)))
+        self.__compute_legal_moves(np.arange(len(seeds)))
+        self.__over = ~self.__legal_moves.any(axis=(1, 2))
+
+    def __refill(self, games: np.ndarray) -> None:
+        """Draws a new hand for each of the given games
+        """
+        # sampling the ids draws the same numbers as sampling the catalog
+        catalog_ids = range(len(get_pieces()))
+        for game in games:
+            self.__hands[game] = self.__rngs[game].sample(catalog_ids, HAND_SIZE)
+
+    def __compute_legal_moves(self, games: np.ndarray) -> None:
+        """Updates the (games, 3, 81) boolean array of the anchors where every
+        piece in the hands of the given games fits
+        """
+        hands = self.__hands[games]
+        packed_boards = pack_boards(self.__boards[games])[:, None, None, :]
+        overlaps = PACKED_PLACEMENTS[np.maximum(hands, 0)] & packed_boards
+        self.__legal_moves[games] = (((overlaps[..., 0] | overlaps[..., 1]) == 0)
+                                     & IN_BOUNDS[np.maximum(hands, 0)]
+                                     & (hands >= 0)[:, :, None])
+
+    def legal_moves(self) -> np.ndarray:
+        """Returns a (games, 3, 81) boolean array, which is True at [g, s, a]
+        iff the piece in slot s of the hand of game g can be placed at the flat
+        index a
+        """
+        return self.__legal_moves.copy()
+
+    def step(self, slots: np.ndarray, anchors: np.ndarray) -> np.ndarray:
+        """Places one piece in every game that is not over. The moves given
+        for games that are over are ignored.
+
+        Args:
+            slots (np.ndarray): The index in the hand of the piece to place,
+            for every game
+            anchors (np.ndarray): The flat index of the top-left corner of the
+            bounding box of the piece to place, for every game
+
+        Raises:
+            InvalidMoveError: If any of the moves for a game that is not over
+            is illegal
+
+        Returns:
+            np.ndarray: The reward for the move of every game, 0 for games
+            that were already over
+        """
+        games = np.flatnonzero(~self.__over)
+        slots = np.asarray(slots)[games]
+        anchors = np.asarray(anchors)[games]
+        if (not self.__legal_moves[games, slots, anchors].all()):
+            raise InvalidMoveError(
+                "The given piece does not fit in the given position")
+
+        piece_ids = self.__hands[games, slots]
+        boards = self.__boards[games] | PLACEMENTS[piece_ids, anchors]
+        cleared = cleared_sections(section_counts(boards))
+        cleared_tiles = (cleared.astype(np.float32) @ SECTIONS.astype(np.float32)) > 0
+        self.__boards[games] = boards & ~cleared_tiles
+
+        cleared_count = cleared.sum(axis=1)
+        rewards = np.zeros(len(self), dtype=np.int64)
+        rewards[games] = (18 * (self.__consecutive_clears[games] + 1) * cleared_count
+                          + FILLED[piece_ids])
+        self.__consecutive_clears[games] = np.where(
+            cleared_count > 0, self.__consecutive_clears[games] + 1, 0)
+        self.__scores += rewards
+        self.__moves[games] += 1
+
+        self.__hands[games, slots] = -1
+        self.__refill(games[(self.__hands[games] < 0).all(axis=1)])
+        self.__compute_legal_moves(games)
+        self.__over[games] = ~self.__legal_moves[games].any(axis=(1, 2))
+        return rewards
+
+    def random_moves(self, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+        """Picks a uniformly random legal move for every game, games that
+        are over get the move (0, 0)
+
+        Args:
+            rng (np.random.Generator): The generator to pick the moves with
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The hand slot and anchor of the move
+            for every game
+        """
+        choices = np.zeros(len(self), dtype=np.int64)
+        games = np.flatnonzero(~self.__over)
+        legal = self.__legal_moves[games].reshape(len(games), -1)
+        choices[games] = np.argmax(rng.random(legal.shape) * legal, axis=1)
+        return choices // CELLS, choices % CELLS
+
+    def greedy_moves(self) -> tuple[np.ndarray, np.ndarray]:
+        """Picks the legal move with the highest immediate reward for every
+        game, breaking ties by the order of the hand and then by row-column
+        order. Games that are over get the move (0, 0)
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The hand slot and anchor of the move
+            for every game
+        """
+        choices = np.zeros(len(self), dtype=np.int64)
+        games = np.flatnonzero(~self.__over)
+        hands = np.maximum(self.__hands[games], 0)
+        counts = (section_counts(self.__boards[games])[:, None, None, :]
+                  + PLACEMENT_SECTION_COUNTS[hands])
+        cleared_count = cleared_sections(counts).sum(axis=-1)
+        rewards = (18 * (self.__consecutive_clears[games, None, None] + 1) * cleared_count
+                   + FILLED[hands][:, :, None])
+        rewards = np.where(self.__legal_moves[games], rewards, -1)
+        choices[games] = np.argmax(rewards.reshape(len(games), -1), axis=1)
+        return choices // CELLS, choices % CELLS
+
+    def play(self, policy: Callable[["BatchWoodoku"], tuple[np.ndarray, np.ndarray]],
+             max_steps: Optional[int] = None) -> np.ndarray:
+        """Steps every game with the moves chosen by the given policy until
+        all of the games are over
+
+        Args:
+            policy (Callable[[BatchWoodoku], tuple[np.ndarray, np.ndarray]]):
+            Returns the hand slots and anchors of the moves to make in a batch
+            max_steps (int, optional): The maximum number of steps to take.
+            Defaults to no limit.
+
+        Returns:
+            np.ndarray: The score of every game
+        """
+        steps = 0
+        while (not self.__over.all() and (max_steps is None or steps < max_steps)):
+            self.step(*policy(self))
+            steps += 1
+        return self.scores
+
+    def __len__(self) -> int:
+        return len(self.__rngs)
+
+    @property
+    def boards(self) -> np.ndarray:
+        """Returns a copy of the boards of every game as a (games, 9, 9)
+        boolean array
+        """
+        return self.__boards.reshape(len(self), SIZE, SIZE).copy()
+
+    @property
+    def hands(self) -> np.ndarray:
+        """Returns a copy of the catalog ids of the pieces in every hand, with
+        -1 for pieces that have been used
+        """
+        return self.__hands.copy()
+
+    @property
+    def consecutive_clears(self) -> np.ndarray:
+        return self.__consecutive_clears.copy()
+
+    @property
+    def scores(self) -> np.ndarray:
+        return self.__scores.copy()
+
+    @property
+    def moves(self) -> np.ndarray:
+        """Returns the number of moves made in every game
+        """
+        return self.__moves.copy()
+
+    @property
+    def over(self) -> np.ndarray:
+        """Returns whether or not every game is over
+        """
+        return self.__over.copy()
@@ -0,0 +1,208 @@
+from Main.Game.piece import Piece
+from Main.Game.position import Position
+from Main.Util.generate_pieces import get_piece_id
+
+# The board is stored as a single integer where the tile at (row, col)
+# is represented by the bit at index row * SIZE + col.
+SIZE: int = 9
+CELLS: int = SIZE * SIZE
+FULL_MASK: int = (1 << CELLS) - 1
+
+
+def cell_bit(row: int, col: int) -> int:
+    """Returns the mask with only the tile at the given row and column set
+
+    Args:
+        row (int): The row of the tile
+        col (int): The column of the tile
+
+    Returns:
+        int: The mask for the single tile
+    """
+    return 1 << (row * SIZE + col)
+
+
+ROW_MASKS: tuple[int, ...] = tuple(
+    sum(cell_bit(row, col) for col in range(SIZE)) for row in range(SIZE))
+COL_MASKS: tuple[int, ...] = tuple(
+    sum(cell_bit(row, col) for row in range(SIZE)) for col in range(SIZE))
+BOX_MASKS: tuple[int, ...] = tuple(
+    sum(cell_bit(box_row + i, box_col + j)
+        for i in range(3) for j in range(3))
+    for box_row in range(0, SIZE, 3) for box_col in range(0, SIZE, 3))
+
+
+def board_to_mask(board: list[list[bool]]) -> int:
+    """Converts a 2-D matrix of booleans into the bitboard representation
+
+    Args:
+        board (list[list[bool]]): The board to convert
+
+    Returns:
+        int: The occupancy mask of the board
+    """
+    mask = 0
+    for row in range(SIZE):
+        for col in range(SIZE):
+            if (board[row][col]):
+                mask |= cell_bit(row, col)
+    return mask
+
+
+def mask_to_board(mask: int) -> list[list[bool]]:
+    """Converts an occupancy mask back into a 2-D matrix of booleans
+
+    Args:
+        mask (int): The occupancy mask to convert
+
+    Returns:
+        list[list[bool]]: The board that the mask represents
+    """
+    return [[bool(mask >> (row * SIZE + col) & 1) for col in range(SIZE)]
+            for row in range(SIZE)]
+
+
+# maps the id of a piece onto (mask, max row offset, max col offset)
+_GEOMETRY_CACHE: dict[int, tuple[int, int, int]] = {}
+
+
+def piece_geometry(piece: Piece) -> tuple[int, int, int]:
+    """Returns the mask of the given piece when anchored at (0, 0), along with
+    the largest row and column offset of any of it's filled tiles. A piece
+    anchored at (row, col) is in bounds iff row + max_row < SIZE and
+    col + max_col < SIZE, in which case it's mask is the anchored mask shifted
+    left by row * SIZE + col.
+
+    Args:
+        piece (Piece): The piece to compute the geometry for
+
+    Returns:
+        tuple[int, int, int]: The anchored mask, max row offset and max column
+        offset of the piece
+    """
+    piece_id = get_piece_id(piece)
+    geometry = _GEOMETRY_CACHE.get(piece_id)
+    if (geometry is None):
+        cells = piece.cells
+        mask = 0
+        for row, col in cells:
+            mask |= cell_bit(row, col)
+        geometry = (mask,
+                    max((row for row, _ in cells), default=0),
+                    max((col for _, col in cells), default=0))
+        _GEOMETRY_CACHE[piece_id] = geometry
+    return geometry
+
+
+# maps the id of a piece onto it's placement table
+_PLACEMENT_CACHE: dict[int, tuple[tuple[Position, int], ...]] = {}
+
+
+def placement_table(piece: Piece) -> tuple[tuple[Position, int], ...]:
+    """Returns every anchor at which the given piece lies within the bounds of
+    the board, in row-column order, together with the mask of the tiles it
+    covers when placed there. The piece fits at an anchor iff it's mask does
+    not intersect the occupancy of the board. The table is only built once
+    per piece.
+
+    Args:
+        piece (Piece): The piece to get the placement table for
+
+    Returns:
+        tuple[tuple[Position, int], ...]: The in-bounds anchors of the piece
+        and the mask for each of them
+    """
+    piece_id = get_piece_id(piece)
+    table = _PLACEMENT_CACHE.get(piece_id)
+    if (table is None):
+        mask, max_row, max_col = piece_geometry(piece)
+        table = tuple((Position(row, col), mask << (row * SIZE + col))
+                      for row in range(SIZE - max_row)
+                      for col in range(SIZE - max_col))
+        _PLACEMENT_CACHE[piece_id] = table
+    return table
+
+
+# maps the mask of a placed piece onto the sections that it touches
+_SECTION_CACHE: dict[int, tuple[tuple[int, ...], tuple[int, ...],
+                                tuple[int, ...]]] = {}
+
+
+def touched_sections(placed_mask: int) -> tuple[tuple[int, ...], tuple[int, ...],
+                                                tuple[int, ...]]:
+    """Returns the masks of the rows, columns and 3x3 squares that intersect
+    the given placed piece. These are the only sections that a placement can
+    complete, so they are the only ones that need checking for a clear.
+
+    Args:
+        placed_mask (int): The mask of the tiles covered by a placed piece
+
+    Returns:
+        tuple[tuple[int, ...], tuple[int, ...], tuple[int, ...]]: The touched
+        row masks, column masks and square masks
+    """
+    sections = _SECTION_CACHE.get(placed_mask)
+    if (sections is None):
+        sections = (tuple(row for row in ROW_MASKS if row & placed_mask),
+                    tuple(col for col in COL_MASKS if col & placed_mask),
+                    tuple(box for box in BOX_MASKS if box & placed_mask))
+        _SECTION_CACHE[placed_mask] = sections
+    return sections
+
+
+def clear_sections(occupancy: int, placed_mask: int) -> tuple[int, int]:
+    """Clears every section completed by placing the given piece. Rows, then
+    columns, then squares are cleared one group after the other, so a column
+    that was only full because of a cleared row does not count (this matches
+    ClassicWoodoku). Assumes that no section was full before the placement.
+
+    Args:
+        occupancy (int): The occupancy of the board, including the placed piece
+        placed_mask (int): The mask of the tiles covered by the placed piece
+
+    Returns:
+        tuple[int, int]: The occupancy after clearing and the number of
+        sections that were cleared
+    """
+    cleared_count = 0
+    for section_masks in touched_sections(placed_mask):
+        cleared = 0
+        for section in section_masks:
+            if (occupancy & section == section):
+                cleared |= section
+                cleared_count += 1
+        occupancy &= ~cleared
+    return occupancy, cleared_count
+
+
+# every tile except the ones in the first and last column
+_NOT_FIRST_COL: int = FULL_MASK & ~COL_MASKS[0]
+_NOT_LAST_COL: int = FULL_MASK & ~COL_MASKS[SIZE - 1]
+
+
+def empty_neighbours(occupancy: int) -> int:
+    """Returns the mask of every tile that has at least one empty tile directly
+    above, below, left or right of it
+
+    Args:
+        occupancy (int): The occupancy of the board
+
+    Returns:
+        int: The mask of the tiles with an empty neighbour
+    """
+    empty = FULL_MASK & ~occupancy
+    return (((empty >> 1) & _NOT_LAST_COL) | ((empty << 1) & _NOT_FIRST_COL)
+            | (empty >> SIZE) | ((empty << SIZE) & FULL_MASK))
+
+
+def isolated_holes(occupancy: int) -> int:
+    """Returns the mask of every empty tile whose neighbours are all filled
+    or off the board, these can only ever be filled by the single tile piece
+
+    Args:
+        occupancy (int): The occupancy of the board
+
+    Returns:
+        int: The mask of the isolated empty tiles
+    """
+    return FULL_MASK & ~occupancy & ~empty_neighbours(occupancy)
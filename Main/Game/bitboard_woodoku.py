@@ -0,0 +1,252 @@
+from typing import Optional, Union
+from Main.Game.position import Position
+
+from Main.Util.generate_pieces import get_piece_id, get_pieces
+from Main.Util.random_stream import RandomStream
+from Main.Game.woodoku_game import HAND_SIZE, MoveRecord, WoodokuGame
+from Main.Game.piece import Piece
+from Main.Game.placeability import PlaceabilityTracker, anchor_positions
+from Main.Game.zobrist import KEY_MASK, board_hash, clear_key, hand_hash, piece_key
+from Main.Game.bitboard import (board_to_mask, clear_sections, mask_to_board,
+                                piece_geometry)
+
+
+class BitboardWoodoku(WoodokuGame):
+    """Represents the classic Woodoku game, with the same rules and rewards
+    as ClassicWoodoku, but with the 81 tiles of the board stored as a single
+    integer. Every piece is turned into a precomputed mask so that checking
+    for fit, placing a piece and clearing sections are all a handful of
+    integer operations rather than walks over the grid.
+    """
+    SIZE: int = 9
+
+    def __init__(self, board: Union[list[list[bool]], int, None] = None,
+                 consecutive_clears=0,
+                 available_pieces: Optional[list[Piece]] = None,
+                 seed=0,
+                 rng: Optional[RandomStream] = None):
+        """Initalizes a new Game object which represents a Woodoku game
+        Args:
+            board (list[list[bool]] | int, optional): The starting board, either
+            as a 2-D matrix of booleans or as an occupancy mask. Defaults to an
+            empty board.
+            seed (int, optional): The seed for the RNG for this game. Defaults to 0.
+            rng (RandomStream, optional): The RNG stream that this game draws
+            it's pieces from, which is owned by this game from now on. Defaults
+            to a new stream seeded with the given seed.
+        """
+        super().__init__()
+        self.__seed = seed
+        if (rng is None):
+            rng = RandomStream(seed)
+        self.__rng = rng
+
+        if (board is None):
+            board = 0
+        if (not isinstance(board, int)):
+            board = board_to_mask(board)
+        self.__occupancy: int = board
+
+        self.__consecutive_clears = consecutive_clears
+
+        if (available_pieces is None):
+            available_pieces = self.__rng.sample(get_pieces(), HAND_SIZE)
+        self.__available_pieces: list[Piece] = available_pieces[:]
+
+        # the parts of the Zobrist hash, which are kept up to date as moves
+        # are made
+        self.__board_hash = board_hash(self.__occupancy)
+        self.__hand_hash = hand_hash([get_piece_id(piece) for piece in self.__available_pieces])
+        self.__placeability = PlaceabilityTracker()
+
+    def piece_will_fit(self, piece: Piece, pos: Position) -> bool:
+        """Checks if the given piece fits in the given position
+
+        Args:
+            piece (Piece): The piece to check for fit
+            pos (Position): The position of the top left corner of the
+            bounding box of the piece
+
+        Returns:
+            bool: Whether or not the piece will fit in the given position
+        """
+        mask, max_row, max_col = piece_geometry(piece)
+        if (pos.row + max_row >= self.SIZE or pos.col + max_col >= self.SIZE):
+            return False
+        return (mask << (pos.row * self.SIZE + pos.col)) & self.__occupancy == 0
+
+    def place_piece(self, piece: Piece, pos: Position) -> int:
+        """Places the piece at the given position on the board, the position
+        denotes the coordinate of the top-left corner of the bounding box
+        of the piece. Mutates the board and the available pieces in exactly
+        the same way as ClassicWoodoku.place_piece and returns the reward for
+        the move.
+
+        Args:
+            piece (Piece): The piece to attempt to place on the given position
+            pos (Position): The position to attempt to place the piece at
+
+        Returns:
+            int: The reward (points gained) for executing the move
+        """
+        self._advance_version()
+        self.__available_pieces.remove(piece)
+        if (len(self.__available_pieces) == 0):
+            self.__available_pieces = self.__rng.sample(get_pieces(), HAND_SIZE)
+            self.__hand_hash = hand_hash([get_piece_id(piece) for piece in self.__available_pieces])
+        else:
+            self.__hand_hash -= piece_key(get_piece_id(piece))
+
+        placed_mask = piece_geometry(piece)[0] << (pos.row * self.SIZE + pos.col)
+        occupancy, cleared_count = clear_sections(
+            self.__occupancy | placed_mask, placed_mask)
+        self.__board_hash ^= board_hash(self.__occupancy ^ occupancy)
+        self.__occupancy = occupancy
+        reward = 18 * (self.__consecutive_clears + 1) * cleared_count
+
+        if (reward > 0):
+            self.__consecutive_clears += 1
+        else:
+            self.__consecutive_clears = 0
+        reward += piece.filled
+
+        return reward
+
+    def apply_move(self, piece: Piece, pos: Position) -> MoveRecord:
+        """Places the piece at the given position like place_piece, and returns
+        the reward along with a record that undo_move can use to undo the move
+
+        Args:
+            piece (Piece): The piece to place on the given position
+            pos (Position): The position to place the piece at
+
+        Returns:
+            MoveRecord: The reward for the move and the record to undo it with
+        """
+        available_pieces = tuple(self.__available_pieces)
+        rng_state = self.__rng.getstate() if len(available_pieces) == 1 else None
+        board = (self.__occupancy, self.__board_hash, self.__hand_hash)
+        consecutive_clears = self.__consecutive_clears
+
+        reward = self.place_piece(piece, pos)
+        return MoveRecord(reward, available_pieces, consecutive_clears,
+                          board, rng_state)
+
+    def undo_move(self, record: MoveRecord) -> None:
+        """Returns the game to the state it was in before the move with the
+        given record was applied
+
+        Args:
+            record (MoveRecord): The record returned by apply_move
+        """
+        self._advance_version()
+        self.__occupancy, self.__board_hash, self.__hand_hash = record.board
+        self.__available_pieces = list(record.available_pieces)
+        self.__consecutive_clears = record.consecutive_clears
+        if (record.rng_state is not None):
+            self.__rng.setstate(record.rng_state)
+
+    def get_legal_positions(self, piece: Piece) -> list[Position]:
+        """Returns every position, in row-column order, where the given piece
+        can be placed legally, from the legal anchors that this game keeps up
+        to date as it changes
+
+        Args:
+            piece (Piece): The piece to find the legal positions of
+
+        Returns:
+            list[Position]: The positions that the piece could be placed onto
+        """
+        return anchor_positions(self.__placeability.legal_anchors(get_piece_id(piece), self.__occupancy))
+
+    def get_available_pieces(self) -> list[Piece]:
+        """Returns a copy of list of available pieces the player can use
+        this turn.
+
+        Returns:
+            list[Piece]: A copy of the list that contains all the available
+            pieces that the player can use this turn
+        """
+        return self.__available_pieces[:]
+
+    def is_over(self) -> bool:
+        """Returns a boolean that represents whether or not the game is over
+
+        Returns:
+            bool: Whether or not the game is over
+        """
+        legal_moves = self._cached_legal_moves()
+        if (legal_moves is not None):
+            return len(legal_moves) == 0
+
+        for piece in self.__available_pieces:
+            if (self.is_placeable(piece)):
+                return False
+        return True
+
+    def is_placeable(self, piece: Piece) -> bool:
+        """Returns whether the given piece can be placed anywhere on the board,
+        from the legal anchors that this game keeps up to date as it changes
+
+        Args:
+            piece (Piece): The piece to check for legal positions
+
+        Returns:
+            bool: Whether the piece has any legal position
+        """
+        return self.__placeability.is_placeable(get_piece_id(piece), self.__occupancy)
+
+    def get_size(self) -> int:
+        """Returns the size of the board that this game is played on,
+        which is always 9
+
+        Returns:
+            int: The size of the board this game is played on, which is
+            always 9
+        """
+        return self.SIZE
+
+    @property
+    def board(self) -> list[list[bool]]:
+        """Returns a copy of the board for this game
+        """
+        return mask_to_board(self.__occupancy)
+
+    @property
+    def occupancy(self) -> int:
+        """Returns the occupancy mask of the board, where the tile at (row, col)
+        is filled iff the bit at index row * 9 + col is set
+        """
+        return self.__occupancy
+
+    @property
+    def consecutive_clears(self) -> int:
+        """Returns the number of consecutive clears in this game
+        """
+        return self.__consecutive_clears
+
+    @property
+    def zobrist_hash(self) -> int:
+        """Returns the Zobrist hash of the board, the available pieces and
+        the number of consecutive clears of this game, which is kept up to
+        date as moves are made
+        """
+        return (self.__board_hash ^ (self.__hand_hash & KEY_MASK)
+                ^ clear_key(self.__consecutive_clears))
+
+    @property
+    def seed(self) -> int:
+        return self.__seed
+
+    @property
+    def rng(self) -> RandomStream:
+        """Returns the RNG stream that this game draws it's pieces from
+        """
+        return self.__rng
+
+    def copy(self) -> "WoodokuGame":
+        return BitboardWoodoku(self.__occupancy,
+                               self.consecutive_clears,
+                               self.get_available_pieces(),
+                               self.__seed,
+                               self.__rng.copy())
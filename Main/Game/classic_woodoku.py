@@ -1,12 +1,13 @@
 from typing import Optional
 from Main.Game.position import Position
 
-from Main.Util.generate_pieces import get_pieces
-from Main.Game.woodoku_game import WoodokuGame
+from Main.Game.bitboard import BOX_MASKS, COL_MASKS, ROW_MASKS, board_to_mask, piece_geometry
+from Main.Game.placeability import PlaceabilityTracker, anchor_positions
+from Main.Util.generate_pieces import get_piece_id, get_pieces
+from Main.Util.random_stream import RandomStream
+from Main.Game.woodoku_game import HAND_SIZE, MoveRecord, WoodokuGame
 from Main.Game.piece import Piece
 
-import random
-
 
 class InvalidMoveError(Exception):
     """Raised when the player makes an illegal move, by placing the
@@ -29,13 +30,20 @@ class ClassicWoodoku(WoodokuGame):
     def __init__(self, board: Optional[list[list[bool]]] = None,
                  consecutive_clears=0,
                  available_pieces: Optional[list[Piece]] = None,
-                 seed=0):
+                 seed=0,
+                 rng: Optional[RandomStream] = None):
         """Initalizes a new Game object which represents a Woodoku game
         Args:
             seed (int, optional): The seed for the RNG for this game. Defaults to 0.
+            rng (RandomStream, optional): The RNG stream that this game draws
+            it's pieces from, which is owned by this game from now on. Defaults
+            to a new stream seeded with the given seed.
         """
+        super().__init__()
         self.__seed = seed
-        random.seed(self.__seed)
+        if (rng is None):
+            rng = RandomStream(seed)
+        self.__rng = rng
 
         # this board is a 2-D matrix of False and True, depending on
         # whether or not the piece is occupied or not.
@@ -43,6 +51,10 @@ class ClassicWoodoku(WoodokuGame):
             board = [[False for _ in range(self.SIZE)]
                      for _ in range(self.SIZE)]
         self.__board: list[list[bool]] = [row[:] for row in board]
+        # the board as a bitmask, which is kept up to date alongside the board
+        # so that the legal anchors of pieces can be tracked
+        self.__occupancy = board_to_mask(self.__board)
+        self.__placeability = PlaceabilityTracker()
         # self.__filled_squares: set[Position] = set()
         # for row in range(len(self.__board)):
         #     for col in range(len(self.__board)):
@@ -51,7 +63,7 @@ class ClassicWoodoku(WoodokuGame):
         self.__consecutive_clears = consecutive_clears
 
         if (available_pieces is None):
-            available_pieces = random.sample(get_pieces(), 3)
+            available_pieces = self.__rng.sample(get_pieces(), HAND_SIZE)
         self.__available_pieces: list[Piece] = available_pieces[:]
 
     def __check_position_in_bounds(self, pos: Position) -> bool:
@@ -84,18 +96,12 @@ class ClassicWoodoku(WoodokuGame):
         Returns:
             bool: Whether or not the piece will fit in the given position
         """
-        piece_size = piece.get_size()
-
-        for row in range(piece_size[0]):
-            for col in range(piece_size[1]):
-                if (not piece.is_filled_at((row, col))):
-                    continue
-
-                check_location = Position(pos.row + row, pos.col + col)
-                if (not self.__check_position_in_bounds(check_location)):
-                    return False
-                if (self.__board[check_location.row][check_location.col]):
-                    return False
+        for row, col in piece.cells:
+            check_location = Position(pos.row + row, pos.col + col)
+            if (not self.__check_position_in_bounds(check_location)):
+                return False
+            if (self.__board[check_location.row][check_location.col]):
+                return False
 
         return True
 
@@ -132,15 +138,21 @@ class ClassicWoodoku(WoodokuGame):
                     n_row, n_col = row + pos.row, col + pos.col
                     self.__board[n_row][n_col] |= piece.is_filled_at(
                         (row, col))
+            self.__occupancy |= piece_geometry(piece)[0] << (pos.row * self.SIZE + pos.col)
 
         def __clear_sections() -> int:
             """Clears the appropiate sections of the board to be cleared,
-            by checking rows, columns, and 3x3 disjoint squares on the board.
+            by checking the rows, columns, and 3x3 disjoint squares on the
+            board that the placed piece touches. No other section can have
+            been completed by this move.
 
             Returns:
                 int: The reward gained for performing such a move
             """
-            # TODO: optimize this by only checking possible sections?
+            touched_rows = sorted({pos.row + row for row, _ in piece.cells})
+            touched_cols = sorted({pos.col + col for _, col in piece.cells})
+            touched_squares = sorted({((pos.row + row) // 3 * 3, (pos.col + col) // 3 * 3)
+                                      for row, col in piece.cells})
 
             def __clear_row(row: int) -> None:
                 """Clears the row at the given row index
@@ -150,6 +162,7 @@ class ClassicWoodoku(WoodokuGame):
                 """
                 for col in range(self.SIZE):
                     self.__board[row][col] = False
+                self.__occupancy &= ~ROW_MASKS[row]
 
             def __clear_col(col: int) -> None:
                 """Clears the column at the given column index
@@ -159,56 +172,40 @@ class ClassicWoodoku(WoodokuGame):
                 """
                 for row in range(self.SIZE):
                     self.__board[row][col] = False
+                self.__occupancy &= ~COL_MASKS[col]
 
-            def __clear_square(square_pos: Position) -> None:
+            def __clear_square(square_pos: tuple[int, int]) -> None:
                 """Clears the square with top-left corner at the given position
 
                 Args:
-                    square_pos (Position): The position of the top-left corner
-                    of the square to clear
+                    square_pos (tuple[int, int]): The row and column of the
+                    top-left corner of the square to clear
                 """
                 for i in range(3):
                     for j in range(3):
-                        self.__board[square_pos.row +
-                                     i][square_pos.col + j] = False
+                        self.__board[square_pos[0] +
+                                     i][square_pos[1] + j] = False
+                self.__occupancy &= ~BOX_MASKS[square_pos[0] // 3 * 3 + square_pos[1] // 3]
 
             reward = 0
-            # check all rows
-            for row in range(self.SIZE):
-                to_clear = True
-                for col in range(self.SIZE):
-                    if (not self.__board[row][col]):
-                        to_clear = False
-                        break
-                if (to_clear):
+            # check the touched rows
+            for row in touched_rows:
+                if (all(self.__board[row])):
                     reward += 18 * (self.consecutive_clears + 1)
                     __clear_row(row)
 
-            # check all columns
-            for col in range(self.SIZE):
-                to_clear = True
-                for row in range(self.SIZE):
-                    if (not self.__board[row][col]):
-                        to_clear = False
-                        break
-                if (to_clear):
+            # check the touched columns
+            for col in touched_cols:
+                if (all(self.__board[row][col] for row in range(self.SIZE))):
                     reward += 18 * (self.consecutive_clears + 1)
                     __clear_col(col)
 
-            # check all 3x3 squares
-            square_starts = [Position(i, j)
-                             for i in range(0, self.SIZE, 3)
-                             for j in range(0, self.SIZE, 3)]
-            for start_pos in square_starts:
-                to_clear = True
-                for i in range(3):
-                    for j in range(3):
-                        if (not self.__board[start_pos.row + i][start_pos.col + j]):
-                            to_clear = False
-                            break
-                if (to_clear):
+            # check the touched 3x3 squares
+            for start_row, start_col in touched_squares:
+                if (all(self.__board[start_row + i][start_col + j]
+                        for i in range(3) for j in range(3))):
                     reward += 18 * (self.consecutive_clears + 1)
-                    __clear_square(start_pos)
+                    __clear_square((start_row, start_col))
 
             return reward
 
@@ -220,7 +217,7 @@ class ClassicWoodoku(WoodokuGame):
 
             self.__available_pieces.remove(piece)
             if (len(self.__available_pieces) == 0):
-                self.__available_pieces = random.sample(get_pieces(), 3)
+                self.__available_pieces = self.__rng.sample(get_pieces(), HAND_SIZE)
 
         # if (not self.piece_will_fit(piece, pos)):
         #     raise InvalidMoveError(
@@ -230,6 +227,7 @@ class ClassicWoodoku(WoodokuGame):
         #     raise InvalidMoveError(
         #         "The given piece is not a valid piece to place right now")
 
+        self._advance_version()
         __handle_available_pieces()
 
         __add_piece_to_board(piece, pos)
@@ -242,6 +240,62 @@ class ClassicWoodoku(WoodokuGame):
 
         return reward
 
+    def apply_move(self, piece: Piece, pos: Position) -> MoveRecord:
+        """Places the piece at the given position like place_piece, and returns
+        the reward along with a record that undo_move can use to undo the move
+
+        Args:
+            piece (Piece): The piece to place on the given position
+            pos (Position): The position to place the piece at
+
+        Returns:
+            MoveRecord: The reward for the move and the record to undo it with
+        """
+        available_pieces = tuple(self.__available_pieces)
+        rng_state = self.__rng.getstate() if len(available_pieces) == 1 else None
+        # the occupancy mask is all it takes to rebuild the board
+        board = self.__occupancy
+        consecutive_clears = self.__consecutive_clears
+
+        reward = self.place_piece(piece, pos)
+        return MoveRecord(reward, available_pieces, consecutive_clears,
+                          board, rng_state)
+
+    def undo_move(self, record: MoveRecord) -> None:
+        """Returns the game to the state it was in before the move with the
+        given record was applied
+
+        Args:
+            record (MoveRecord): The record returned by apply_move
+        """
+        self._advance_version()
+        occupancy = record.board
+        changed = occupancy ^ self.__occupancy
+        # only the rows that the move (or it's clears) touched are rebuilt
+        for row in range(self.SIZE):
+            if ((changed >> (row * self.SIZE)) & ROW_MASKS[0]):
+                board_row = self.__board[row]
+                for col in range(self.SIZE):
+                    board_row[col] = bool((occupancy >> (row * self.SIZE + col)) & 1)
+        self.__occupancy = occupancy
+        self.__available_pieces = list(record.available_pieces)
+        self.__consecutive_clears = record.consecutive_clears
+        if (record.rng_state is not None):
+            self.__rng.setstate(record.rng_state)
+
+    def get_legal_positions(self, piece: Piece) -> list[Position]:
+        """Returns every position, in row-column order, where the given piece
+        can be placed legally, from the legal anchors that this game keeps up
+        to date as it changes
+
+        Args:
+            piece (Piece): The piece to find the legal positions of
+
+        Returns:
+            list[Position]: The positions that the piece could be placed onto
+        """
+        return anchor_positions(self.__placeability.legal_anchors(get_piece_id(piece), self.__occupancy))
+
     def get_available_pieces(self) -> list[Piece]:
         """Returns a copy of list of available pieces the player can use
         this turn.
@@ -258,27 +312,27 @@ class ClassicWoodoku(WoodokuGame):
         Returns:
             bool: Whether or not the game is over
         """
-        def __is_placeable(piece: Piece) -> bool:
-            """Determines if the given piece has any valid moves on the current
-            board
-
-            Args:
-                piece (Piece): The piece to check for valid moves
-
-            Returns:
-                bool: Whether or not the given piece has any valid moves
-            """
-            for row in range(self.SIZE):
-                for col in range(self.SIZE):
-                    if (self.piece_will_fit(piece, Position(row, col))):
-                        return True
-            return False
+        legal_moves = self._cached_legal_moves()
+        if (legal_moves is not None):
+            return len(legal_moves) == 0
 
         for piece in self.__available_pieces:
-            if (__is_placeable(piece)):
+            if (self.is_placeable(piece)):
                 return False
         return True
 
+    def is_placeable(self, piece: Piece) -> bool:
+        """Returns whether the given piece can be placed anywhere on the board,
+        from the legal anchors that this game keeps up to date as it changes
+
+        Args:
+            piece (Piece): The piece to check for valid moves
+
+        Returns:
+            bool: Whether or not the given piece has any valid moves
+        """
+        return self.__placeability.is_placeable(get_piece_id(piece), self.__occupancy)
+
     def get_size(self) -> int:
         """Returns the size of the board that this game is played on,
         which is always 9
@@ -305,8 +359,15 @@ class ClassicWoodoku(WoodokuGame):
     def seed(self) -> int:
         return self.__seed
 
+    @property
+    def rng(self) -> RandomStream:
+        """Returns the RNG stream that this game draws it's pieces from
+        """
+        return self.__rng
+
     def copy(self) -> "WoodokuGame":
         return ClassicWoodoku(self.board,
                               self.consecutive_clears,
                               self.get_available_pieces(),
-                              self.__seed)
+                              self.__seed,
+                              self.__rng.copy())
@@ -1,4 +1,4 @@
-from Main.Game.position import Position
+from typing import Optional
 class InvalidPieceError(ValueError):
     """Raised when trying to initalize an invalid piece
     """    
@@ -7,12 +7,14 @@ class InvalidPieceError(ValueError):
 class Piece:
     """Represents a piece on a WoodokuGame.
     """    
-    def __init__(self, piece_list: list[list[bool]]):
+    def __init__(self, piece_list: list[list[bool]], piece_id: Optional[int] = None):
         """Creates a piece based on the given 2D array of booleans.
 
         Args:
             piece_list (list[list[bool]]): The 2D array of booleans that
             represents this piece
+            piece_id (int, optional): The id of this piece in the piece catalog,
+            only set by the catalog when interning a piece. Defaults to None.
 
         Raises:
             InvalidPieceException: If the given array does not have the proper
@@ -33,11 +35,19 @@ class Piece:
 
         self.__piece_list = [row[:] for row in piece_list]
 
-        fill_count = 0
+        cells: list[tuple[int, int]] = []
         for row in range(len(piece_list)):
             for col in range(len(piece_list[row])):
-                fill_count += 1 if piece_list[row][col] else 0
-        self.__filled = fill_count
+                if (piece_list[row][col]):
+                    cells.append((row, col))
+        self.__cells = tuple(cells)
+        self.__filled = len(cells)
+        self.__size = (len(piece_list), len(piece_list[0]))
+        self.__id = piece_id
+
+        # two pieces are equal iff they have the same size and filled tiles
+        self.__key = (self.__size, self.__cells)
+        self.__hash = hash(self.__key)
 
     def get_size(self) -> tuple[int, int]:
         """Returns the size of the bounding box of this piece as (rows, columns)
@@ -48,7 +58,7 @@ class Piece:
         Returns:
             tuple[int, int]: The size of the bounding box of this piece as (rows, columns)
         """
-        return (len(self.__piece_list), len(self.__piece_list[0]))
+        return self.__size
     
     def is_filled_at(self, displacement: tuple[int, int]) -> bool:
         """Returns whether or not the piece is filled at the given displacement
@@ -68,6 +78,20 @@ class Piece:
     def filled(self):
         return self.__filled
 
+    @property
+    def cells(self) -> tuple[tuple[int, int], ...]:
+        """Returns the displacements of every filled tile of this piece relative
+        to the top-left corner of it's bounding box, in row-column order
+        """
+        return self.__cells
+
+    @property
+    def id(self) -> Optional[int]:
+        """Returns the id of this piece in the piece catalog, or None if this
+        piece has not been interned
+        """
+        return self.__id
+
     def __eq__(self, __o: object) -> bool:
         """Checks if this Piece is equal to another, where equality is defined
         as having the same size and having all occupied tiles in the same
@@ -79,28 +103,20 @@ class Piece:
         Returns:
             bool: Whether or not this Piece is equal to the given object
         """        
-        if(not isinstance(__o, Piece)):
+        if (self is __o):
+            return True
+        if (not isinstance(__o, Piece)):
             return False
-        assert isinstance(__o, Piece)
+        return self.__key == __o.__key
 
-        if(__o.get_size() != self.get_size()):
-            return False
-        
-        size = self.get_size()
-        for row in range(size[0]):
-            for col in range(size[1]):
-                if(self.is_filled_at((row, col)) != __o.is_filled_at((row, col))):
-                    return False
-        return True
-    
     def __hash__(self) -> int:
-        """Hashes this Piece
+        """Hashes this Piece, consistently with equality
 
         Returns:
             int: The hash for this Piece
-        """        
-        return hash((hash(tuple(row)) for row in self.__piece_list))
-    
+        """
+        return self.__hash
+
     def __str__(self) -> str:
         rtn, size = "", self.get_size()
         for row in range(size[0]):
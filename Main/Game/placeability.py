@@ -0,0 +1,412 @@
+from math import comb
+from typing import Iterator
+
+from Main.Game.bitboard import clear_sections, placement_table, piece_geometry
+from Main.Game.position import Position
+from Main.Util.generate_pieces import get_piece_by_id, get_pieces
+
+# maps the id of a piece onto the bit offsets of it's filled tiles when
+# anchored at (0, 0), and the mask of the anchors where it is in bounds
+_SHIFT_CACHE: dict[int, tuple[tuple[int, ...], int]] = {}
+_PIECE_ORDER: list[tuple[int, tuple[int, ...], int, int, int]] = []
+
+
+def _piece_shifts(piece_id: int) -> tuple[tuple[int, ...], int]:
+    """Returns the offsets of the filled tiles of a piece and the mask of the
+    anchors where the piece is in bounds
+    """
+    shifts = _SHIFT_CACHE.get(piece_id)
+    if (shifts is None):
+        piece = get_piece_by_id(piece_id)
+        mask, _, _ = piece_geometry(piece)
+        offsets = tuple(bit for bit in range(mask.bit_length()) if (mask >> bit) & 1)
+        anchors = 0
+        for pos, _ in placement_table(piece):
+            anchors |= 1 << pos.index
+        shifts = (offsets, anchors)
+        _SHIFT_CACHE[piece_id] = shifts
+    return shifts
+
+
+def blocked_anchors(tiles: int, offsets: tuple[int, ...]) -> int:
+    """Returns the mask of the anchors at which a piece with the given offsets
+    would cover any of the given tiles. The tile at anchor + offset is shifted
+    down onto the anchor, so an anchor whose piece hangs off the right of the
+    board picks up tiles from the next row, which is fine since such anchors
+    are never in bounds.
+
+    Args:
+        tiles (int): The mask of the tiles
+        offsets (tuple[int, ...]): The offsets of the filled tiles of the piece
+
+    Returns:
+        int: The mask of the anchors that cover any of the tiles
+    """
+    rtn = 0
+    for offset in offsets:
+        rtn |= tiles >> offset
+    return rtn
+
+
+def _piece_order() -> list[tuple[int, tuple[int, ...], int, int, int]]:
+    """Returns the id, offsets and in bounds anchors of every piece of the
+    catalog, along with the mask of the ids of the pieces whose shape it
+    contains (itself included) and the mask of the ids of the pieces that
+    contain it. The largest pieces come first.
+    """
+    if (len(_PIECE_ORDER) == 0):
+        pieces = get_pieces()
+        cells = {piece.id: set(piece.cells) for piece in pieces}
+        contained = {piece.id: 0 for piece in pieces}
+        containers = {piece.id: 0 for piece in pieces}
+        for outer in pieces:
+            for inner in pieces:
+                assert outer.id is not None and inner.id is not None
+                # inner fits in outer iff some translate of inner, with it's
+                # first tile on a tile of outer, is covered by outer
+                first_row, first_col = inner.cells[0]
+                if (any({(row - first_row + top, col - first_col + left)
+                         for row, col in inner.cells} <= cells[outer.id]
+                        for top, left in outer.cells)):
+                    contained[outer.id] |= 1 << inner.id
+                    containers[inner.id] |= 1 << outer.id
+        for piece_id in sorted(contained, key=lambda piece_id: -len(cells[piece_id])):
+            assert piece_id is not None
+            _PIECE_ORDER.append((piece_id, *_piece_shifts(piece_id),
+                                 contained[piece_id], containers[piece_id]))
+    return _PIECE_ORDER
+
+
+def placeable_mask(occupancy: int, candidates: int = -1) -> int:
+    """Returns the mask of the ids of the pieces of the catalog that can be
+    placed somewhere on the board, bit i being set for the piece with id i.
+    The pieces are looked at largest first, and a piece that fits (or does not)
+    settles every piece that it contains (or that contains it) for free.
+
+    Args:
+        occupancy (int): The occupancy mask of the board
+        candidates (int, optional): The mask of the ids of the pieces to look
+        at, the others may or may not be in the result. Defaults to every
+        piece of the catalog.
+
+    Returns:
+        int: The mask of the ids of the placeable pieces
+    """
+    fits = 0
+    blocked = 0
+    for piece_id, offsets, anchors, contained, containers in _piece_order():
+        if (not (candidates >> piece_id) & 1 or ((fits | blocked) >> piece_id) & 1):
+            continue
+        if (anchors & ~blocked_anchors(occupancy, offsets)):
+            fits |= contained
+        else:
+            blocked |= containers
+    return fits
+
+
+def count_placeable_pieces(occupancy: int) -> int:
+    """Returns the number of pieces of the catalog that can be placed
+    somewhere on the board, computed from scratch for every piece. This is
+    faster than a tracker for boards that have little in common with the
+    boards that were asked about before.
+
+    Args:
+        occupancy (int): The occupancy mask of the board
+
+    Returns:
+        int: The number of placeable catalog pieces
+    """
+    return placeable_mask(occupancy).bit_count()
+
+
+def placed_boards(occupancy: int, piece_id: int) -> Iterator[tuple[int, int]]:
+    """Yields the board after every legal placement of a piece, with the
+    completed sections cleared. The boards are made as they are asked for, so
+    that callers which stop early do not pay for the rest.
+
+    Args:
+        occupancy (int): The occupancy mask of the board
+        piece_id (int): The id of the piece
+
+    Yields:
+        tuple[int, int]: The occupancy mask of the board after one placement,
+        and the number of sections that the placement cleared
+    """
+    offsets, anchors = _piece_shifts(piece_id)
+    piece_mask = sum(1 << offset for offset in offsets)
+    legal = anchors & ~blocked_anchors(occupancy, offsets)
+    while (legal):
+        lowest = legal & -legal
+        mask = piece_mask << (lowest.bit_length() - 1)
+        yield clear_sections(occupancy | mask, mask)
+        legal ^= lowest
+
+
+def anchor_positions(anchors: int) -> list[Position]:
+    """Returns the positions of the anchors in a mask, in row-column order
+
+    Args:
+        anchors (int): The mask of the anchors
+
+    Returns:
+        list[Position]: The positions of the anchors
+    """
+    positions = []
+    while (anchors):
+        lowest = anchors & -anchors
+        positions.append(Position.from_index(lowest.bit_length() - 1))
+        anchors ^= lowest
+    return positions
+
+
+class PlaceabilityTracker():
+    """Keeps the legal anchors of every piece that has been asked about as a
+    bitset, and brings them up to date from the board they were last computed
+    for by only looking at the anchors that cover the tiles that changed since.
+    Asking whether a piece can be placed anywhere after a move is then a few
+    big integer operations rather than a scan over the whole board.
+    """
+
+    def __init__(self):
+        """Creates a tracker that has not computed any legal anchors yet
+        """
+        # maps the id of a piece onto the occupancy it's legal anchors were
+        # last computed for, and the mask of those anchors
+        self.__entries: dict[int, tuple[int, int]] = {}
+
+    def legal_anchors(self, piece_id: int, occupancy: int) -> int:
+        """Returns the mask of the anchors (by flat index row * 9 + col) where
+        the given piece can be placed on the given board
+
+        Args:
+            piece_id (int): The id of the piece
+            occupancy (int): The occupancy mask of the board
+
+        Returns:
+            int: The mask of the legal anchors of the piece
+        """
+        entry = self.__entries.get(piece_id)
+        if (entry is not None and entry[0] == occupancy):
+            return entry[1]
+
+        offsets, anchors = _piece_shifts(piece_id)
+        if (entry is None):
+            legal = anchors & ~blocked_anchors(occupancy, offsets)
+        else:
+            old_occupancy, legal = entry
+            filled = occupancy & ~old_occupancy
+            cleared = old_occupancy & ~occupancy
+            # anchors that cover a filled tile are no longer legal, and only
+            # anchors that cover a cleared tile can have become legal
+            if (filled and legal):
+                legal &= ~blocked_anchors(filled, offsets)
+            if (cleared):
+                affected = blocked_anchors(cleared, offsets) & anchors & ~legal
+                if (affected):
+                    legal |= affected & ~blocked_anchors(occupancy, offsets)
+
+        self.__entries[piece_id] = (occupancy, legal)
+        return legal
+
+    def is_placeable(self, piece_id: int, occupancy: int) -> bool:
+        """Returns whether the given piece can be placed anywhere on the board
+
+        Args:
+            piece_id (int): The id of the piece
+            occupancy (int): The occupancy mask of the board
+
+        Returns:
+            bool: Whether the piece has any legal anchor
+        """
+        return self.legal_anchors(piece_id, occupancy) != 0
+
+    def placeable_pieces(self, occupancy: int) -> list[int]:
+        """Returns the ids of the pieces of the catalog that can still be
+        placed somewhere on the board
+
+        Args:
+            occupancy (int): The occupancy mask of the board
+
+        Returns:
+            list[int]: The ids of the placeable catalog pieces
+        """
+        return [piece.id for piece in get_pieces()
+                if piece.id is not None and self.is_placeable(piece.id, occupancy)]
+
+    def copy(self) -> "PlaceabilityTracker":
+        """Returns a copy of this tracker
+        """
+        tracker = PlaceabilityTracker()
+        tracker.__entries = dict(self.__entries)
+        return tracker
+
+
+class SurvivalTable():
+    """Works out how many of the hands that can be drawn, which are the
+    3-piece combinations of the catalog, a board can still take in full when
+    the pieces are placed in the best order. Rather than trying every order
+    of every hand, the placements of each piece are tried one board at a time,
+    and each board after a placement is asked only for the pairs of pieces
+    that would settle a hand which has not been settled yet. What is known
+    about the boards in between is memoized, so that boards that are reached
+    again (through other placements, or from other boards) are not analysed
+    again, and a board that has been analysed is a dictionary lookup away.
+    This makes it cheap enough to call on the leaves of a search. The memos
+    are dropped once they hold max_boards boards.
+    """
+
+    def __init__(self, max_boards: int = 1 << 16):
+        """Creates a table that has not analysed any boards yet
+
+        Args:
+            max_boards (int, optional): The most boards to keep the analysis
+            of, per memo. Defaults to 2^16.
+
+        Raises:
+            ValueError: If max_boards is not positive
+        """
+        if (max_boards <= 0):
+            raise ValueError("Invalid max_boards, must be positive")
+        self.__max_boards = max_boards
+        size = len(get_pieces())
+        self.__catalog_size = size
+        self.__catalog = (1 << size) - 1
+        # ordered pairs of pieces are bit first * catalog_size + second of a
+        # mask, these are the masks of the pairs of distinct pieces that have
+        # the given piece first, and that have it anywhere
+        self.__pairs_from = [(self.__catalog & ~(1 << first)) << (first * size)
+                             for first in range(size)]
+        self.__pairs_with = [self.__pairs_from[piece_id]
+                             | sum(1 << (first * size + piece_id)
+                                   for first in range(size) if first != piece_id)
+                             for piece_id in range(size)]
+        self.__all_pairs = sum(self.__pairs_from)
+        # maps a board onto the mask of the ordered pairs that can be placed
+        # in that order, and the mask of the pairs that have been checked
+        self.__pairs: dict[int, tuple[int, int]] = {}
+        self.__hands: dict[int, int] = {}
+
+    def survivable_hands(self, occupancy: int) -> int:
+        """Returns the number of hands that can be placed on the board in full,
+        in some order
+
+        Args:
+            occupancy (int): The occupancy mask of the board
+
+        Returns:
+            int: The number of survivable hands
+        """
+        count = self.__hands.get(occupancy)
+        if (count is not None):
+            return count
+
+        size = self.__catalog_size
+        # maps every piece onto the mask of the ordered pairs that it makes an
+        # unsettled hand with, so every unsettled hand is in 6 of the masks
+        unsettled = [self.__all_pairs & ~self.__pairs_with[piece_id] for piece_id in range(size)]
+        placeable = placeable_mask(occupancy, self.__catalog)
+        for first in range(size):
+            if (not (placeable >> first) & 1):
+                continue
+            for board, _ in placed_boards(occupancy, first):
+                if (unsettled[first] == 0):
+                    break
+                settled = self.pairs(board, unsettled[first]) & unsettled[first]
+                if (settled):
+                    self.__settle(unsettled, first, settled)
+
+        count = comb(size, 3) - sum(pairs.bit_count() for pairs in unsettled) // 6
+        self.__remember(self.__hands, occupancy, count)
+        return count
+
+    def survival_rate(self, occupancy: int) -> float:
+        """Returns the fraction of the hands that can be placed on the board in
+        full, in some order
+
+        Args:
+            occupancy (int): The occupancy mask of the board
+
+        Returns:
+            float: The fraction of survivable hands, from 0 to 1
+        """
+        return self.survivable_hands(occupancy) / comb(self.__catalog_size, 3)
+
+    def pairs(self, occupancy: int, needed: int = -1) -> int:
+        """Returns the mask of the ordered pairs of pieces that can be placed on
+        the board one after the other, bit first * catalog size + second being
+        set if the first piece can be placed and then the second
+
+        Args:
+            occupancy (int): The occupancy mask of the board
+            needed (int, optional): The mask of the pairs to work out, the
+            others may or may not be in the result. Defaults to every pair.
+
+        Returns:
+            int: The mask of the placeable ordered pairs
+        """
+        size = self.__catalog_size
+        pairs, checked = self.__pairs.get(occupancy, (0, 0))
+        missing = needed & ~checked
+        if (missing == 0):
+            return pairs
+
+        # a placement that clears nothing only fills tiles, so every piece
+        # that fits after it already fits on the board
+        placeable = placeable_mask(occupancy, self.__catalog) & self.__catalog
+        for first in range(size):
+            wanted = (missing >> (first * size)) & self.__catalog & ~(1 << first)
+            if (wanted == 0):
+                continue
+            checked |= wanted << (first * size)
+            if (not (placeable >> first) & 1):
+                continue
+
+            seconds = 0
+            for board, cleared_count in placed_boards(occupancy, first):
+                bound = wanted if cleared_count else wanted & placeable
+                if (seconds & bound != bound):
+                    seconds |= placeable_mask(board, bound & ~seconds) & bound
+                    if (seconds == wanted):
+                        break
+            pairs |= seconds << (first * size)
+
+        self.__remember(self.__pairs, occupancy, (pairs, checked))
+        return pairs
+
+    def __settle(self, unsettled: list[int], first: int, settled: int) -> None:
+        """Marks the hands made of the given piece and each of the given pairs
+        as settled, in the masks of all three of their pieces
+        """
+        if (settled == unsettled[first]):
+            # every hand with the piece is settled
+            for piece_id in range(self.__catalog_size):
+                unsettled[piece_id] &= ~self.__pairs_with[first]
+            unsettled[first] = 0
+            return
+
+        size = self.__catalog_size
+        while (settled):
+            lowest = settled & -settled
+            settled ^= lowest
+            second, third = divmod(lowest.bit_length() - 1, size)
+            for piece_id, *others in ((first, second, third), (second, first, third),
+                                      (third, first, second)):
+                bits = ((1 << (others[0] * size + others[1]))
+                        | (1 << (others[1] * size + others[0])))
+                unsettled[piece_id] &= ~bits
+            # the same hand is in settled in the other order as well
+            settled &= ~(1 << (third * size + second))
+
+    def __remember(self, memo: dict, occupancy: int, val) -> None:
+        """Memoizes the analysis of a board, dropping the memo if it is full
+        """
+        if (len(memo) >= self.__max_boards):
+            memo.clear()
+        memo[occupancy] = val
+
+    def __len__(self) -> int:
+        return len(self.__hands)
+
+    @property
+    def max_boards(self) -> int:
+        return self.__max_boards
@@ -1,11 +1,22 @@
+from typing import Any
+
+
 class Position():
     """A position represents a location (by row and column)
-    on a Woodoku board. This class is immutable.
+    on a Woodoku board. This class is immutable, and every position
+    is a shared flyweight: Position(row, col) always returns the same
+    instance for the same row and column, so positions are cheap to
+    ask for and can be compared and hashed as dictionary keys. Positions
+    off the board (e.g. anchors hanging off the edge) are not shared, so
+    that they do not pile up, and are only equal by value.
     """
+    BOARD_SIZE: int = 9
+
+    __slots__ = ("__row", "__col")
 
-    def __init__(self, row: int, col: int) -> None:
-        """Creates a new Position object that represents a location
-        on the board at the given row and column (zero-indexed)
+    def __new__(cls, row: int, col: int) -> "Position":
+        """Returns the Position object that represents a location on the
+        board at the given row and column (zero-indexed)
 
         Args:
             row (int): The row (counting from the top of the board) of this position
@@ -14,17 +25,79 @@ class Position():
         Raises:
             ValueError: If the row or column is negative
         """
+        if (0 <= row < cls.BOARD_SIZE and 0 <= col < cls.BOARD_SIZE):
+            return _BOARD_POSITIONS[row * cls.BOARD_SIZE + col]
+
         if (row < 0):
             raise ValueError("Invalid position, row cannot be negative")
         if (col < 0):
             raise ValueError("Invalid position, column cannot be negative")
-        self.__row = row
-        self.__col = col
+        return _create_position(row, col)
+
+    @classmethod
+    def from_index(cls, index: int) -> "Position":
+        """Returns the position on the board with the given flat index
+
+        Args:
+            index (int): The flat index row * BOARD_SIZE + col of the position
+
+        Returns:
+            Position: The position with the given index
+        """
+        return _BOARD_POSITIONS[index]
 
     @property
-    def row(self):
+    def row(self) -> int:
         return self.__row
 
     @property
-    def col(self):
+    def col(self) -> int:
         return self.__col
+
+    @property
+    def index(self) -> int:
+        """Returns the flat index row * BOARD_SIZE + col of this position
+
+        Raises:
+            ValueError: If this position is off the board, where the index
+            would be the same as that of another position on the board
+        """
+        if (self.__row >= self.BOARD_SIZE or self.__col >= self.BOARD_SIZE):
+            raise ValueError(f"Invalid position, {self} is off the board and has no index")
+        return self.__row * self.BOARD_SIZE + self.__col
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Position is immutable")
+
+    def __eq__(self, __o: object) -> bool:
+        if (self is __o):
+            return True
+        if (not isinstance(__o, Position)):
+            return False
+        return self.__row == __o.__row and self.__col == __o.__col
+
+    def __hash__(self) -> int:
+        return hash((self.__row, self.__col))
+
+    def __reduce__(self) -> tuple[type, tuple[int, int]]:
+        # unpickling goes back through __new__ to get the shared instance
+        return (Position, (self.__row, self.__col))
+
+    def __repr__(self) -> str:
+        return f"Position({self.__row}, {self.__col})"
+
+
+def _create_position(row: int, col: int) -> Position:
+    """Creates a new Position object, bypassing the shared instances
+    """
+    position = object.__new__(Position)
+    object.__setattr__(position, "_Position__row", row)
+    object.__setattr__(position, "_Position__col", col)
+    return position
+
+
+# the positions on the board by flat index row * BOARD_SIZE + col
+_BOARD_POSITIONS: list[Position] = [
+    _create_position(row, col)
+    for row in range(Position.BOARD_SIZE)
+    for col in range(Position.BOARD_SIZE)]
@@ -1,9 +1,9 @@
-import random
 from typing import Optional
 from Main.Game.classic_woodoku import ClassicWoodoku
 from Main.Game.piece import Piece
 from Main.Game.position import Position
-from Main.Game.woodoku_game import WoodokuGame
+from Main.Game.woodoku_game import MoveRecord, WoodokuGame
+from Main.Util.random_stream import RandomStream
 
 
 class ReducedWoodoku(ClassicWoodoku):
@@ -19,12 +19,16 @@ class ReducedWoodoku(ClassicWoodoku):
     def __init__(self, board: Optional[list[list[bool]]] = None,
                  consecutive_clears=0,
                  available_pieces: Optional[list[Piece]] = None,
-                 seed=0):
+                 seed=0,
+                 rng: Optional[RandomStream] = None):
         """Initalizes a new Game object which represents a Woodoku game
         Args:
             seed (int, optional): The seed for the RNG for this game. Defaults to 0.
+            rng (RandomStream, optional): The RNG stream that this game draws
+            it's pieces from. Defaults to a new stream seeded with the given seed.
         """
-        self.__classic_game = ClassicWoodoku(board, consecutive_clears, available_pieces, seed)
+        WoodokuGame.__init__(self)
+        self.__classic_game = ClassicWoodoku(board, consecutive_clears, available_pieces, seed, rng)
 
 
     def piece_will_fit(self, piece: Piece, pos: Position) -> bool:
@@ -33,6 +37,15 @@ class ReducedWoodoku(ClassicWoodoku):
     def place_piece(self, piece: Piece, pos: Position) -> int:
         return self.__classic_game.place_piece(piece, pos)
 
+    def apply_move(self, piece: Piece, pos: Position) -> MoveRecord:
+        return self.__classic_game.apply_move(piece, pos)
+
+    def undo_move(self, record: MoveRecord) -> None:
+        self.__classic_game.undo_move(record)
+
+    def get_legal_positions(self, piece: Piece) -> list[Position]:
+        return self.__classic_game.get_legal_positions(piece)
+
 
     def get_available_pieces(self) -> list[Piece]:
         """Returns a copy of list of available pieces the player can use
@@ -50,26 +63,10 @@ class ReducedWoodoku(ClassicWoodoku):
         Returns:
             bool: Whether or not the game is over
         """
+        return not self.__classic_game.is_placeable(self.__classic_game.get_available_pieces()[0])
 
-        def __is_placeable(piece: Piece) -> bool:
-            """Determines if the given piece has any valid moves on the current
-            board
-
-            Args:
-                piece (Piece): The piece to check for valid moves
-
-            Returns:
-                bool: Whether or not the given piece has any valid moves
-            """
-            for row in range(self.SIZE):
-                for col in range(self.SIZE):
-                    if (self.__classic_game.piece_will_fit(piece, Position(row, col))):
-                        return True
-            return False
-
-        return not __is_placeable(self.__classic_game.get_available_pieces()[0])
-
-
+    def is_placeable(self, piece: Piece) -> bool:
+        return self.__classic_game.is_placeable(piece)
 
     def get_size(self) -> int:
         """Returns the size of the board that this game is played on,
@@ -87,14 +84,25 @@ class ReducedWoodoku(ClassicWoodoku):
         """
         return self.__classic_game.board
 
+    @property
+    def version(self) -> int:
+        return self.__classic_game.version
+
+    @property
+    def rng(self) -> RandomStream:
+        """Returns the RNG stream that this game draws it's pieces from
+        """
+        return self.__classic_game.rng
+
     @property
     def consecutive_clears(self) -> int:
         """Returns the number of consecutive clears in this game
         """
-        return 0
+        return self.__classic_game.consecutive_clears
 
     def copy(self) -> "WoodokuGame":
         return ReducedWoodoku(self.__classic_game.board,
                               self.__classic_game.consecutive_clears,
                               self.__classic_game.get_available_pieces(),
-                              self.__classic_game.seed)
+                              self.__classic_game.seed,
+                              self.__classic_game.rng.copy())
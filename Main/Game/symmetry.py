@@ -0,0 +1,239 @@
+from enum import Enum
+from typing import NamedTuple
+
+from Main.Game.bitboard import SIZE, board_to_mask, cell_bit
+from Main.Game.piece import Piece
+from Main.Game.position import Position
+from Main.Game.woodoku_game import WoodokuGame
+from Main.Util.generate_pieces import get_piece_by_id, get_piece_id, get_pieces, intern_piece
+
+# The 8 symmetries of the square keep every row, column and 3x3 box of the
+# board a row, column or box. A state and it's image have the same value as
+# long as the piece catalog is also closed under the symmetry, so that the
+# pieces drawn later are just as likely in both games. The catalog has the
+# vertical domino but not the horizontal one, which leaves the symmetries that
+# do not swap rows and columns. Swapping whole bands of rows (or stacks of
+# columns) also keeps the sections intact, but it is not a symmetry of the game
+# since it splits up pieces that are placed across the border of two bands.
+
+
+class Symmetry(Enum):
+    """A symmetry of the board, which maps the tile at (row, col) to another
+    tile of the board
+    """
+    IDENTITY = 0
+    ROTATE_90 = 1
+    ROTATE_180 = 2
+    ROTATE_270 = 3
+    FLIP_HORIZONTAL = 4
+    FLIP_VERTICAL = 5
+    TRANSPOSE = 6
+    ANTI_TRANSPOSE = 7
+
+    def apply(self, row: int, col: int) -> tuple[int, int]:
+        """Returns the tile that this symmetry maps the given tile of the
+        board to. Rotations are clockwise.
+
+        Args:
+            row (int): The row of the tile
+            col (int): The column of the tile
+
+        Returns:
+            tuple[int, int]: The row and column of the image of the tile
+        """
+        last = SIZE - 1
+        if (self is Symmetry.IDENTITY):
+            return row, col
+        if (self is Symmetry.ROTATE_90):
+            return col, last - row
+        if (self is Symmetry.ROTATE_180):
+            return last - row, last - col
+        if (self is Symmetry.ROTATE_270):
+            return last - col, row
+        if (self is Symmetry.FLIP_HORIZONTAL):
+            return row, last - col
+        if (self is Symmetry.FLIP_VERTICAL):
+            return last - row, col
+        if (self is Symmetry.TRANSPOSE):
+            return col, row
+        return last - col, last - row
+
+    @property
+    def inverse(self) -> "Symmetry":
+        """Returns the symmetry that undoes this one
+        """
+        if (self is Symmetry.ROTATE_90):
+            return Symmetry.ROTATE_270
+        if (self is Symmetry.ROTATE_270):
+            return Symmetry.ROTATE_90
+        return self
+
+
+class CanonicalState(NamedTuple):
+    """The canonical representative of a (board, hand) state, and the symmetry
+    that maps the original state onto it. Moves in the canonical state are
+    mapped back onto the original state with symmetry.inverse.
+    """
+    occupancy: int
+    piece_ids: tuple[int, ...]
+    symmetry: Symmetry
+
+
+def _build_row_tables(symmetry: Symmetry) -> list[list[int]]:
+    """Returns, for every row of the board, the image under the given
+    symmetry of every one of the 2^9 ways of filling the row
+    """
+    tables = []
+    for row in range(SIZE):
+        table = [0] * (1 << SIZE)
+        for filled in range(1, 1 << SIZE):
+            lowest = (filled & -filled).bit_length() - 1
+            table[filled] = table[filled & (filled - 1)] | cell_bit(*symmetry.apply(row, lowest))
+        tables.append(table)
+    return tables
+
+
+_ROW_TABLES: dict[Symmetry, list[list[int]]] = {
+    symmetry: _build_row_tables(symmetry) for symmetry in Symmetry}
+_ROW_MASK: int = (1 << SIZE) - 1
+# the id of the image of every piece under every symmetry
+_PIECE_IMAGES: dict[tuple[int, Symmetry], int] = {}
+_CATALOG_SYMMETRIES: list[Symmetry] = []
+
+
+def transform_mask(occupancy: int, symmetry: Symmetry) -> int:
+    """Returns the image of an occupancy mask under a symmetry
+
+    Args:
+        occupancy (int): The occupancy mask of the board
+        symmetry (Symmetry): The symmetry to apply
+
+    Returns:
+        int: The occupancy mask of the image of the board
+    """
+    tables = _ROW_TABLES[symmetry]
+    rtn = 0
+    for row in range(SIZE):
+        row_bits = (occupancy >> (row * SIZE)) & _ROW_MASK
+        if (row_bits):
+            rtn |= tables[row][row_bits]
+    return rtn
+
+
+def _transform_cells(cells: list[tuple[int, int]],
+                     symmetry: Symmetry) -> tuple[list[tuple[int, int]], int, int]:
+    """Returns the images of the given tiles moved up and left as far as they
+    will go, along with how far they were moved
+    """
+    images = [symmetry.apply(row, col) for row, col in cells]
+    top = min(row for row, _ in images)
+    left = min(col for _, col in images)
+    return [(row - top, col - left) for row, col in images], top, left
+
+
+def transform_piece_id(piece_id: int, symmetry: Symmetry) -> int:
+    """Returns the id of the image of a piece under a symmetry, interning
+    the image if it is not in the catalog
+
+    Args:
+        piece_id (int): The id of the piece
+        symmetry (Symmetry): The symmetry to apply
+
+    Returns:
+        int: The id of the image of the piece
+    """
+    image_id = _PIECE_IMAGES.get((piece_id, symmetry))
+    if (image_id is None):
+        cells, _, _ = _transform_cells(list(get_piece_by_id(piece_id).cells), symmetry)
+        height = max(row for row, _ in cells) + 1
+        width = max(col for _, col in cells) + 1
+        piece_list = [[(row, col) in cells for col in range(width)] for row in range(height)]
+        image_id = get_piece_id(intern_piece(Piece(piece_list)))
+        _PIECE_IMAGES[(piece_id, symmetry)] = image_id
+    return image_id
+
+
+def transform_piece(piece: Piece, symmetry: Symmetry) -> Piece:
+    """Returns the image of a piece under a symmetry
+
+    Args:
+        piece (Piece): The piece
+        symmetry (Symmetry): The symmetry to apply
+
+    Returns:
+        Piece: The interned image of the piece
+    """
+    return get_piece_by_id(transform_piece_id(get_piece_id(piece), symmetry))
+
+
+def transform_move(move: tuple[Piece, Position], symmetry: Symmetry) -> tuple[Piece, Position]:
+    """Returns the image of a move under a symmetry, which places the image
+    of the piece onto the image of the tiles that the move fills
+
+    Args:
+        move (tuple[Piece, Position]): The piece and the position of it's top
+        left corner
+        symmetry (Symmetry): The symmetry to apply
+
+    Returns:
+        tuple[Piece, Position]: The image of the move
+    """
+    piece, pos = move
+    _, top, left = _transform_cells(
+        [(pos.row + row, pos.col + col) for row, col in piece.cells], symmetry)
+    return transform_piece(piece, symmetry), Position(top, left)
+
+
+def catalog_symmetries() -> list[Symmetry]:
+    """Returns the symmetries that map the piece catalog onto itself, which
+    are the symmetries of the game
+
+    Returns:
+        list[Symmetry]: The symmetries of the game, starting with the identity
+    """
+    if (len(_CATALOG_SYMMETRIES) == 0):
+        catalog = set(get_pieces())
+        _CATALOG_SYMMETRIES.extend(
+            symmetry for symmetry in Symmetry
+            if {transform_piece(piece, symmetry) for piece in catalog} == catalog)
+    return _CATALOG_SYMMETRIES
+
+
+def canonicalize(occupancy: int, piece_ids: list[int]) -> CanonicalState:
+    """Returns the canonical representative of a (board, hand) state, which
+    is the same for the state and all of it's images under the symmetries of
+    the game. The order of the hand does not matter.
+
+    Args:
+        occupancy (int): The occupancy mask of the board
+        piece_ids (list[int]): The ids of the pieces in the hand
+
+    Returns:
+        CanonicalState: The canonical state and the symmetry that maps the
+        given state onto it
+    """
+    best = None
+    for symmetry in catalog_symmetries():
+        image = CanonicalState(
+            transform_mask(occupancy, symmetry),
+            tuple(sorted(transform_piece_id(piece_id, symmetry) for piece_id in piece_ids)),
+            symmetry)
+        if (best is None or image[:2] < best[:2]):
+            best = image
+    assert best is not None
+    return best
+
+
+def canonicalize_game(state: WoodokuGame) -> CanonicalState:
+    """Returns the canonical representative of the board and the available
+    pieces of a game
+
+    Args:
+        state (WoodokuGame): The game
+
+    Returns:
+        CanonicalState: The canonical state and the symmetry that maps the
+        game onto it
+    """
+    return canonicalize(board_to_mask(state.board),
+                        [get_piece_id(piece) for piece in state.get_available_pieces()])
@@ -1,7 +1,30 @@
 from abc import ABC, abstractmethod
+from typing import Any, NamedTuple, Optional
 
+from Main.Game.bitboard import board_to_mask
 from Main.Game.piece import Piece
 from Main.Game.position import Position
+from Main.Game.zobrist import zobrist_hash
+from Main.Util.generate_pieces import get_piece_id
+from Main.Util.random_stream import RandomStream
+
+# the number of pieces that are drawn into the hand at a time
+HAND_SIZE: int = 3
+
+
+class MoveRecord(NamedTuple):
+    """The record returned by WoodokuGame.apply_move, which holds the reward
+    for the move and everything that is needed to undo it
+    """
+    reward: int
+    # the available pieces and number of consecutive clears before the move
+    available_pieces: tuple[Piece, ...]
+    consecutive_clears: int
+    # a snapshot of the board before the move, in whatever form the game uses
+    board: Any
+    # the state of the RNG before the available pieces were refilled, or None
+    # if the move did not use up the last available piece
+    rng_state: Optional[Any]
 
 
 class WoodokuGame(ABC):
@@ -12,8 +35,17 @@ class WoodokuGame(ABC):
     legal before executing it (by checking if a piece will fit).
     It also will provide the user with a set of Pieces that are
     available for placement.
+
+    Every game has a version, which games advance whenever their state
+    changes. The legal moves of a game are computed at most once per version
+    and shared by every caller that asks for them.
     """
 
+    def __init__(self):
+        self.__version = 0
+        self.__legal_moves: Optional[list[tuple[Piece, Position]]] = None
+        self.__legal_moves_version = -1
+
     @abstractmethod
     def place_piece(self, piece: Piece, pos: Position) -> int:
         """Simulates the placement of a given piece at the given locatio, will return
@@ -22,6 +54,33 @@ class WoodokuGame(ABC):
         """
         pass
 
+    @abstractmethod
+    def apply_move(self, piece: Piece, pos: Position) -> MoveRecord:
+        """Places the given piece at the given location exactly like
+        place_piece, but returns a record of the move that can be given
+        to undo_move to return the game to the state before the move.
+
+        Args:
+            piece (Piece): The piece to place
+            pos (Position): The position to place the piece at
+
+        Returns:
+            MoveRecord: The reward for the move and the record to undo it with
+        """
+        pass
+
+    @abstractmethod
+    def undo_move(self, record: MoveRecord) -> None:
+        """Undoes the move with the given record, including any clears, the
+        consecutive clear counter and refilling the available pieces. Moves
+        must be undone in the reverse order to the order they were applied in,
+        and each record can only be undone once.
+
+        Args:
+            record (MoveRecord): The record returned by apply_move
+        """
+        pass
+
     @abstractmethod
     def piece_will_fit(self, piece: Piece, pos: Position) -> bool:
         """Returns true or false depending on whether or not the piece can
@@ -37,6 +96,72 @@ class WoodokuGame(ABC):
         """
         pass
 
+    def get_legal_positions(self, piece: Piece) -> list[Position]:
+        """Returns every position, in row-column order, where the given piece
+        can be placed legally. Games with a faster way of finding the legal
+        positions than trying every tile should override this.
+
+        Args:
+            piece (Piece): The piece to find the legal positions of
+
+        Returns:
+            list[Position]: The positions that the piece could be placed onto
+        """
+        return [Position(row, col)
+                for row in range(self.get_size())
+                for col in range(self.get_size())
+                if self.piece_will_fit(piece, Position(row, col))]
+
+    def get_legal_moves(self) -> list[tuple[Piece, Position]]:
+        """Returns every legal move of this game, by available piece and then
+        by position in row-column order. The moves are computed once for every
+        version of the game, and every call gets it's own copy of them.
+
+        Returns:
+            list[tuple[Piece, Position]]: Every legal move of this game
+        """
+        if (self.__legal_moves_version != self.version or self.__legal_moves is None):
+            self.__legal_moves = [(piece, pos)
+                                  for piece in self.get_available_pieces()
+                                  for pos in self.get_legal_positions(piece)]
+            self.__legal_moves_version = self.version
+        return self.__legal_moves[:]
+
+    def _cached_legal_moves(self) -> Optional[list[tuple[Piece, Position]]]:
+        """Returns the legal moves of this game if they have already been
+        computed for the current version, and None otherwise. The list must not
+        be changed.
+        """
+        if (self.__legal_moves_version != self.version):
+            return None
+        return self.__legal_moves
+
+    def _advance_version(self) -> None:
+        """Moves this game onto a new version, which is called by games
+        whenever their state changes
+        """
+        self.__version += 1
+
+    @property
+    def version(self) -> int:
+        """Returns the version of this game, which changes whenever it's state
+        changes
+        """
+        return self.__version
+
+    def is_placeable(self, piece: Piece) -> bool:
+        """Returns whether the given piece can be placed anywhere on the board.
+        Games that keep track of where pieces can be placed should override
+        this.
+
+        Args:
+            piece (Piece): The piece to check for legal positions
+
+        Returns:
+            bool: Whether the piece has any legal position
+        """
+        return len(self.get_legal_positions(piece)) != 0
+
     @abstractmethod
     def get_available_pieces(self) -> list[Piece]:
         """Returns the list of currently available pieces for placement
@@ -75,3 +200,26 @@ class WoodokuGame(ABC):
     @abstractmethod
     def board(self) -> list[list[bool]]:
         pass
+
+    @property
+    @abstractmethod
+    def rng(self) -> RandomStream:
+        """Returns the RNG stream that this game draws it's pieces from
+        """
+        pass
+
+    @property
+    def consecutive_clears(self) -> int:
+        """Returns the number of consecutive clears in this game
+        """
+        return 0
+
+    @property
+    def zobrist_hash(self) -> int:
+        """Returns the Zobrist hash of the board, the available pieces and
+        the number of consecutive clears of this game. Games that can keep
+        the hash up to date as moves are made should override this.
+        """
+        return zobrist_hash(board_to_mask(self.board),
+                            [get_piece_id(piece) for piece in self.get_available_pieces()],
+                            self.consecutive_clears)
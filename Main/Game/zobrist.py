@@ -0,0 +1,100 @@
+from Main.Game.bitboard import SIZE
+from Main.Util.random_stream import RandomStream
+
+# Zobrist hashing gives every tile, piece and number of consecutive clears a
+# random 64 bit key. The hash of a board is the XOR of the keys of it's filled
+# tiles, so placing or clearing tiles updates it by XORing in the keys of the
+# tiles that changed. The hash of a hand is the sum of the keys of it's pieces,
+# so that the same piece twice does not cancel out.
+ZOBRIST_SEED: int = 0x5EED
+KEY_BITS: int = 64
+KEY_MASK: int = (1 << KEY_BITS) - 1
+
+_RNG = RandomStream(ZOBRIST_SEED)
+CELL_KEYS: list[int] = [_RNG.getrandbits(KEY_BITS) for _ in range(SIZE * SIZE)]
+
+
+def _build_row_table(row: int) -> list[int]:
+    """Returns the XOR of the keys of the filled tiles of the given row for
+    every one of the 2^9 ways of filling it
+    """
+    table = [0] * (1 << SIZE)
+    for filled in range(1, 1 << SIZE):
+        lowest = (filled & -filled).bit_length() - 1
+        table[filled] = table[filled & (filled - 1)] ^ CELL_KEYS[row * SIZE + lowest]
+    return table
+
+
+_ROW_TABLES: list[list[int]] = [_build_row_table(row) for row in range(SIZE)]
+_ROW_MASK: int = (1 << SIZE) - 1
+
+# keys are drawn in order of id, so the key of an id never depends on which
+# keys were asked for first
+_PIECE_KEY_RNG = RandomStream(ZOBRIST_SEED + 1)
+_PIECE_KEYS: list[int] = []
+_CLEAR_KEY_RNG = RandomStream(ZOBRIST_SEED + 2)
+_CLEAR_KEYS: list[int] = []
+
+
+def board_hash(occupancy: int) -> int:
+    """Returns the XOR of the keys of every filled tile of the given board.
+    Since the hash is linear in XOR, board_hash(old ^ new) is the update that
+    takes the hash of the old board to the hash of the new one.
+
+    Args:
+        occupancy (int): The occupancy mask of the board
+
+    Returns:
+        int: The hash of the board
+    """
+    rtn = 0
+    for row in range(SIZE):
+        row_bits = (occupancy >> (row * SIZE)) & _ROW_MASK
+        if (row_bits):
+            rtn ^= _ROW_TABLES[row][row_bits]
+    return rtn
+
+
+def piece_key(piece_id: int) -> int:
+    """Returns the key of the piece with the given id
+    """
+    while (len(_PIECE_KEYS) <= piece_id):
+        _PIECE_KEYS.append(_PIECE_KEY_RNG.getrandbits(KEY_BITS))
+    return _PIECE_KEYS[piece_id]
+
+
+def clear_key(consecutive_clears: int) -> int:
+    """Returns the key of the given number of consecutive clears
+    """
+    while (len(_CLEAR_KEYS) <= consecutive_clears):
+        _CLEAR_KEYS.append(_CLEAR_KEY_RNG.getrandbits(KEY_BITS))
+    return _CLEAR_KEYS[consecutive_clears]
+
+
+def hand_hash(piece_ids: list[int]) -> int:
+    """Returns the hash of a hand of pieces, which does not depend on the
+    order of the pieces
+
+    Args:
+        piece_ids (list[int]): The ids of the pieces in the hand
+
+    Returns:
+        int: The hash of the hand
+    """
+    return sum(piece_key(piece_id) for piece_id in piece_ids) & KEY_MASK
+
+
+def zobrist_hash(occupancy: int, piece_ids: list[int], consecutive_clears: int) -> int:
+    """Returns the hash of a game state, made up of the board, the available
+    pieces and the number of consecutive clears
+
+    Args:
+        occupancy (int): The occupancy mask of the board
+        piece_ids (list[int]): The ids of the available pieces
+        consecutive_clears (int): The number of consecutive clears
+
+    Returns:
+        int: The hash of the game state
+    """
+    return board_hash(occupancy) ^ hand_hash(piece_ids) ^ clear_key(consecutive_clears)
+
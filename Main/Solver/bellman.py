@@ -0,0 +1,182 @@
+from typing import NamedTuple, Optional
+
+from Main.Game.bitboard import board_to_mask, clear_sections, isolated_holes, placement_table
+from Main.Game.bitboard_woodoku import BitboardWoodoku
+from Main.Game.piece import Piece
+from Main.Game.position import Position
+from Main.Game.woodoku_game import WoodokuGame
+from Main.Solver.evaluation import DEFAULT_WEIGHTS, EvaluationWeights, evaluate
+from Main.Solver.solver import Solver
+from Main.Util.generate_pieces import get_piece_by_id, get_piece_id
+
+HOLE_PENALTY: int = 2
+
+
+class Plan(NamedTuple):
+    """A partial plan for the pieces in hand, and the state that it leads to
+    """
+    occupancy: int
+    # the ids of the pieces that are left in hand, in sorted order
+    hand: tuple[int, ...]
+    consecutive_clears: int
+    reward: int
+    # the moves of the plan, each with the key of the state it is made in
+    moves: tuple[tuple[tuple[int, tuple[int, ...], int], tuple[Piece, Position]], ...]
+
+
+class Bellman(Solver):
+    """Plans every piece of the hand at once with a beam search over the
+    orders and placements of the pieces, and plays the plan out over the
+    next moves. Plans that reach the same board with the same pieces left
+    are merged, keeping the one with the highest reward. The search is
+    deterministic and takes a bounded amount of work per turn.
+    """
+
+    def __init__(self, beam_width: int = 16,
+                 evaluation_weights: EvaluationWeights = DEFAULT_WEIGHTS):
+        """Creates a new beam search solver
+
+        Args:
+            beam_width (int, optional): The most partial plans to keep after
+            placing each piece. Defaults to 16.
+            evaluation_weights (EvaluationWeights, optional): The weights of the
+            static evaluation that is added to the reward of every complete plan
+            to choose between them. Defaults to DEFAULT_WEIGHTS.
+
+        Raises:
+            ValueError: If beam_width is not positive
+        """
+        if (beam_width <= 0):
+            raise ValueError("Invalid beam_width, must be positive")
+        self.__beam_width = beam_width
+        self.__evaluation_weights = evaluation_weights
+        # the rest of the last plan, which is played as long as the states
+        # that the solver is given are the ones that the plan expects
+        self.__plan: list[tuple[tuple[int, tuple[int, ...], int], tuple[Piece, Position]]] = []
+
+    def get_move(self, state: WoodokuGame) -> tuple[Piece, Position]:
+        """Returns the next move of the best plan for the pieces in hand,
+        planning again unless the state is the one the last plan expects
+
+        Args:
+            state (WoodokuGame): The state of the game to move in
+
+        Returns:
+            tuple[Piece, Position]: The piece and the position to place it
+        """
+        if (isinstance(state, BitboardWoodoku)):
+            occupancy = state.occupancy
+        else:
+            occupancy = board_to_mask(state.board)
+        hand = tuple(sorted(get_piece_id(piece) for piece in state.get_available_pieces()))
+
+        key = (occupancy, hand, state.consecutive_clears)
+        if (len(self.__plan) == 0 or self.__plan[0][0] != key):
+            self.__plan = list(self.plan(occupancy, hand, state.consecutive_clears).moves)
+        return self.__plan.pop(0)[1]
+
+    def plan(self, occupancy: int, hand: tuple[int, ...], consecutive_clears: int) -> Plan:
+        """Returns the best plan for placing the given pieces on the board
+
+        Args:
+            occupancy (int): The occupancy mask of the board
+            hand (tuple[int, ...]): The ids of the pieces in hand
+            consecutive_clears (int): The number of consecutive clears so far
+
+        Returns:
+            Plan: The best plan
+        """
+        return max(self.search(occupancy, hand, consecutive_clears), key=self.value)
+
+    def search(self, occupancy: int, hand: tuple[int, ...], consecutive_clears: int) -> list[Plan]:
+        """Runs the beam search for placing the given pieces on the board, and
+        returns the plans that are left in the beam at the end. If no plan
+        places every piece, the plans that got stuck on the way are returned
+        as well, since a plan that cannot place every piece ends the game.
+
+        Args:
+            occupancy (int): The occupancy mask of the board
+            hand (tuple[int, ...]): The ids of the pieces in hand
+            consecutive_clears (int): The number of consecutive clears so far
+
+        Returns:
+            list[Plan]: The plans left at the end of the search, the complete
+            ones in order of the score they were kept in the beam by
+        """
+        beam = [Plan(occupancy, tuple(sorted(hand)), consecutive_clears, 0, ())]
+        stuck: list[Plan] = []
+        for _ in range(len(hand)):
+            children: dict[tuple[int, tuple[int, ...], int], Plan] = {}
+            for plan in beam:
+                expanded = False
+                for child in self.__expand(plan):
+                    expanded = True
+                    key = (child.occupancy, child.hand, child.consecutive_clears)
+                    known = children.get(key)
+                    if (known is None or known.reward < child.reward):
+                        children[key] = child
+                if (not expanded):
+                    stuck.append(plan)
+
+            if (len(children) == 0):
+                break
+            beam = sorted(children.values(), key=self.__rank, reverse=True)[:self.__beam_width]
+
+        if (len(beam[0].moves) == len(hand)):
+            return beam
+        return beam + stuck
+
+    def value(self, plan: Plan) -> tuple[int, float]:
+        """Returns the value that complete plans are chosen by, plans that place
+        more pieces are always better
+
+        Args:
+            plan (Plan): The plan
+
+        Returns:
+            tuple[int, float]: The number of moves in the plan, and it's
+            reward plus the static evaluation of the board it leads to
+        """
+        return (len(plan.moves),
+                plan.reward + evaluate(plan.occupancy, self.__evaluation_weights))
+
+    def __expand(self, plan: Plan) -> list[Plan]:
+        """Returns every plan that places one more piece after the given plan
+        """
+        children = []
+        for slot, piece_id in enumerate(plan.hand):
+            if (slot > 0 and plan.hand[slot - 1] == piece_id):
+                continue
+            piece = get_piece_by_id(piece_id)
+            rest = plan.hand[:slot] + plan.hand[slot + 1:]
+            key = (plan.occupancy, plan.hand, plan.consecutive_clears)
+            for pos, mask in placement_table(piece):
+                if (mask & plan.occupancy):
+                    continue
+                occupancy, cleared_count = clear_sections(plan.occupancy | mask, mask)
+                reward = 18 * (plan.consecutive_clears + 1) * cleared_count + piece.filled
+                consecutive_clears = plan.consecutive_clears + 1 if cleared_count > 0 else 0
+                children.append(Plan(occupancy, rest, consecutive_clears, plan.reward + reward,
+                                     plan.moves + ((key, (piece, pos)),)))
+        return children
+
+    @staticmethod
+    def __rank(plan: Plan) -> int:
+        """Returns the score that partial plans are kept in the beam by, which
+        is cheap enough to compute for every expanded plan
+        """
+        return plan.reward - HOLE_PENALTY * isolated_holes(plan.occupancy).bit_count()
+
+    @property
+    def beam_width(self) -> int:
+        return self.__beam_width
+
+    @property
+    def evaluation_weights(self) -> EvaluationWeights:
+        return self.__evaluation_weights
+
+    @property
+    def planned_moves(self) -> list[tuple[Piece, Position]]:
+        """Returns the moves of the last plan that have not been played yet
+        """
+        return [move for _, move in self.__plan]
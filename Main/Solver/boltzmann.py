@@ -3,13 +3,15 @@ from Main.Game.position import Position
 from Main.Game.woodoku_game import WoodokuGame
 from Main.Solver.selector import Selector
 from Main.Solver.solver import Solver
-
-import random
+from Main.Util.random_stream import RandomStream
 
 class Boltzmann(Selector):
     """A solver that implements a random strategy, selecting any of the
     legal moves in a given game state.
     """    
+    def __init__(self, seed: int = 0):
+        self.__rng = RandomStream(seed)
+
     def get_move(self, state: WoodokuGame) -> tuple[Piece, Position]:
         """Returns a random move out of all the possible valid moves to
         make
@@ -21,6 +23,6 @@ class Boltzmann(Selector):
             tuple[Piece, Position]: The move that this solver has returned
             as the selected move
         """        
-        return random.choice(Selector.get_legal_moves(state))
+        return self.__rng.choice(Selector.get_legal_moves(state))
     
 
@@ -1,79 +1,46 @@
-import math
-import random
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, NamedTuple, Optional
+import weakref
 from Main.Game.piece import Piece
 from Main.Game.position import Position
-from Main.Game.woodoku_game import WoodokuGame
-from Main.Solver.boltzmann import Boltzmann
-from Main.Solver.pythagoras import Pythagoras
-from Main.Solver.selector import Selector
+from Main.Game.woodoku_game import MoveRecord, WoodokuGame
+from Main.Solver.evaluation import EvaluationWeights, evaluate_state
+from Main.Solver.node_store import Node, NodeStore
+from Main.Solver.rollout import RolloutPolicy, rollout_state
+from Main.Solver.transposition_table import TranspositionTable
 from Main.Solver.solver import Solver
-from Main.Environment.environment import Environment
+from Main.Util.random_stream import RandomStream
 
 import time
 
-class Node():
-    """Represents a Node in the MCTS algorithm
-    """
-
-    def __init__(self, state: WoodokuGame,
-                 total_reward: int,
-                 times_visited: int,
-                 children: Optional[dict[tuple[Piece, Position], "Node"]]=None,
-                 parent: Optional["Node"] = None):
-
-        self.__state = state
-        self.__total_reward = total_reward
-        self.__times_visited = times_visited
-
-        if(children is None):
-            children = {}
-        self.__children = children
-        self.__parent = parent
-
-
-    def populate_children(self) -> None:
-        """Creates and populates the children of this node by randomly
-        selecting moves and determining the resultant state
-        """
-        legal_moves = Selector.get_legal_moves(self.__state)
-        random.shuffle(legal_moves)
-        
-        def explore_child(move: tuple[Piece, Position]) -> None:
-            temp_state = self.__state.copy()
-            temp_state.place_piece(*move)
-            self.__children[move] = Node(temp_state, 0, 0, parent=self)
-
-        for move in legal_moves[:50]:
-            explore_child(move)
-
-    @property
-    def children(self) -> dict[tuple[Piece, Position], "Node"]:
-        return self.__children
-
-    @property
-    def total_reward(self) -> int:
-        return self.__total_reward
-
-    @total_reward.setter
-    def total_reward(self, val: int) -> None:
-        self.__total_reward = val
 
-    @property
-    def times_visited(self) -> int:
-        return self.__times_visited
-
-    @times_visited.setter
-    def times_visited(self, val: int) -> None:
-        self.__times_visited = val
+class SearchStats(NamedTuple):
+    """The statistics of one search of Euler, with the time spent in every
+    phase of the search summed over all of it's iterations
+    """
+    iterations: int
+    seconds: float
+    # walking down the tree, applying the moves and looking up transpositions
+    selection_seconds: float
+    # populating the leaf with it's legal moves
+    expansion_seconds: float
+    # rolling the leaf out and evaluating it
+    rollout_seconds: float
+    # adding the result to the path and undoing the moves
+    backpropagation_seconds: float
+    # the number of nodes in the tree at the end of the search
+    tree_size: int
+    # the most moves from the root to a leaf of any iteration
+    max_depth: int
+    # the visits of every child of the root at the end of the search
+    root_visits: dict[tuple[Piece, Position], int]
 
     @property
-    def state(self) -> WoodokuGame:
-        return self.__state.copy()
-    
-    @property
-    def parent(self) -> Optional["Node"]:
-        return self.__parent
+    def rollouts_per_second(self) -> float:
+        """Returns the number of iterations, each of which ends in a rollout,
+        per second of the search
+        """
+        return self.iterations / self.seconds if self.seconds > 0 else 0.0
 
 
 class Euler(Solver):
@@ -81,9 +48,75 @@ class Euler(Solver):
     Monte Carlo Tree Search
     """
 
-    def __init__(self, seconds_per_move: float = 5, seed: int = 0):
+    def __init__(self, seconds_per_move: float = 5, seed: int = 0,
+                 rollout_policy: RolloutPolicy = RolloutPolicy.RANDOM,
+                 rollout_depth: Optional[int] = None,
+                 workers: int = 1,
+                 transposition_table_size: Optional[int] = None,
+                 reuse_tree: bool = True,
+                 evaluation_weights: Optional[EvaluationWeights] = None,
+                 stats_callback: Optional[Callable[[SearchStats], None]] = None,
+                 max_nodes: Optional[int] = None):
+        """Creates a new MCTS solver
+
+        Args:
+            seconds_per_move (float, optional): The time to search for on every
+            move. Defaults to 5.
+            seed (int, optional): The seed of the RNG of the search. Defaults to 0.
+            rollout_policy (RolloutPolicy, optional): The policy that rollouts
+            are played with. Defaults to RolloutPolicy.RANDOM.
+            rollout_depth (int, optional): The most moves to play in a rollout.
+            Defaults to playing until the game is over.
+            workers (int, optional): The number of processes to search in. With
+            more than one worker, every worker runs an independent search from
+            the root with it's own RNG stream for the whole time budget, and the
+            statistics of the root's children are merged before choosing a
+            move. Defaults to 1, which searches in this process.
+            transposition_table_size (int, optional): The most states to keep
+            in a transposition table, which lets states that are reached by
+            different orders of moves share one node of the tree. Defaults to
+            no transposition table.
+            reuse_tree (bool, optional): Whether to keep the subtree under the
+            chosen move and resume the next search from it, when the next state
+            given to the solver is the state that the move leads to. Only used
+            with a single worker. Defaults to True.
+            evaluation_weights (EvaluationWeights, optional): The weights of a
+            static evaluation of the leaf that is added to the value of every
+            playout, which together with a rollout depth of 0 replaces the
+            rollouts. Defaults to no static evaluation.
+            stats_callback (Callable[[SearchStats], None], optional): Called
+            with the statistics of the search of every move. The statistics
+            of the last search are also kept in last_stats. Defaults to None.
+            max_nodes (int, optional): The most nodes to keep in the search
+            tree. Once the tree is full no more children are created or
+            populated, and iterations roll out from the first node on their
+            path that would need a new child, so the tree stays within a fixed
+            footprint. Defaults to no limit.
+        """
         self.__seconds_per_move = seconds_per_move
-        random.seed(seed)
+        self.__rng = RandomStream(seed)
+        self.__rollout_policy = rollout_policy
+        self.__rollout_depth = rollout_depth
+        self.__workers = workers
+        self.__pool: Optional[ProcessPoolExecutor] = None
+        # shuts the pool down when this solver is garbage collected or the
+        # interpreter exits, if close was never called
+        self.__pool_finalizer: Optional[weakref.finalize] = None
+        self.__transposition_table_size = transposition_table_size
+        self.__max_nodes = max_nodes
+        self.__reuse_tree = reuse_tree
+        self.__evaluation_weights = evaluation_weights
+        self.__stats_callback = stats_callback
+        self.__last_stats: Optional[SearchStats] = None
+
+        # the subtree kept from the last move, the key of the state that it
+        # belongs to, and the reward gained between the root that it's values
+        # are measured from and the state that it belongs to
+        self.__next_root: Optional[Node] = None
+        self.__next_key: Optional[tuple[int, tuple]] = None
+        self.__reward_offset = 0
+        self.__store = NodeStore()
+        self.__table: Optional[TranspositionTable[int]] = None
 
     def get_move(self, state: WoodokuGame) -> tuple[Piece, Position]:
         """Returns a move as determined by a Monte-Carlo Tree Search on the
@@ -95,90 +128,277 @@ class Euler(Solver):
         Returns:
             tuple[Piece, Position]: The piece and the position to place it
         """
-        start_time = time.time()
-        root = Node(state, 0, 0)
-        root.populate_children()
-
-        nodes_explored = 0
-        while (time.time() - start_time <= self.__seconds_per_move):
-            leaf = self.select(root)
-            leaf.populate_children()
-            rollout_result = self.rollout(leaf, Pythagoras())
-            self.back_propagate(leaf, rollout_result)
-
-            nodes_explored += 1
-            # print(nodes_explored)
-        
-        best_action = self.get_best_child_action(root)
-        return best_action
-
-    def select(self, current_node: Node) -> Node:
-        """Selects a node in the MCTS exploration tree to evaluate by
-        calculating the average return and using the UCB algorithm.
+        if (self.__workers <= 1):
+            root = self.search(state)
+            move = self.get_best_child_action(root)
+            if (self.__reuse_tree):
+                self.__keep_subtree(state, root, move)
+            self.__report_stats()
+            return move
+
+        if (self.__pool is None):
+            self.__pool = ProcessPoolExecutor(max_workers=self.__workers)
+            self.__pool_finalizer = weakref.finalize(self, self.__pool.shutdown)
+        futures = [self.__pool.submit(_search_root,
+                                      (self.__seconds_per_move,
+                                       self.__rng.split().stream_seed,
+                                       self.__rollout_policy,
+                                       self.__rollout_depth,
+                                       1,
+                                       self.__transposition_table_size,
+                                       False,
+                                       self.__evaluation_weights,
+                                       None,
+                                       self.__max_nodes),
+                                      state)
+                   for _ in range(self.__workers)]
+
+        # merge the children of the roots of every search into one root
+        totals: dict[tuple[Piece, Position], list[float]] = {}
+        worker_stats = []
+        for future in futures:
+            children, stats = future.result()
+            worker_stats.append(stats)
+            for move, total_reward, times_visited in children:
+                total = totals.setdefault(move, [0, 0])
+                total[0] += total_reward
+                total[1] += times_visited
+
+        store = NodeStore()
+        root = Node(store, store.add_node())
+        store.add_children(root.index, list(totals))
+        for child, (total_reward, times_visited) in zip(root.children.values(), totals.values()):
+            child.total_reward = total_reward
+            child.times_visited = times_visited
+            root.total_reward += total_reward
+            root.times_visited += times_visited
+
+        # the workers search at the same time, so the time of the move is
+        # that of the slowest worker while the work of every worker adds up
+        self.__last_stats = SearchStats(
+            sum(stats.iterations for stats in worker_stats),
+            max(stats.seconds for stats in worker_stats),
+            sum(stats.selection_seconds for stats in worker_stats),
+            sum(stats.expansion_seconds for stats in worker_stats),
+            sum(stats.rollout_seconds for stats in worker_stats),
+            sum(stats.backpropagation_seconds for stats in worker_stats),
+            sum(stats.tree_size for stats in worker_stats),
+            max(stats.max_depth for stats in worker_stats),
+            {move: int(times_visited) for move, (_, times_visited) in totals.items()})
+        self.__report_stats()
+        return self.get_best_child_action(root)
+
+    def close(self) -> None:
+        """Shuts down the worker processes of this solver, if there are any.
+        The solver starts new workers if it is asked for another move.
+        """
+        if (self.__pool_finalizer is not None):
+            self.__pool_finalizer()
+            self.__pool_finalizer = None
+        self.__pool = None
+
+    def __enter__(self) -> "Euler":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def search(self, state: WoodokuGame) -> Node:
+        """Runs a Monte-Carlo Tree Search from the given state for the time
+        budget of this solver, and returns the root of the search tree. The
+        search walks a single copy of the state, applying the moves on the way
+        down the tree and undoing them on the way back up. If the state is the
+        one that the last chosen move leads to, the search resumes from the
+        subtree kept from the last search.
+
+        Args:
+            state (WoodokuGame): The state of the game to search from, which
+            is not mutated
+
+        Returns:
+            Node: The root of the search tree
+        """
+        start_time = time.perf_counter()
+        root = self.__take_root(state)
+        store = self.__store
+        # the root is populated before copying the state, so that it shares
+        # the legal moves that the caller may already have asked the state for
+        store.populate_children(root, state, self.__rng)
+        state = state.copy()
+        table = self.__table
+
+        iterations = 0
+        max_depth = 0
+        # the time spent in selection, expansion, rollout and backpropagation
+        phase_seconds = [0.0, 0.0, 0.0, 0.0]
+        while (time.perf_counter() - start_time <= self.__seconds_per_move):
+            phase_start = time.perf_counter()
+            records: list[MoveRecord] = []
+            path = [root]
+            leaf = root
+            # walk down the tree until reaching a node that was never visited
+            # or a node without any children (where the game is over)
+            while (store.populated(leaf) and store.child_count(leaf) != 0):
+                edge = self.select(leaf, not self.__tree_full())
+                if (edge < 0):
+                    break
+                records.append(state.apply_move(*store.edge_move(edge)))
+                leaf = store.edge_target(edge)
+
+                if (table is not None and store.visits(leaf) == 0):
+                    # share the node of this state if it was already reached
+                    # by another order of moves
+                    key = state.zobrist_hash
+                    known = table.get(key)
+                    if (known is None):
+                        table.put(key, leaf)
+                    elif (known not in path):
+                        store.set_edge_target(edge, known)
+                        # the node that was just created for the edge can not
+                        # be reached anymore, so it does not count to the tree
+                        if (leaf == len(store) - 1):
+                            store.remove_last_node()
+                        leaf = known
+                path.append(leaf)
+            phase_end = time.perf_counter()
+            phase_seconds[0] += phase_end - phase_start
+            phase_start = phase_end
+
+            if (not self.__tree_full()):
+                store.populate_children(leaf, state, self.__rng)
+            phase_end = time.perf_counter()
+            phase_seconds[1] += phase_end - phase_start
+            phase_start = phase_end
+
+            # the value of a playout is all of the reward gained from the root,
+            # which is the same for every order of moves that reaches a state
+            # up to the timing of clears
+            path_reward = self.__reward_offset + sum(record.reward for record in records)
+            rollout_result = path_reward + self.rollout(state)
+            if (self.__evaluation_weights is not None):
+                rollout_result += evaluate_state(state, self.__evaluation_weights)
+            phase_end = time.perf_counter()
+            phase_seconds[2] += phase_end - phase_start
+            phase_start = phase_end
+
+            self.back_propagate(path, rollout_result)
+            for record in reversed(records):
+                state.undo_move(record)
+            phase_seconds[3] += time.perf_counter() - phase_start
+
+            iterations += 1
+            max_depth = max(max_depth, len(records))
+
+        root_node = Node(store, root)
+        self.__last_stats = SearchStats(
+            iterations, time.perf_counter() - start_time, *phase_seconds, len(store), max_depth,
+            {move: child.times_visited for move, child in root_node.children.items()})
+        return root_node
+
+    def __report_stats(self) -> None:
+        """Passes the statistics of the last search to the stats callback
+        """
+        if (self.__stats_callback is not None and self.__last_stats is not None):
+            self.__stats_callback(self.__last_stats)
+
+    def __take_root(self, state: WoodokuGame) -> int:
+        """Sets up the store to search the given state with, which holds the
+        subtree kept from the last move if it belongs to the given state and
+        is new otherwise, and returns the index of the root in it
 
         Args:
-            current_node (Node): The parent node, whose children are being
+            state (WoodokuGame): The state to search from
+
+        Returns:
+            int: The index of the root of the search
+        """
+        key = (state.zobrist_hash, state.rng.getstate())
+        kept, self.__next_root = self.__next_root, None
+        if (kept is not None and key == self.__next_key):
+            # copying out the kept subtree drops the rest of the old tree
+            self.__store = kept.store.subtree(kept.index)
+            root = 0
+        else:
+            self.__store = NodeStore()
+            root = self.__store.add_node()
+            self.__reward_offset = 0
+
+        self.__table = None
+        if (self.__transposition_table_size is not None):
+            self.__table = TranspositionTable(self.__transposition_table_size)
+            self.__table.put(state.zobrist_hash, root)
+        return root
+
+    def __keep_subtree(self, state: WoodokuGame, root: Node,
+                       move: tuple[Piece, Position]) -> None:
+        """Keeps the subtree under the chosen move so that the next search
+        can resume from it. Nothing is kept if the child of the move was never
+        created, e.g. when the search had no time for a single iteration.
+
+        Args:
+            state (WoodokuGame): The state that was searched from
+            root (Node): The root of the search
+            move (tuple[Piece, Position]): The chosen move
+        """
+        child = root.children.get(move)
+        if (child is None):
+            return
+        next_state = state.copy()
+        record = next_state.apply_move(*move)
+        self.__next_root = child
+        self.__next_key = (next_state.zobrist_hash, next_state.rng.getstate())
+        # the values in the subtree stay measured from the old root, so the
+        # reward of the move is added to every result of the next search,
+        # which shifts the value of every child of the new root equally
+        self.__reward_offset += record.reward
+
+    def select(self, node: int, create: bool = True) -> int:
+        """Selects a child of a node in the MCTS exploration tree to evaluate
+        by calculating the average return and using the UCB algorithm over
+        all of the children at once.
+
+        Args:
+            node (int): The index of the parent node, whose children are being
             considered for selection
+            create (bool, optional): Whether a child that has not been created
+            yet may be selected. Defaults to True.
 
         Returns:
-            Node: The node which is selected via UCB
+            int: The index of the edge to the child which is selected via UCB,
+            or -1 if there is no child that can be selected
+        """
+        return self.__store.select(node, create)
+
+    def __tree_full(self) -> bool:
+        """Returns whether the search tree holds max_nodes nodes
         """
-        def __score(node: Node) -> float:
-            if(node.parent is None):
-                return 0
-
-            average_return = node.total_reward / node.times_visited
-            c = 2**0.5
-            return average_return + c * (math.log(node.parent.times_visited)/node.times_visited)
-
-        unvisited: list[Node] = []
-        for _, node in current_node.children.items():
-            if(node.times_visited == 0):
-                unvisited.append(node)
-        # if there are any unvisited nodes
-        if(len(unvisited) != 0):
-            # use the first one
-            return unvisited[0]
-
-        all_nodes: list[Node] = list(current_node.children.values())
-        selected_node = list(sorted(all_nodes, key=__score, reverse=True))[0]
-        return selected_node
-        
-    def rollout(self, current_node: Node, solver: Solver) -> int:
-        """Approximates the value of a Node via a rollout algorithm. In this case
-        the Pythagoreas Strategy is the rollout.
+        return self.__max_nodes is not None and len(self.__store) >= self.__max_nodes
+
+    def rollout(self, state: WoodokuGame) -> int:
+        """Approximates the value of a state by playing it out to the end of the
+        game (or to the rollout depth) with the rollout kernel and the rollout
+        policy of this solver.
 
         Args:
-            current_node (Node): The current node to evaluate to the end of a
-            game via the given rollout
-            solver (Solver): The solver that will determine what to do in order
-            to rollout. (This solver should be fast, rolling out is only meant to
-            quickly approximate the end-state of a game)
+            state (WoodokuGame): The state to roll out from, which is not mutated
 
         Returns:
-            int: The value of this vertex as computed via roll out.
+            int: The total reward gained over the rollout
         """
-        curr_board = current_node.state.board
-        roll_score = 0
-        for row in range(len(curr_board)):
-            for col in range(len(curr_board[row])):
-                roll_score += -10 if curr_board[row][col] else 1
-        return roll_score
-        # return Environment().run_game(solver, current_node.state)
-
-    def back_propagate(self, leaf_node: Node, result: int) -> None:
-        """Propagates the value of this vertex back up the tree to the parent
-        to update the emperical values of each state
+        return rollout_state(state, self.__rng, self.__rollout_policy, self.__rollout_depth)
+
+    def back_propagate(self, path: list[int], result: float) -> None:
+        """Propagates the value of the leaf at the end of the given path back up
+        the path to the root to update the emperical values of each state. The
+        path is used rather than the parents of the nodes, since a node that is
+        shared through the transposition table has more than one parent.
 
         Args:
-            leaf_node (Node): The leaf node to start propagation from
+            path (list[int]): The indices of the nodes from the root to the leaf
             result (int): The value of the leaf node, which represents the
             value to be propagated up the tree
         """
-        leaf_node.total_reward += result
-        leaf_node.times_visited += 1
-        if(leaf_node.parent is not None):
-            self.back_propagate(leaf_node.parent, result)
+        self.__store.back_propagate(path, result)
 
     def get_best_child_action(self, node: Node) -> tuple[Piece, Position]:
         """Determines the action that is expected to return the highest valuation
@@ -191,16 +411,50 @@ class Euler(Solver):
             tuple[Piece, Position]: The action that returns the best reward from this
             position
         """
-        best_child = list(node.children.items())[0][1]
-        best_action = list(node.children.items())[0][0]
+        return node.store.edge_move(node.store.best_edge(node.index))
+
+    @property
+    def last_stats(self) -> Optional[SearchStats]:
+        """Returns the statistics of the last search, or None before the
+        first search
+        """
+        return self.__last_stats
 
-        for action, child in node.children.items():
-            if(child.times_visited == 0):
-                continue
 
-            if(best_child.total_reward / best_child.times_visited < child.total_reward / child.times_visited):
-                best_child = child
-                best_action = action
 
-        return best_action
+def _search_root(solver_args: tuple[float, int, RolloutPolicy, Optional[int], int,
+                                   Optional[int], bool, Optional[EvaluationWeights],
+                                   None, Optional[int]],
+                 state: WoodokuGame) -> tuple[list[tuple[tuple[Piece, Position], float, int]],
+                                              SearchStats]:
+    """Runs one independent search of a root-parallel Euler in a worker process
 
+    Args:
+        solver_args (tuple[float, int, RolloutPolicy, Optional[int], int,
+        Optional[int], bool, Optional[EvaluationWeights], None, Optional[int]]):
+        The arguments of the Euler that runs the search
+        state (WoodokuGame): The state to search from
+
+    Raises:
+        RuntimeError: If the search did not record it's statistics
+
+    Returns:
+        tuple[list[tuple[tuple[Piece, Position], float, int]], SearchStats]:
+        The move, total reward and number of visits of every move out of the
+        root, which are 0 for moves whose child was never created, and the
+        statistics of the search
+    """
+    solver = Euler(*solver_args)
+    root = solver.search(state)
+    stats = solver.last_stats
+    if (stats is None):
+        raise RuntimeError("The search did not record it's statistics")
+    store = root.store
+    children = []
+    for edge in store.edges(root.index):
+        target = store.edge_target(edge)
+        if (target < 0):
+            children.append((store.edge_move(edge), 0.0, 0))
+        else:
+            children.append((store.edge_move(edge), store.rewards(target), store.visits(target)))
+    return (children, stats)
@@ -0,0 +1,152 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from Main.Game.batch_woodoku import legal_move_masks, section_counts
+from Main.Game.bitboard import (BOX_MASKS, COL_MASKS, FULL_MASK, ROW_MASKS, SIZE,
+                                board_to_mask, isolated_holes)
+from Main.Game.bitboard_woodoku import BitboardWoodoku
+from Main.Game.placeability import count_placeable_pieces
+from Main.Game.woodoku_game import WoodokuGame
+
+
+class BoardFeatures(NamedTuple):
+    """The features of a board that a static evaluation is made up of
+    """
+    # the number of filled tiles
+    filled: int
+    # the number of empty tiles whose neighbours are all filled or off the
+    # board, which only the single tile piece can fill
+    isolated_holes: int
+    # the number of rows, columns and 3x3 boxes that are missing at most
+    # NEAR_COMPLETE_MISSING tiles
+    near_complete: int
+    # the number of pairs of neighbouring tiles where one is filled and the
+    # other is empty, which grows as the empty space is broken up
+    fragmentation: int
+    # the number of pieces in the catalog that fit somewhere on the board
+    placeable_pieces: int
+
+
+class EvaluationWeights(NamedTuple):
+    """The weight of every feature in a static evaluation, in the same order
+    as BoardFeatures
+    """
+    filled: float = -1
+    isolated_holes: float = -4
+    near_complete: float = 3
+    fragmentation: float = -0.5
+    placeable_pieces: float = 1
+
+
+DEFAULT_WEIGHTS: EvaluationWeights = EvaluationWeights()
+NEAR_COMPLETE_MISSING: int = 2
+
+_SECTION_MASKS: tuple[int, ...] = ROW_MASKS + COL_MASKS + BOX_MASKS
+# the tiles that have a neighbour to their right, and below them
+_HORIZONTAL_PAIRS: int = FULL_MASK & ~COL_MASKS[SIZE - 1]
+_VERTICAL_PAIRS: int = FULL_MASK & ~ROW_MASKS[SIZE - 1]
+
+
+def board_features(occupancy: int) -> BoardFeatures:
+    """Returns the features of a single board, computed with bit operations
+    on it's occupancy mask
+
+    Args:
+        occupancy (int): The occupancy mask of the board
+
+    Returns:
+        BoardFeatures: The features of the board
+    """
+    empty = FULL_MASK & ~occupancy
+    near_complete = 0
+    for mask in _SECTION_MASKS:
+        missing = (mask & empty).bit_count()
+        if (0 < missing <= NEAR_COMPLETE_MISSING):
+            near_complete += 1
+
+    fragmentation = (((occupancy ^ (occupancy >> 1)) & _HORIZONTAL_PAIRS).bit_count()
+                     + ((occupancy ^ (occupancy >> SIZE)) & _VERTICAL_PAIRS).bit_count())
+
+    return BoardFeatures(occupancy.bit_count(),
+                         isolated_holes(occupancy).bit_count(),
+                         near_complete,
+                         fragmentation,
+                         count_placeable_pieces(occupancy))
+
+
+def evaluate(occupancy: int, weights: EvaluationWeights = DEFAULT_WEIGHTS) -> float:
+    """Returns the static evaluation of a single board, which is the weighted
+    sum of it's features
+
+    Args:
+        occupancy (int): The occupancy mask of the board
+        weights (EvaluationWeights, optional): The weight of every feature.
+        Defaults to DEFAULT_WEIGHTS.
+
+    Returns:
+        float: The evaluation of the board, higher is better
+    """
+    return sum(weight * feature for weight, feature in zip(weights, board_features(occupancy)))
+
+
+def evaluate_state(state: WoodokuGame, weights: EvaluationWeights = DEFAULT_WEIGHTS) -> float:
+    """Returns the static evaluation of the board of a game
+
+    Args:
+        state (WoodokuGame): The game to evaluate
+        weights (EvaluationWeights, optional): The weight of every feature.
+        Defaults to DEFAULT_WEIGHTS.
+
+    Returns:
+        float: The evaluation of the board of the game, higher is better
+    """
+    if (isinstance(state, BitboardWoodoku)):
+        return evaluate(state.occupancy, weights)
+    return evaluate(board_to_mask(state.board), weights)
+
+
+def batch_features(boards: np.ndarray) -> np.ndarray:
+    """Returns the features of a batch of boards, computed with array
+    operations over the whole batch at once
+
+    Args:
+        boards (np.ndarray): A (boards, 9, 9) boolean array of the boards
+
+    Returns:
+        np.ndarray: A (boards, 5) integer array of the features of every
+        board, in the same order as BoardFeatures
+    """
+    boards = boards.astype(bool)
+    empty = ~boards
+
+    # an empty tile is isolated if none of it's neighbours are empty
+    padded = np.pad(empty, ((0, 0), (1, 1), (1, 1)), constant_values=False)
+    empty_neighbour = (padded[:, :-2, 1:-1] | padded[:, 2:, 1:-1]
+                       | padded[:, 1:-1, :-2] | padded[:, 1:-1, 2:])
+    holes = (empty & ~empty_neighbour).sum(axis=(1, 2))
+
+    missing = SIZE - section_counts(boards.reshape(len(boards), -1)).astype(np.int64)
+    near_complete = ((missing > 0) & (missing <= NEAR_COMPLETE_MISSING)).sum(axis=1)
+
+    fragmentation = ((boards[:, :, 1:] != boards[:, :, :-1]).sum(axis=(1, 2))
+                     + (boards[:, 1:, :] != boards[:, :-1, :]).sum(axis=(1, 2)))
+
+    placeable = legal_move_masks(boards).any(axis=2).sum(axis=1)
+
+    return np.stack([boards.sum(axis=(1, 2)), holes, near_complete,
+                     fragmentation, placeable], axis=1).astype(np.int64)
+
+
+def evaluate_batch(boards: np.ndarray, weights: EvaluationWeights = DEFAULT_WEIGHTS) -> np.ndarray:
+    """Returns the static evaluation of every board in a batch
+
+    Args:
+        boards (np.ndarray): A (boards, 9, 9) boolean array of the boards
+        weights (EvaluationWeights, optional): The weight of every feature.
+        Defaults to DEFAULT_WEIGHTS.
+
+    Returns:
+        np.ndarray: The evaluation of every board, higher is better
+    """
+    return batch_features(boards) @ np.array(weights, dtype=np.float64)
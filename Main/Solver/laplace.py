@@ -0,0 +1,149 @@
+from Main.Game.placeability import SurvivalTable
+from Main.Game.woodoku_game import HAND_SIZE
+from Main.Game.zobrist import board_hash, clear_key
+from Main.Solver.bellman import Bellman, Plan
+from Main.Solver.evaluation import DEFAULT_WEIGHTS, EvaluationWeights, evaluate
+from Main.Solver.transposition_table import TranspositionTable
+from Main.Util.generate_pieces import get_pieces
+from Main.Util.random_stream import RandomStream
+
+# the value of a drawn hand that cannot be placed, which ends the game
+GAME_OVER_PENALTY: float = 500
+
+
+class Laplace(Bellman):
+    """An expectimax solver that looks one refill ahead. The best few plans
+    for the pieces in hand are found with Bellman's beam search, and each of
+    them is valued by it's reward plus the expected value of the hand that is
+    drawn next. The next hand is a chance node over the 3-piece combinations
+    of the catalog, which is estimated from a sample of hands that is shared
+    by every plan of a turn. On boards where a sampled hand does not fit, the
+    chance of the game ending is taken from a SurvivalTable rather than from
+    the sample. The estimate for every board is memoized, so boards that are
+    reached again are not searched again.
+    """
+
+    def __init__(self, beam_width: int = 8, candidates: int = 4, samples: int = 8,
+                 seed: int = 0, evaluation_weights: EvaluationWeights = DEFAULT_WEIGHTS,
+                 cache_size: int = 100000):
+        """Creates a new expectimax solver
+
+        Args:
+            beam_width (int, optional): The most partial plans to keep after
+            placing each piece, the hands drawn at the chance nodes are planned
+            with half of it. Defaults to 8.
+            candidates (int, optional): The number of the best complete plans
+            that are valued at a chance node, the rest are pruned. Defaults to 4.
+            samples (int, optional): The number of hands drawn to estimate the
+            value of a chance node. Defaults to 8.
+            seed (int, optional): The seed of the RNG that draws the hands.
+            Defaults to 0.
+            evaluation_weights (EvaluationWeights, optional): The weights of the
+            static evaluation at the leaves. Defaults to DEFAULT_WEIGHTS.
+            cache_size (int, optional): The most chance node estimates to keep.
+            Defaults to 100000.
+
+        Raises:
+            ValueError: If beam_width, candidates or samples is not positive
+        """
+        super().__init__(beam_width, evaluation_weights)
+        if (candidates <= 0):
+            raise ValueError("Invalid candidates, must be positive")
+        if (samples <= 0):
+            raise ValueError("Invalid samples, must be positive")
+        self.__candidates = candidates
+        self.__samples = samples
+        self.__rng = RandomStream(seed)
+        self.__hand_planner = Bellman(max(1, beam_width // 2), evaluation_weights)
+        self.__estimates: TranspositionTable[float] = TranspositionTable(cache_size)
+        self.__survival = SurvivalTable(cache_size)
+
+    def plan(self, occupancy: int, hand: tuple[int, ...], consecutive_clears: int) -> Plan:
+        """Returns the plan for placing the given pieces on the board with the
+        highest reward plus expected value of the next hand. If no plan places
+        every piece the game is over, and the plan is chosen like Bellman does.
+
+        Args:
+            occupancy (int): The occupancy mask of the board
+            hand (tuple[int, ...]): The ids of the pieces in hand
+            consecutive_clears (int): The number of consecutive clears so far
+
+        Returns:
+            Plan: The best plan
+        """
+        plans = self.search(occupancy, hand, consecutive_clears)
+        complete = [plan for plan in plans if len(plan.moves) == len(hand)]
+        if (len(complete) == 0):
+            return max(plans, key=self.value)
+
+        candidates = sorted(complete, key=self.value, reverse=True)[:self.__candidates]
+        if (len(candidates) == 1):
+            return candidates[0]
+
+        hands = self.draw_hands()
+        return max(candidates, key=lambda plan: plan.reward + self.chance_value(
+            plan.occupancy, plan.consecutive_clears, hands))
+
+    def draw_hands(self) -> list[tuple[int, ...]]:
+        """Draws the sample of hands that chance nodes are estimated from, the
+        same way that the games draw them
+
+        Returns:
+            list[tuple[int, ...]]: The sorted ids of the pieces of every hand
+        """
+        catalog_ids = range(len(get_pieces()))
+        return [tuple(sorted(self.__rng.sample(catalog_ids, HAND_SIZE)))
+                for _ in range(self.__samples)]
+
+    def chance_value(self, occupancy: int, consecutive_clears: int,
+                     hands: list[tuple[int, ...]]) -> float:
+        """Returns the expected value of the next hand on a board, which is the
+        average over the given hands of the reward of the best plan for the
+        hand plus the evaluation of the board it leads to. If any of the hands
+        cannot be placed, the chance of drawing a hand that cannot be placed is
+        taken from the survival table instead, and such hands are worth
+        GAME_OVER_PENALTY less than nothing. The estimate is memoized by the
+        board and the consecutive clears, the hands are only used the first
+        time the board is seen.
+
+        Args:
+            occupancy (int): The occupancy mask of the board
+            consecutive_clears (int): The number of consecutive clears so far
+            hands (list[tuple[int, ...]]): The hands to average over
+
+        Returns:
+            float: The estimated value of the chance node
+        """
+        key = board_hash(occupancy) ^ clear_key(consecutive_clears)
+        estimate = self.__estimates.get(key)
+        if (estimate is not None):
+            return estimate
+
+        values = []
+        for hand in hands:
+            plan = self.__hand_planner.plan(occupancy, hand, consecutive_clears)
+            if (len(plan.moves) == len(hand)):
+                values.append(plan.reward + evaluate(plan.occupancy, self.evaluation_weights))
+
+        if (len(values) == len(hands)):
+            estimate = sum(values) / len(values)
+        else:
+            survival_rate = self.__survival.survival_rate(occupancy)
+            average = sum(values) / len(values) if len(values) > 0 else 0
+            estimate = survival_rate * average - (1 - survival_rate) * GAME_OVER_PENALTY
+        self.__estimates.put(key, estimate)
+        return estimate
+
+    @property
+    def candidates(self) -> int:
+        return self.__candidates
+
+    @property
+    def samples(self) -> int:
+        return self.__samples
+
+    @property
+    def estimates(self) -> TranspositionTable[float]:
+        """Returns the table of memoized chance node estimates
+        """
+        return self.__estimates
@@ -0,0 +1,350 @@
+import math
+import random
+from typing import Optional
+
+import numpy as np
+
+from Main.Game.piece import Piece
+from Main.Game.position import Position
+from Main.Game.woodoku_game import WoodokuGame
+from Main.Solver.selector import Selector
+
+# with progressive widening a node with n visits may explore its first
+# ceil(WIDENING_CONSTANT * n^WIDENING_EXPONENT) children
+WIDENING_CONSTANT: float = 2
+WIDENING_EXPONENT: float = 0.5
+# the exploration constant of UCB
+EXPLORATION: float = 2**0.5
+
+
+class NodeStore():
+    """Holds every node of an MCTS search tree as a struct of arrays rather
+    than as one Python object per node. A node is an index into the arrays of
+    visit counts, reward sums and parents, and the children of a node are a
+    contiguous block of edges, each of which holds a move and the index of the
+    node that the move leads to. The node of an edge is only created when the
+    edge is first selected, until then the edge points at -1. Edges point at
+    nodes rather than nodes being laid out in blocks so that a node can be
+    shared by more than one parent through a transposition table.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """Creates an empty node store
+
+        Args:
+            capacity (int, optional): The number of nodes and edges to make
+            room for up front, the store grows when it runs out. Defaults to 1024.
+        """
+        self.__visits = np.zeros(capacity, dtype=np.int64)
+        self.__rewards = np.zeros(capacity, dtype=np.float64)
+        self.__parents = np.full(capacity, -1, dtype=np.int64)
+        self.__first_edges = np.full(capacity, -1, dtype=np.int64)
+        self.__edge_counts = np.zeros(capacity, dtype=np.int64)
+        self.__node_count = 0
+
+        self.__edge_targets = np.full(capacity, -1, dtype=np.int64)
+        self.__edge_moves: list[tuple[Piece, Position]] = []
+
+    def add_node(self, parent: int = -1) -> int:
+        """Adds a node that has not been visited or populated
+
+        Args:
+            parent (int, optional): The index of the node that this node was
+            first reached from. Defaults to -1, for a root.
+
+        Returns:
+            int: The index of the new node
+        """
+        if (self.__node_count == len(self.__visits)):
+            self.__grow_nodes()
+        index = self.__node_count
+        self.__node_count += 1
+        self.__parents[index] = parent
+        return index
+
+    def remove_last_node(self) -> None:
+        """Removes the node that was added last, which must not be the target
+        of any edge or have been populated, e.g. a node that was created for
+        an edge before the edge was pointed at a transposition
+        """
+        self.__node_count -= 1
+        index = self.__node_count
+        self.__visits[index] = 0
+        self.__rewards[index] = 0
+        self.__parents[index] = -1
+
+    def add_children(self, index: int, moves: list[tuple[Piece, Position]],
+                     targets: Optional[list[int]] = None) -> None:
+        """Populates a node with an edge for every one of the given moves
+
+        Args:
+            index (int): The index of the node
+            moves (list[tuple[Piece, Position]]): The moves out of the node
+            targets (list[int], optional): The indices of the nodes that the
+            moves lead to, or -1 to create the node when the move is first
+            selected. Defaults to a new node for every move.
+        """
+        if (targets is None):
+            targets = [self.add_node(index) for _ in moves]
+
+        first_edge = len(self.__edge_moves)
+        while (first_edge + len(moves) > len(self.__edge_targets)):
+            self.__edge_targets = np.concatenate(
+                [self.__edge_targets, np.full(len(self.__edge_targets), -1, dtype=np.int64)])
+
+        self.__edge_moves.extend(moves)
+        self.__edge_targets[first_edge:first_edge + len(moves)] = targets
+        self.__first_edges[index] = first_edge
+        self.__edge_counts[index] = len(moves)
+
+    def populate_children(self, index: int, state: WoodokuGame, rng: random.Random) -> None:
+        """Populates a node with every legal move in a random order, without
+        creating any children yet. Does nothing if the node has already been
+        populated.
+
+        Args:
+            index (int): The index of the node
+            state (WoodokuGame): The state of the game at the node
+            rng (random.Random): The RNG used to order the moves
+        """
+        if (self.__first_edges[index] >= 0):
+            return
+
+        legal_moves = Selector.get_legal_moves(state)
+        rng.shuffle(legal_moves)
+        self.add_children(index, legal_moves, [-1] * len(legal_moves))
+
+    def select(self, index: int, create: bool = True) -> int:
+        """Selects the child of a node to explore with UCB out of the children
+        that progressive widening allows for the visits of the node. If there
+        are allowed moves whose children have not been created or visited yet,
+        the first of them is selected instead, creating it's child. Children
+        that have not been created are skipped if create is False.
+
+        Args:
+            index (int): The index of a populated node with children
+            create (bool, optional): Whether the child of an allowed move may
+            be created. Defaults to True.
+
+        Returns:
+            int: The index of the edge to the selected child, or -1 if create
+            is False and none of the allowed children have been created
+        """
+        first_edge = self.__first_edges[index]
+        allowed = math.ceil(WIDENING_CONSTANT * self.__visits[index] ** WIDENING_EXPONENT)
+        width = min(self.__edge_counts[index], max(1, allowed))
+        targets = self.__edge_targets[first_edge:first_edge + width]
+
+        uncreated = targets < 0
+        if (uncreated.any()):
+            if (create):
+                edge = int(first_edge + uncreated.argmax())
+                self.__edge_targets[edge] = self.add_node(index)
+                return edge
+            if (uncreated.all()):
+                return -1
+
+        visits = np.where(uncreated, 1, self.__visits[targets])
+        unvisited = visits == 0
+        if (unvisited.any()):
+            return int(first_edge + unvisited.argmax())
+
+        scores = (self.__rewards[targets] + EXPLORATION * math.log(self.__visits[index])) / visits
+        scores[uncreated] = -np.inf
+        return int(first_edge + scores.argmax())
+
+    def best_edge(self, index: int) -> int:
+        """Returns the edge to the child of a node with the highest average
+        reward. If no child has been visited the edge to the first child that
+        has been created is returned instead, or the first edge if none have
+        been created, whose child does not exist.
+
+        Args:
+            index (int): The index of a populated node with children
+
+        Returns:
+            int: The index of the edge to the best child
+        """
+        first_edge = self.__first_edges[index]
+        targets = self.__edge_targets[first_edge:first_edge + self.__edge_counts[index]]
+        created = targets >= 0
+        visits = np.where(created, self.__visits[targets], 0)
+
+        visited = visits > 0
+        if (not visited.any()):
+            return int(first_edge + created.argmax())
+        averages = np.where(visited, self.__rewards[targets] / np.maximum(visits, 1), -np.inf)
+        return int(first_edge + averages.argmax())
+
+    def back_propagate(self, path: list[int], result: float) -> None:
+        """Adds a result to every node on a path of distinct nodes
+
+        Args:
+            path (list[int]): The indices of the nodes from the root to the leaf
+            result (int): The value of the leaf
+        """
+        self.__visits[path] += 1
+        self.__rewards[path] += result
+
+    def subtree(self, index: int) -> "NodeStore":
+        """Returns a new store holding only the nodes that can be reached from
+        the given node, which becomes the node at index 0 of the new store
+
+        Args:
+            index (int): The index of the root of the subtree
+
+        Returns:
+            NodeStore: The store holding the subtree
+        """
+        store = NodeStore(max(1024, self.__node_count))
+        new_indices = {index: store.add_node()}
+        queue = [index]
+        while (len(queue) != 0):
+            old = queue.pop()
+            new = new_indices[old]
+            store.__visits[new] = self.__visits[old]
+            store.__rewards[new] = self.__rewards[old]
+            if (self.__first_edges[old] < 0):
+                continue
+
+            edges = self.edges(old)
+            targets = []
+            for edge in edges:
+                target = int(self.__edge_targets[edge])
+                if (target >= 0 and target not in new_indices):
+                    new_indices[target] = store.add_node(new)
+                    queue.append(target)
+                targets.append(new_indices.get(target, -1))
+            store.add_children(new, [self.__edge_moves[edge] for edge in edges], targets)
+        return store
+
+    def edges(self, index: int) -> range:
+        """Returns the indices of the edges out of a node
+        """
+        first_edge = self.__first_edges[index]
+        if (first_edge < 0):
+            return range(0)
+        return range(first_edge, first_edge + self.__edge_counts[index])
+
+    def edge_move(self, edge: int) -> tuple[Piece, Position]:
+        """Returns the move of an edge
+        """
+        return self.__edge_moves[edge]
+
+    def edge_target(self, edge: int) -> int:
+        """Returns the index of the node that an edge leads to
+        """
+        return int(self.__edge_targets[edge])
+
+    def set_edge_target(self, edge: int, index: int) -> None:
+        """Points an edge at another node, e.g. one found in a transposition table
+        """
+        self.__edge_targets[edge] = index
+
+    def populated(self, index: int) -> bool:
+        return bool(self.__first_edges[index] >= 0)
+
+    def child_count(self, index: int) -> int:
+        return int(self.__edge_counts[index])
+
+    def visits(self, index: int) -> int:
+        return int(self.__visits[index])
+
+    def set_visits(self, index: int, val: int) -> None:
+        self.__visits[index] = val
+
+    def rewards(self, index: int) -> float:
+        return float(self.__rewards[index])
+
+    def set_rewards(self, index: int, val: float) -> None:
+        self.__rewards[index] = val
+
+    def parent(self, index: int) -> int:
+        return int(self.__parents[index])
+
+    def __len__(self) -> int:
+        return self.__node_count
+
+    def __grow_nodes(self) -> None:
+        """Doubles the number of nodes that the arrays have room for
+        """
+        size = len(self.__visits)
+        self.__visits = np.concatenate([self.__visits, np.zeros(size, dtype=np.int64)])
+        self.__rewards = np.concatenate([self.__rewards, np.zeros(size, dtype=np.float64)])
+        self.__parents = np.concatenate([self.__parents, np.full(size, -1, dtype=np.int64)])
+        self.__first_edges = np.concatenate([self.__first_edges, np.full(size, -1, dtype=np.int64)])
+        self.__edge_counts = np.concatenate([self.__edge_counts, np.zeros(size, dtype=np.int64)])
+
+
+class Node():
+    """A view of one node of a NodeStore, which reads and writes the arrays of
+    the store
+    """
+
+    __slots__ = ("__store", "__index")
+
+    def __init__(self, store: NodeStore, index: int):
+        self.__store = store
+        self.__index = index
+
+    def populate_children(self, state: WoodokuGame, rng: random.Random) -> None:
+        """Creates and populates the children of this node by randomly
+        selecting moves, does nothing if the children have already been
+        populated
+
+        Args:
+            state (WoodokuGame): The state of the game at this node
+            rng (random.Random): The RNG used to select the moves
+        """
+        self.__store.populate_children(self.__index, state, rng)
+
+    @property
+    def store(self) -> NodeStore:
+        return self.__store
+
+    @property
+    def index(self) -> int:
+        return self.__index
+
+    @property
+    def children(self) -> dict[tuple[Piece, Position], "Node"]:
+        """Returns the children of this node that have been created
+        """
+        return {self.__store.edge_move(edge): Node(self.__store, self.__store.edge_target(edge))
+                for edge in self.__store.edges(self.__index)
+                if self.__store.edge_target(edge) >= 0}
+
+    @property
+    def populated(self) -> bool:
+        return self.__store.populated(self.__index)
+
+    @property
+    def total_reward(self) -> float:
+        return self.__store.rewards(self.__index)
+
+    @total_reward.setter
+    def total_reward(self, val: float) -> None:
+        self.__store.set_rewards(self.__index, val)
+
+    @property
+    def times_visited(self) -> int:
+        return self.__store.visits(self.__index)
+
+    @times_visited.setter
+    def times_visited(self, val: int) -> None:
+        self.__store.set_visits(self.__index, val)
+
+    @property
+    def parent(self) -> Optional["Node"]:
+        parent = self.__store.parent(self.__index)
+        if (parent < 0):
+            return None
+        return Node(self.__store, parent)
+
+    def __eq__(self, __o: object) -> bool:
+        if (not isinstance(__o, Node)):
+            return False
+        return self.__store is __o.__store and self.__index == __o.__index
+
+    def __hash__(self) -> int:
+        return hash((id(self.__store), self.__index))
@@ -0,0 +1,135 @@
+import random
+from enum import Enum
+from typing import Optional
+
+from Main.Game.bitboard import board_to_mask, clear_sections, isolated_holes, placement_table
+from Main.Game.bitboard_woodoku import BitboardWoodoku
+from Main.Game.woodoku_game import WoodokuGame
+from Main.Util.generate_pieces import get_piece_by_id, get_piece_id, get_pieces
+
+
+class RolloutPolicy(Enum):
+    """The policies that the rollout kernel can play with
+    """
+    # a uniformly random legal move
+    RANDOM = "random"
+    # the legal move with the highest reward, the first one in hand and then
+    # row-column order on ties
+    GREEDY = "greedy"
+    # the legal move with the highest reward minus a penalty for every
+    # isolated empty tile that it leaves behind
+    HEURISTIC = "heuristic"
+
+
+HOLE_PENALTY: int = 2
+
+# the placement masks and fill counts of the pieces by id
+_PLACEMENT_MASKS: dict[int, tuple[int, ...]] = {}
+_FILLED: dict[int, int] = {}
+_CATALOG_IDS = range(len(get_pieces()))
+
+
+def _load_piece(piece_id: int) -> None:
+    """Stores the placement masks and fill count of the piece with the given id
+    """
+    piece = get_piece_by_id(piece_id)
+    _PLACEMENT_MASKS[piece_id] = tuple(mask for _, mask in placement_table(piece))
+    _FILLED[piece_id] = piece.filled
+
+
+for catalog_id in _CATALOG_IDS:
+    _load_piece(catalog_id)
+
+
+def rollout(occupancy: int, hand: list[int], consecutive_clears: int,
+            rng: random.Random,
+            policy: RolloutPolicy = RolloutPolicy.RANDOM,
+            max_depth: Optional[int] = None) -> int:
+    """Plays a game of classic Woodoku from the given position with the given
+    policy until it is over, or until max_depth moves have been made, and
+    returns the total reward. The game is played directly on occupancy masks
+    and catalog piece ids, so no game, Piece or Position objects are created.
+
+    Args:
+        occupancy (int): The occupancy mask of the board to start from
+        hand (list[int]): The catalog ids of the available pieces
+        consecutive_clears (int): The number of consecutive clears so far
+        rng (random.Random): The RNG used to pick random moves and to draw
+        new pieces once the hand is used up
+        policy (RolloutPolicy, optional): The policy to choose moves with.
+        Defaults to RolloutPolicy.RANDOM.
+        max_depth (int, optional): The most moves to play. Defaults to playing
+        until the game is over.
+
+    Returns:
+        int: The total reward gained over the rollout
+    """
+    for piece_id in hand:
+        if (piece_id not in _PLACEMENT_MASKS):
+            _load_piece(piece_id)
+
+    hand = hand[:]
+    total_reward = 0
+    depth = 0
+    while (max_depth is None or depth < max_depth):
+        if (policy is RolloutPolicy.RANDOM):
+            moves = [(slot, mask)
+                     for slot, piece_id in enumerate(hand)
+                     for mask in _PLACEMENT_MASKS[piece_id]
+                     if not mask & occupancy]
+            if (len(moves) == 0):
+                break
+            slot, placed_mask = moves[int(rng.random() * len(moves))]
+            new_occupancy, cleared_count = clear_sections(
+                occupancy | placed_mask, placed_mask)
+        else:
+            multiplier = 18 * (consecutive_clears + 1)
+            best_score: Optional[int] = None
+            for piece_slot, piece_id in enumerate(hand):
+                for mask in _PLACEMENT_MASKS[piece_id]:
+                    if (mask & occupancy):
+                        continue
+                    after, cleared = clear_sections(occupancy | mask, mask)
+                    score = multiplier * cleared + _FILLED[piece_id]
+                    if (policy is RolloutPolicy.HEURISTIC):
+                        score -= HOLE_PENALTY * isolated_holes(after).bit_count()
+                    if (best_score is None or score > best_score):
+                        best_score = score
+                        slot, new_occupancy, cleared_count = piece_slot, after, cleared
+            if (best_score is None):
+                break
+
+        occupancy = new_occupancy
+        total_reward += 18 * (consecutive_clears + 1) * cleared_count + _FILLED[hand[slot]]
+        consecutive_clears = consecutive_clears + 1 if cleared_count > 0 else 0
+        del hand[slot]
+        if (len(hand) == 0):
+            hand = rng.sample(_CATALOG_IDS, 3)
+        depth += 1
+
+    return total_reward
+
+
+def rollout_state(state: WoodokuGame, rng: random.Random,
+                  policy: RolloutPolicy = RolloutPolicy.RANDOM,
+                  max_depth: Optional[int] = None) -> int:
+    """Runs the rollout kernel from the given game state, following the rules
+    of ClassicWoodoku. The state is not mutated.
+
+    Args:
+        state (WoodokuGame): The state to roll out from
+        rng (random.Random): The RNG used for the rollout
+        policy (RolloutPolicy, optional): The policy to choose moves with.
+        Defaults to RolloutPolicy.RANDOM.
+        max_depth (int, optional): The most moves to play. Defaults to playing
+        until the game is over.
+
+    Returns:
+        int: The total reward gained over the rollout
+    """
+    if (isinstance(state, BitboardWoodoku)):
+        occupancy = state.occupancy
+    else:
+        occupancy = board_to_mask(state.board)
+    hand = [get_piece_id(piece) for piece in state.get_available_pieces()]
+    return rollout(occupancy, hand, state.consecutive_clears, rng, policy, max_depth)
@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class TranspositionTable(Generic[T]):
+    """Maps the Zobrist hashes of game states onto entries (e.g. search tree
+    nodes), so that a state reached through different orders of moves shares
+    one entry. Holds at most a fixed number of entries, evicting the entry that
+    was least recently used when full.
+    """
+
+    def __init__(self, max_entries: int):
+        """Creates an empty transposition table
+
+        Args:
+            max_entries (int): The most entries that the table will hold
+
+        Raises:
+            ValueError: If max_entries is not positive
+        """
+        if (max_entries <= 0):
+            raise ValueError("Invalid max_entries, must be positive")
+        self.__max_entries = max_entries
+        self.__entries: OrderedDict[int, T] = OrderedDict()
+        self.__hits = 0
+        self.__evictions = 0
+
+    def get(self, key: int) -> Optional[T]:
+        """Returns the entry for the given hash, or None if there is none
+
+        Args:
+            key (int): The hash of the state
+
+        Returns:
+            Optional[T]: The entry for the state
+        """
+        entry = self.__entries.get(key)
+        if (entry is not None):
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+        return entry
+
+    def put(self, key: int, entry: T) -> None:
+        """Stores the entry for the given hash, evicting the least recently
+        used entry if the table is full
+
+        Args:
+            key (int): The hash of the state
+            entry (T): The entry to store
+        """
+        self.__entries[key] = entry
+        self.__entries.move_to_end(key)
+        if (len(self.__entries) > self.__max_entries):
+            self.__entries.popitem(last=False)
+            self.__evictions += 1
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def max_entries(self) -> int:
+        return self.__max_entries
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def evictions(self) -> int:
+        return self.__evictions
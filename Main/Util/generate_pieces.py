@@ -5,7 +5,14 @@ ORIGINAL_PIECE_FILE_PATH = "Main/Util/original_pieces.txt"
 FINAL_PIECE_FILE_PATH = "Main/Util/pieces.txt"
 
 
+# every piece in the piece file, where the piece at index i has id i
 PIECE_SET: list[Piece] = []
+# every interned piece by id, the catalog pieces come first followed by any
+# other pieces that have been interned
+INTERNED_PIECES: list[Piece] = []
+PIECE_IDS: dict[Piece, int] = {}
+
+
 def get_pieces() -> list[Piece]:
     if(len(PIECE_SET) == 0):
         with open(FINAL_PIECE_FILE_PATH, 'r') as piece_file:
@@ -13,12 +20,92 @@ def get_pieces() -> list[Piece]:
             current_piece: list[list[bool]] = []
             for row in raw_piece_data:
                 if (row.strip() == ""):
-                    PIECE_SET.append(Piece(current_piece))
+                    PIECE_SET.append(_intern_piece_list(current_piece))
                     current_piece = []
                 else:
                     current_piece.append([x == '1' for x in row.strip()])
     return PIECE_SET
-        
+
+
+def _intern_piece_list(piece_list: list[list[bool]]) -> Piece:
+    """Creates the flyweight for the given piece and gives it the next id,
+    returning the existing flyweight instead if the piece is already interned
+    """
+    piece = Piece(piece_list, len(INTERNED_PIECES))
+    if (piece in PIECE_IDS):
+        return INTERNED_PIECES[PIECE_IDS[piece]]
+    PIECE_IDS[piece] = len(INTERNED_PIECES)
+    INTERNED_PIECES.append(piece)
+    return piece
+
+
+def intern_piece(piece: Piece) -> Piece:
+    """Returns the single shared instance of the given piece, which has a
+    stable id. Pieces from the piece file always have the ids 0 to
+    len(get_pieces()) - 1 in file order, any other piece is given the next
+    free id the first time it is interned. Pieces outside of the piece file
+    are only ever given ids here, so that they are interned on purpose.
+
+    Args:
+        piece (Piece): The piece to intern
+
+    Raises:
+        ValueError: If the piece has an id that is not the id of the
+        interned piece that is equal to it
+
+    Returns:
+        Piece: The interned piece that is equal to the given piece
+    """
+    get_pieces()
+    piece_id = PIECE_IDS.get(piece)
+    if (piece.id is not None and piece.id != piece_id):
+        raise ValueError(f"Invalid piece, id {piece.id} is not the id of the interned piece")
+    if (piece_id is not None):
+        return INTERNED_PIECES[piece_id]
+    size = piece.get_size()
+    return _intern_piece_list([[piece.is_filled_at((row, col))
+                                 for col in range(size[1])]
+                                for row in range(size[0])])
+
+
+def get_piece_id(piece: Piece) -> int:
+    """Returns the id of the given piece, which must be in the piece file or
+    have been interned with intern_piece
+
+    Args:
+        piece (Piece): The piece to get the id of
+
+    Raises:
+        ValueError: If the piece is not interned, or it's id is not the id
+        of the interned piece that is equal to it
+
+    Returns:
+        int: The id of the interned piece that is equal to the given piece
+    """
+    piece_id = piece.id
+    if (piece_id is not None and piece_id < len(INTERNED_PIECES)
+            and INTERNED_PIECES[piece_id] is piece):
+        return piece_id
+    get_pieces()
+    interned_id = PIECE_IDS.get(piece)
+    if (interned_id is None):
+        raise ValueError("Invalid piece, it is not in the piece file and has not been interned")
+    if (piece_id is not None and piece_id != interned_id):
+        raise ValueError(f"Invalid piece, id {piece_id} is not the id of the interned piece")
+    return interned_id
+
+
+def get_piece_by_id(piece_id: int) -> Piece:
+    """Returns the interned piece with the given id
+
+    Args:
+        piece_id (int): The id of the piece
+
+    Returns:
+        Piece: The interned piece with the given id
+    """
+    get_pieces()
+    return INTERNED_PIECES[piece_id]
 
 
 def process_original_pieces():
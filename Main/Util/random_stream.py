@@ -0,0 +1,63 @@
+import hashlib
+import random
+
+
+class RandomStream(random.Random):
+    """A random number generator that is owned by a single game or solver
+    rather than shared through the global random module. Streams can be
+    copied, which gives a stream that continues with exactly the same numbers,
+    or split, which gives a new stream that is independent of this one but
+    still fully determined by this stream's seed.
+    """
+
+    def __init__(self, seed: int = 0):
+        """Creates a new stream from the given seed, which produces the same
+        numbers as the global random module would after random.seed(seed)
+
+        Args:
+            seed (int, optional): The seed of this stream. Defaults to 0.
+        """
+        super().__init__(seed)
+        self.__stream_seed = seed
+        self.__times_split = 0
+
+    def split(self) -> "RandomStream":
+        """Returns a new stream whose seed is derived from the seed of this
+        stream and the number of times this stream has been split, so the
+        n-th split of a stream is always the same no matter how many numbers
+        have been drawn from it.
+
+        Returns:
+            RandomStream: A new independent stream
+        """
+        self.__times_split += 1
+        digest = hashlib.blake2b(
+            f"{self.__stream_seed}/{self.__times_split}".encode(),
+            digest_size=8).digest()
+        return RandomStream(int.from_bytes(digest, "big"))
+
+    def copy(self) -> "RandomStream":
+        """Returns a copy of this stream, which will produce exactly the same
+        numbers as this stream from now on
+
+        Returns:
+            RandomStream: The copy of this stream
+        """
+        stream = RandomStream(self.__stream_seed)
+        stream.setstate(self.getstate())
+        stream.__times_split = self.__times_split
+        return stream
+
+    def __reduce__(self) -> tuple:
+        # random.Random only pickles the generator state, which would lose
+        # the seed and split count of this stream
+        return (RandomStream, (self.__stream_seed,),
+                (self.getstate(), self.__times_split))
+
+    def __setstate__(self, state: tuple) -> None:
+        self.setstate(state[0])
+        self.__times_split = state[1]
+
+    @property
+    def stream_seed(self) -> int:
+        return self.__stream_seed
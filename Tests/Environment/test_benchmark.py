@@ -0,0 +1,75 @@
+from Main.Environment.benchmark import (BENCHMARK_SEEDS, BenchmarkResult, benchmark_is_over,
+                                        compare, load_game, main, record_game, results_to_json,
+                                        time_batches, write_games)
+from Main.Game.classic_woodoku import ClassicWoodoku
+
+import json
+import pytest
+
+
+def test_records_the_same_game():
+    moves = record_game(0, 20)
+    assert len(moves) == 20
+    game = ClassicWoodoku(seed=0)
+    for move in moves:
+        assert game.piece_will_fit(*move)
+        game.place_piece(*move)
+
+
+@pytest.mark.parametrize("seed", BENCHMARK_SEEDS)
+def test_stored_games_are_legal(seed):
+    game = ClassicWoodoku(seed=seed)
+    for move in load_game(seed):
+        assert move[0] in game.get_available_pieces()
+        assert game.piece_will_fit(*move)
+        game.place_piece(*move)
+
+
+def test_writes_games(tmp_path):
+    path = tmp_path / "games.json"
+    write_games((0,), str(path))
+    assert path.read_text().endswith("\n")
+    assert list(load_game(0, str(path))) == record_game(0)
+
+
+def test_replays_every_state():
+    result = benchmark_is_over((0,), repeats=1)
+    assert result.name == "classic_is_over"
+    # every timing is of whole batches of the states of the game
+    assert result.operations % len(load_game(0)) == 0
+    assert result.rate > 0
+
+
+def test_times_batches_until_long_enough():
+    runs = []
+    result = time_batches("count", lambda: 10, lambda batch: runs.append(batch) or batch,
+                          repeats=3, min_seconds=0)
+    assert result == BenchmarkResult("count", 10, result.seconds)
+    assert len(runs) == 3
+
+
+def test_compare_with_threshold():
+    baseline = results_to_json([BenchmarkResult("fast", 100, 1), BenchmarkResult("slow", 100, 1)])
+    results = [BenchmarkResult("fast", 90, 1), BenchmarkResult("slow", 50, 1),
+               BenchmarkResult("new", 1, 1)]
+    regressions = compare(results, baseline, threshold=0.2)
+    assert [regression.name for regression in regressions] == ["slow"]
+    assert regressions[0].slowdown == pytest.approx(0.5)
+
+
+def test_fails_on_regression(tmp_path, monkeypatch):
+    import Main.Environment.benchmark as benchmark
+    monkeypatch.setattr(benchmark, "run_benchmarks",
+                        lambda repeats, euler_seconds: [BenchmarkResult("is_over", 10, 1)])
+    baseline = tmp_path / "baseline.json"
+    output = tmp_path / "output.json"
+
+    # running without a baseline is not a pass
+    assert main(["--baseline", str(baseline)]) == 2
+    assert main(["--baseline", str(baseline), "--update-baseline"]) == 0
+    assert baseline.read_text().endswith("\n")
+    assert main(["--baseline", str(baseline), "--output", str(output)]) == 0
+    assert json.loads(output.read_text())["benchmarks"]["is_over"]["rate"] == 10
+
+    baseline.write_text(json.dumps(results_to_json([BenchmarkResult("is_over", 100, 1)])))
+    assert main(["--baseline", str(baseline)]) == 1
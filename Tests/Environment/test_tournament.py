@@ -0,0 +1,67 @@
+from Main.Environment.tournament import SolverConfig, main, play_game, run_tournament
+
+import json
+import pytest
+
+
+def test_parses_solver_configs():
+    assert SolverConfig.parse("pythagoras") == SolverConfig("pythagoras", "pythagoras", {})
+    # configs made without arguments do not share a dictionary
+    assert SolverConfig("a", "pythagoras").kwargs is None
+    config = SolverConfig.parse('bellman:{"beam_width": 2}')
+    assert config.solver == "bellman"
+    assert config.kwargs == {"beam_width": 2}
+    with pytest.raises(ValueError):
+        SolverConfig.parse("nobody")
+    with pytest.raises(ValueError):
+        SolverConfig.parse("bellman:[2]")
+
+
+def test_plays_seeded_games():
+    config = SolverConfig.parse("boltzmann")
+    first = play_game(config, 3)
+    assert first.moves == len(first.move_seconds) > 0
+    assert first.seconds >= sum(first.move_seconds)
+    # the solver is seeded with the seed of the game
+    assert play_game(config, 3, "bitboard").score == first.score
+
+
+def test_streams_results(tmp_path):
+    output = tmp_path / "results.jsonl"
+    configs = [SolverConfig.parse("pythagoras"), SolverConfig.parse("boltzmann")]
+    results = run_tournament(configs, [0, 1], str(output), workers=2, progress=False)
+    assert len(results) == 4
+
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted((line["label"], line["seed"]) for line in lines) ==\
+        [("boltzmann", 0), ("boltzmann", 1), ("pythagoras", 0), ("pythagoras", 1)]
+    assert {line["score"] for line in lines} == {result.score for result in results}
+
+
+def test_keeps_going_after_failed_games(tmp_path):
+    output = tmp_path / "results.jsonl"
+    configs = [SolverConfig.parse('bellman:{"unknown": 1}'), SolverConfig.parse("pythagoras")]
+    results = run_tournament(configs, [0, 1], str(output), workers=1, progress=False)
+    assert [result.label for result in results] == ["pythagoras", "pythagoras"]
+
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    errors = [line for line in lines if "error" in line]
+    assert sorted(line["seed"] for line in errors) == [0, 1]
+    assert all(line["label"] == 'bellman:{"unknown": 1}' for line in errors)
+    assert "TypeError" in errors[0]["error"]
+
+
+def test_command_line(tmp_path, capsys):
+    output = tmp_path / "results.jsonl"
+    assert main(["--solver", "pythagoras", "--seeds", "2", "--workers", "1",
+                 "--output", str(output)]) == 0
+    assert len(output.read_text().splitlines()) == 2
+    assert "pythagoras: average score" in capsys.readouterr().out
+
+
+def test_command_line_plays_repeated_solvers_once(tmp_path, capsys):
+    output = tmp_path / "results.jsonl"
+    assert main(["--solver", "pythagoras", "--solver", "pythagoras", "--seeds", "2",
+                 "--workers", "1", "--output", str(output)]) == 0
+    assert len(output.read_text().splitlines()) == 2
+    assert capsys.readouterr().out.count("pythagoras: average score") == 1
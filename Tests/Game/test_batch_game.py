@@ -0,0 +1,90 @@
+from Main.Game.bitboard_woodoku import BitboardWoodoku
+from Main.Game.classic_woodoku import ClassicWoodoku, InvalidMoveError
+from Main.Game.piece import Piece
+from Main.Game.position import Position
+from Main.Solver.selector import Selector
+from Main.Util import generate_pieces
+from Main.Util.generate_pieces import get_piece_by_id, get_pieces, intern_piece
+
+from Main.Game.batch_woodoku import BatchWoodoku, batch_is_over, get_legal_moves_batch, legal_move_masks
+
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("policy", ["random", "greedy"])
+def test_matches_classic(policy: str):
+    seeds = list(range(20))
+    batch = BatchWoodoku(seeds)
+    games = [ClassicWoodoku(seed=seed) for seed in seeds]
+    rng = np.random.default_rng(0)
+
+    while (not batch.over.all()):
+        over = batch.over
+        assert [game.is_over() for game in games] == list(over)
+
+        slots, anchors = batch.random_moves(rng) if policy == "random" else batch.greedy_moves()
+        hands = batch.hands
+        rewards = batch.step(slots, anchors)
+
+        for i, game in enumerate(games):
+            if (over[i]):
+                assert rewards[i] == 0
+                continue
+            piece = get_piece_by_id(int(hands[i, slots[i]]))
+            assert game.place_piece(piece, Position.from_index(int(anchors[i]))) == rewards[i]
+            assert game.board == batch.boards[i].tolist()
+            assert game.consecutive_clears == batch.consecutive_clears[i]
+            assert sorted(piece.id for piece in game.get_available_pieces()) ==\
+                sorted(piece_id for piece_id in batch.hands[i] if piece_id >= 0)
+
+    assert batch.moves.min() > 0
+
+
+def test_greedy_beats_random():
+    random_scores = BatchWoodoku(list(range(50))).play(
+        lambda batch: batch.random_moves(np.random.default_rng(0)))
+    greedy_scores = BatchWoodoku(list(range(50))).play(BatchWoodoku.greedy_moves)
+    assert greedy_scores.mean() > random_scores.mean()
+
+
+def test_invalid_move():
+    batch = BatchWoodoku([0, 1])
+    slots, anchors = batch.greedy_moves()
+    batch.step(slots, anchors)
+    with pytest.raises(InvalidMoveError):
+        batch.step(slots, anchors)
+
+
+@pytest.mark.parametrize("density", [0.2, 0.5, 0.8])
+def test_legal_move_masks(density: float):
+    rng = np.random.default_rng(0)
+    boards = rng.random((30, 9, 9)) < density
+    masks = legal_move_masks(boards)
+    assert masks.shape == (30, len(get_pieces()), 81)
+
+    states = [BitboardWoodoku(board.tolist(), seed=i) for i, board in enumerate(boards)]
+    for state, mask in zip(states, masks):
+        for piece in get_pieces():
+            assert list(np.flatnonzero(mask[piece.id])) ==\
+                [pos.index for pos in state.get_legal_positions(piece)]
+
+    assert get_legal_moves_batch(states) == [Selector.get_legal_moves(state) for state in states]
+
+    hands = np.array([[piece.id for piece in state.get_available_pieces()] for state in states])
+    hands[::2, 0] = -1
+    expected = [all(not state.get_legal_positions(piece)
+                    for j, piece in enumerate(state.get_available_pieces()) if hands[i, j] >= 0)
+                for i, state in enumerate(states)]
+    assert list(batch_is_over(boards, hands)) == expected
+
+
+def test_legal_moves_batch_refuses_other_pieces(monkeypatch):
+    get_pieces()
+    monkeypatch.setattr(generate_pieces, "INTERNED_PIECES", generate_pieces.INTERNED_PIECES[:])
+    monkeypatch.setattr(generate_pieces, "PIECE_IDS", dict(generate_pieces.PIECE_IDS))
+    long_line = Piece([[True] * 10])
+    with pytest.raises(ValueError):
+        get_legal_moves_batch([ClassicWoodoku(available_pieces=[long_line])])
+    with pytest.raises(ValueError):
+        get_legal_moves_batch([ClassicWoodoku(available_pieces=[intern_piece(long_line)])])
@@ -0,0 +1,168 @@
+from Main.Game.bitboard_woodoku import BitboardWoodoku
+from Main.Game.classic_woodoku import ClassicWoodoku
+from Main.Game.position import Position
+from Main.Game.woodoku_game import WoodokuGame
+from Main.Util.generate_pieces import get_pieces
+from Tests.Game.Util.piece_util import get_cross_piece, get_dot_piece, get_horizontal_line_piece, get_vertical_line_piece
+
+import random
+import pytest
+
+
+@pytest.fixture
+def checkered_board() -> list[list[bool]]:
+    return [[(i + j) % 2 == 0 for j in range(9)] for i in range(9)]
+
+
+def play_random_game(game: WoodokuGame, move_seed: int) -> list[tuple[int, list[list[bool]]]]:
+    """Plays random legal moves until the game is over and records the
+    reward and the board after every move
+    """
+    move_rng = random.Random(move_seed)
+    history: list[tuple[int, list[list[bool]]]] = []
+    while (not game.is_over()):
+        moves = [(piece, Position(row, col))
+                 for piece in game.get_available_pieces()
+                 for row in range(9) for col in range(9)
+                 if game.piece_will_fit(piece, Position(row, col))]
+        reward = game.place_piece(*move_rng.choice(moves))
+        history.append((reward, game.board))
+    return history
+
+
+def test_default_constructor():
+    game = BitboardWoodoku()
+
+    assert not game.is_over()
+    assert game.get_available_pieces()[0] == get_vertical_line_piece(2)
+    assert game.get_available_pieces()[1] == get_vertical_line_piece(3)
+    assert game.get_available_pieces()[2] == get_horizontal_line_piece(3)
+    assert game.occupancy == 0
+    assert game.board == [[False] * 9 for _ in range(9)]
+
+
+def test_fit_and_bounds(checkered_board):
+    game = BitboardWoodoku(checkered_board, 0, [get_dot_piece()])
+    for row in range(9):
+        for col in range(9):
+            assert game.piece_will_fit(get_dot_piece(), Position(row, col))\
+                == ((row + col) % 2 == 1)
+
+    game = BitboardWoodoku()
+    assert game.piece_will_fit(get_horizontal_line_piece(3), Position(0, 6))
+    assert not game.piece_will_fit(get_horizontal_line_piece(3), Position(0, 7))
+    assert not game.piece_will_fit(get_vertical_line_piece(3), Position(7, 0))
+    assert not game.piece_will_fit(get_dot_piece(), Position(9, 0))
+
+
+def test_simultaneous_row_and_column():
+    # fill row 4 and column 4 apart from their shared tile, then
+    # complete both with a single dot
+    board = [[row == 4 or col == 4 for col in range(9)] for row in range(9)]
+    board[4][4] = False
+
+    classic = ClassicWoodoku(board, 2, [get_dot_piece()])
+    bitboard = BitboardWoodoku(board, 2, [get_dot_piece()])
+    assert bitboard.place_piece(get_dot_piece(), Position(4, 4)) ==\
+        classic.place_piece(get_dot_piece(), Position(4, 4))
+    assert bitboard.board == classic.board
+    assert bitboard.consecutive_clears == classic.consecutive_clears
+
+
+def test_cross_clears_square():
+    board = [[False] * 9 for _ in range(9)]
+    for row, col in [(3, 3), (3, 5), (5, 3), (5, 5)]:
+        board[row][col] = True
+    game = BitboardWoodoku(board, 0, [get_cross_piece()])
+    assert game.place_piece(get_cross_piece(), Position(3, 3)) == 5 + 18
+    assert game.occupancy == 0
+    assert game.consecutive_clears == 1
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 955])
+def test_matches_classic(seed: int):
+    classic_history = play_random_game(ClassicWoodoku(seed=seed), seed)
+    bitboard_history = play_random_game(BitboardWoodoku(seed=seed), seed)
+    assert bitboard_history == classic_history
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_legal_positions_match_classic(seed: int, checkered_board):
+    rng = random.Random(seed)
+    board = [[rng.random() < 0.4 for _ in range(9)] for _ in range(9)]
+    for test_board in [board, checkered_board]:
+        classic = ClassicWoodoku(test_board)
+        bitboard = BitboardWoodoku(test_board)
+        for piece in get_pieces():
+            assert [(pos.row, pos.col) for pos in bitboard.get_legal_positions(piece)] ==\
+                [(pos.row, pos.col) for pos in classic.get_legal_positions(piece)]
+        assert bitboard.is_over() == classic.is_over()
+
+
+@pytest.mark.parametrize("game_type", [ClassicWoodoku, BitboardWoodoku])
+def test_apply_and_undo_move(game_type):
+    game = game_type(seed=3)
+    move_rng = random.Random(3)
+
+    states, records = [], []
+    while (not game.is_over()):
+        states.append((game.board, game.get_available_pieces(), game.consecutive_clears))
+        moves = [(piece, pos) for piece in game.get_available_pieces()
+                 for pos in game.get_legal_positions(piece)]
+        move = move_rng.choice(moves)
+        records.append((move, game.apply_move(*move)))
+
+    # undoing every move goes back through exactly the same states
+    for (move, record), state in zip(reversed(records), reversed(states)):
+        game.undo_move(record)
+        assert (game.board, game.get_available_pieces(), game.consecutive_clears) == state
+
+    # and replaying the moves gives the same rewards and refills
+    for move, record in records:
+        assert game.place_piece(*move) == record.reward
+
+
+@pytest.mark.parametrize("game_type", [ClassicWoodoku, BitboardWoodoku])
+def test_independent_rng_streams(game_type):
+    expected = play_random_game(game_type(seed=5), 5)
+
+    # interleaving games and using the global RNG does not change a game
+    game = game_type(seed=5)
+    other = game_type(seed=6)
+    random.seed(1234)
+    other.place_piece(other.get_available_pieces()[0], Position(0, 0))
+    game_copy = game.copy()
+    assert play_random_game(game, 5) == expected
+    assert play_random_game(game_copy, 5) == expected
+
+
+@pytest.mark.parametrize("game_type", [ClassicWoodoku, BitboardWoodoku])
+def test_legal_moves_are_cached_per_version(game_type, monkeypatch):
+    game = game_type(seed=4)
+    calls = []
+    get_legal_positions = game_type.get_legal_positions
+
+    def counting_get_legal_positions(self, piece):
+        calls.append(piece)
+        return get_legal_positions(self, piece)
+    monkeypatch.setattr(game_type, "get_legal_positions", counting_get_legal_positions)
+
+    moves = game.get_legal_moves()
+    assert game.get_legal_moves() == moves
+    assert not game.is_over()
+    assert len(calls) == 3
+
+    # callers get their own copy of the moves
+    moves.clear()
+    assert len(game.get_legal_moves()) != 0
+
+    version = game.version
+    record = game.apply_move(*game.get_legal_moves()[0])
+    assert game.version != version
+    # the moves are computed again for the two pieces left in hand
+    game.get_legal_moves()
+    assert len(calls) == 5
+
+    game.undo_move(record)
+    assert game.get_legal_moves() == [(piece, pos) for piece in game.get_available_pieces()
+                                      for pos in get_legal_positions(game, piece)]
@@ -1,4 +1,6 @@
 from Main.Game.piece import InvalidPieceError, Piece
+from Main.Util.generate_pieces import get_piece_by_id, get_piece_id, get_pieces, intern_piece
+from Main.Util import generate_pieces
 import random
 import pytest
 
@@ -157,4 +159,60 @@ def test_constructor_mutation():
     piece_list.append([False, False])
     assert p.get_size() == (1,1)
     piece_list = []
-    assert p.get_size() == (1,1)
\ No newline at end of file
+    assert p.get_size() == (1,1)
+
+
+def test_piece_hash():
+    p = Piece([[True, False, False], [True, False, True]])
+    assert hash(p) == hash(p)
+    assert hash(p) == hash(Piece([[True, False, False], [True, False, True]]))
+    assert p != Piece([[True, False, False], [True, False, False]])
+    assert p != Piece([[True, False, False, False], [True, False, True, False]])
+
+    moves = {(p, 0): 1}
+    assert moves[(Piece([[True, False, False], [True, False, True]]), 0)] == 1
+
+def test_piece_geometry():
+    p = Piece([[False, True], [True, True], [False, True]])
+    assert p.cells == ((0, 1), (1, 0), (1, 1), (2, 1))
+    assert p.filled == 4
+    assert p.id is None
+
+@pytest.fixture
+def interned_pieces(monkeypatch):
+    """Gives the test it's own copy of the interning table, so that the pieces
+    it interns are gone afterwards
+    """
+    get_pieces()
+    monkeypatch.setattr(generate_pieces, "INTERNED_PIECES", generate_pieces.INTERNED_PIECES[:])
+    monkeypatch.setattr(generate_pieces, "PIECE_IDS", dict(generate_pieces.PIECE_IDS))
+
+
+def test_interned_catalog(interned_pieces):
+    pieces = get_pieces()
+    assert [piece.id for piece in pieces] == list(range(len(pieces)))
+    for piece in pieces:
+        assert get_piece_by_id(get_piece_id(piece)) is piece
+
+    dot = intern_piece(Piece([[True]]))
+    assert dot.id is not None and dot.id < len(pieces)
+    assert dot is pieces[dot.id]
+
+    long_line = intern_piece(Piece([[True] * 20]))
+    assert long_line.id is not None and long_line.id >= len(pieces)
+    assert intern_piece(Piece([[True] * 20])) is long_line
+    assert len(get_pieces()) == len(pieces)
+
+
+def test_interning_is_explicit(interned_pieces):
+    long_line = Piece([[True] * 20])
+    with pytest.raises(ValueError):
+        get_piece_id(long_line)
+    assert get_piece_id(intern_piece(long_line)) == get_piece_id(long_line)
+
+    # ids that are not the id of the interned piece are refused
+    dot = Piece([[True]])
+    with pytest.raises(ValueError):
+        get_piece_id(Piece([[True]], get_piece_id(dot) + 1))
+    with pytest.raises(ValueError):
+        intern_piece(Piece([[True] * 21], 0))
@@ -0,0 +1,87 @@
+from Main.Game.bitboard import board_to_mask, placement_table
+from Main.Game.bitboard_woodoku import BitboardWoodoku
+from Main.Game.classic_woodoku import ClassicWoodoku
+from Main.Game.placeability import PlaceabilityTracker, SurvivalTable, placeable_mask, placed_boards
+from Main.Game.position import Position
+from Main.Util.generate_pieces import get_piece_by_id, get_pieces
+
+import itertools
+import math
+import random
+import pytest
+
+
+def scan_legal_anchors(piece, occupancy: int) -> int:
+    return sum(1 << pos.index for pos, mask in placement_table(piece) if not mask & occupancy)
+
+
+def test_tracks_random_boards():
+    rng = random.Random(0)
+    tracker = PlaceabilityTracker()
+    # walk through boards that both fill and clear tiles between queries
+    occupancy = 0
+    for _ in range(40):
+        occupancy ^= rng.getrandbits(81) & rng.getrandbits(81)
+        for piece in get_pieces():
+            assert tracker.legal_anchors(piece.id, occupancy) == scan_legal_anchors(piece, occupancy)
+    assert tracker.placeable_pieces(occupancy) ==\
+        [piece.id for piece in get_pieces() if scan_legal_anchors(piece, occupancy)]
+
+
+def test_full_board():
+    tracker = PlaceabilityTracker()
+    assert tracker.placeable_pieces((1 << 81) - 1) == []
+    assert len(tracker.placeable_pieces(0)) == len(get_pieces())
+
+
+@pytest.mark.parametrize("game_type", [ClassicWoodoku, BitboardWoodoku])
+def test_is_over_matches_scan(game_type):
+    game = game_type(seed=8)
+    move_rng = random.Random(8)
+    records = []
+    while (True):
+        occupancy = board_to_mask(game.board)
+        for piece in game.get_available_pieces():
+            assert game.is_placeable(piece) == (scan_legal_anchors(piece, occupancy) != 0)
+        if (game.is_over()):
+            break
+        moves = [(piece, pos) for piece in game.get_available_pieces()
+                 for pos in game.get_legal_positions(piece)]
+        records.append(game.apply_move(*move_rng.choice(moves)))
+
+    # the tracked anchors follow the board back through undone moves
+    for record in reversed(records):
+        game.undo_move(record)
+        assert not game.is_over()
+
+
+def test_placeable_mask_matches_scan():
+    rng = random.Random(1)
+    for _ in range(20):
+        occupancy = rng.getrandbits(81) & rng.getrandbits(81)
+        expected = sum(1 << piece.id for piece in get_pieces() if scan_legal_anchors(piece, occupancy))
+        assert placeable_mask(occupancy) == expected
+
+
+def test_survival_of_empty_and_full_boards():
+    table = SurvivalTable()
+    assert table.survival_rate(0) == 1
+    assert table.survivable_hands((1 << 81) - 1) == 0
+
+
+def test_survival_matches_every_order():
+    def fits_in_order(occupancy, order):
+        if (len(order) == 1):
+            return scan_legal_anchors(get_piece_by_id(order[0]), occupancy) != 0
+        return any(fits_in_order(board, order[1:]) for board, _ in placed_boards(occupancy, order[0]))
+
+    # a dense board, with rows that a placement can still complete
+    rng = random.Random(2)
+    occupancy = rng.getrandbits(81) | rng.getrandbits(81) | rng.getrandbits(81)
+    catalog_ids = range(len(get_pieces()))
+    expected = sum(any(fits_in_order(occupancy, order) for order in itertools.permutations(hand))
+                   for hand in itertools.combinations(catalog_ids, 3))
+    table = SurvivalTable()
+    assert 0 < expected < math.comb(len(catalog_ids), 3)
+    assert table.survivable_hands(occupancy) == expected
+    assert len(table) == 1
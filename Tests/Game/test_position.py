@@ -0,0 +1,23 @@
+from Main.Game.position import Position
+
+import pickle
+import pytest
+
+
+def test_position_flyweight():
+    assert Position(3, 4) is Position(3, 4)
+    assert Position(3, 4) is Position.from_index(3 * 9 + 4)
+    assert Position(3, 4).index == 31
+    assert Position(3, 4) != Position(4, 3)
+    assert Position(10, 2) == Position(10, 2)
+    assert hash(Position(10, 2)) == hash(Position(10, 2))
+    assert {Position(3, 4): 1}[Position(3, 4)] == 1
+    assert pickle.loads(pickle.dumps(Position(3, 4))) is Position(3, 4)
+
+    with pytest.raises(AttributeError):
+        Position(3, 4).row = 5  # type: ignore
+    with pytest.raises(ValueError):
+        Position(-1, 0)
+    # (0, 9) would share it's index with (1, 0)
+    with pytest.raises(ValueError):
+        Position(0, 9).index
@@ -0,0 +1,57 @@
+from Main.Game.bitboard_woodoku import BitboardWoodoku
+from Main.Game.symmetry import Symmetry, canonicalize, catalog_symmetries, canonicalize_game, transform_mask, transform_move, transform_piece
+from Main.Util.generate_pieces import get_piece_id, get_pieces
+
+import random
+import pytest
+
+
+def random_state(seed: int) -> BitboardWoodoku:
+    rng = random.Random(seed)
+    board = [[rng.random() < 0.3 for _ in range(9)] for _ in range(9)]
+    return BitboardWoodoku(board, 0, rng.sample(get_pieces(), 3))
+
+
+@pytest.mark.parametrize("symmetry", list(Symmetry))
+def test_inverse(symmetry: Symmetry):
+    occupancy = random_state(0).occupancy
+    assert transform_mask(transform_mask(occupancy, symmetry), symmetry.inverse) == occupancy
+    for piece in get_pieces():
+        assert transform_piece(transform_piece(piece, symmetry), symmetry.inverse) is piece
+
+
+def test_catalog_symmetries():
+    # the catalog only has the vertical domino, so rows and columns cannot swap
+    assert catalog_symmetries() == [Symmetry.IDENTITY, Symmetry.ROTATE_180,
+                                    Symmetry.FLIP_HORIZONTAL, Symmetry.FLIP_VERTICAL]
+    for symmetry in catalog_symmetries():
+        assert {transform_piece(piece, symmetry) for piece in get_pieces()} == set(get_pieces())
+
+
+@pytest.mark.parametrize("symmetry", list(Symmetry))
+def test_moves_map_onto_moves(symmetry: Symmetry):
+    state = random_state(1)
+    image = BitboardWoodoku(transform_mask(state.occupancy, symmetry), 0,
+                            [transform_piece(piece, symmetry) for piece in state.get_available_pieces()])
+    for piece in state.get_available_pieces():
+        for pos in state.get_legal_positions(piece):
+            game, image_game = state.copy(), image.copy()
+            image_move = transform_move((piece, pos), symmetry)
+            assert image_game.place_piece(*image_move) == game.place_piece(piece, pos)
+            assert image_game.occupancy == transform_mask(game.occupancy, symmetry)
+            assert transform_move(image_move, symmetry.inverse) == (piece, pos)
+
+
+@pytest.mark.parametrize("seed", [2, 3])
+def test_images_share_canonical_state(seed: int):
+    state = random_state(seed)
+    ids = [get_piece_id(piece) for piece in state.get_available_pieces()]
+    canonical = canonicalize_game(state)
+    assert transform_mask(state.occupancy, canonical.symmetry) == canonical.occupancy
+
+    for symmetry in catalog_symmetries():
+        image_ids = [get_piece_id(transform_piece(piece, symmetry))
+                     for piece in state.get_available_pieces()]
+        image = canonicalize(transform_mask(state.occupancy, symmetry), image_ids[::-1])
+        assert image[:2] == canonical[:2]
+    assert canonicalize(state.occupancy, ids) == canonical
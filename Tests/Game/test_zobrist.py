@@ -0,0 +1,78 @@
+from Main.Game.bitboard_woodoku import BitboardWoodoku
+from Main.Game.classic_woodoku import ClassicWoodoku
+from Main.Game.position import Position
+from Main.Game.reduced_woodoku import ReducedWoodoku
+from Main.Game.zobrist import board_hash, zobrist_hash
+from Main.Util.generate_pieces import get_piece_id
+from Tests.Game.Util.piece_util import get_dot_piece, get_horizontal_line_piece
+
+import random
+
+
+def full_hash(game: BitboardWoodoku) -> int:
+    return zobrist_hash(game.occupancy,
+                        [get_piece_id(piece) for piece in game.get_available_pieces()],
+                        game.consecutive_clears)
+
+
+def test_board_hash_is_linear():
+    rng = random.Random(0)
+    for _ in range(50):
+        a, b = rng.getrandbits(81), rng.getrandbits(81)
+        assert board_hash(a) ^ board_hash(b) == board_hash(a ^ b)
+    assert board_hash(0) == 0
+
+
+def test_incremental_hash_matches_full_hash():
+    game = BitboardWoodoku(seed=4)
+    move_rng = random.Random(4)
+    hashes, records = [], []
+    while (not game.is_over()):
+        assert game.zobrist_hash == full_hash(game)
+        hashes.append(game.zobrist_hash)
+        moves = [(piece, pos) for piece in game.get_available_pieces()
+                 for pos in game.get_legal_positions(piece)]
+        records.append(game.apply_move(*move_rng.choice(moves)))
+
+    for record, expected in zip(reversed(records), reversed(hashes)):
+        game.undo_move(record)
+        assert game.zobrist_hash == expected
+
+
+def test_transpositions_share_hash():
+    dot, line = get_dot_piece(), get_horizontal_line_piece(3)
+    first = BitboardWoodoku(None, 0, [dot, line, dot])
+    second = BitboardWoodoku(None, 0, [dot, line, dot])
+    first.place_piece(dot, Position(0, 0))
+    first.place_piece(line, Position(5, 2))
+    second.place_piece(line, Position(5, 2))
+    second.place_piece(dot, Position(0, 0))
+    assert first.zobrist_hash == second.zobrist_hash
+
+    # the hand is part of the state
+    third = BitboardWoodoku(None, 0, [dot, line, dot])
+    third.place_piece(dot, Position(0, 0))
+    third.place_piece(dot, Position(5, 2))
+    assert third.zobrist_hash != first.zobrist_hash
+
+
+def test_classic_hash_matches_bitboard():
+    classic = ClassicWoodoku(seed=7)
+    bitboard = BitboardWoodoku(seed=7)
+    for game in [classic, bitboard]:
+        game.place_piece(game.get_available_pieces()[0], Position(0, 0))
+    assert classic.zobrist_hash == bitboard.zobrist_hash
+
+
+def test_reduced_hash_counts_consecutive_clears():
+    line = get_horizontal_line_piece(3)
+    board = [[col < 6 for col in range(9)]] + [[False] * 9 for _ in range(8)]
+    first = ReducedWoodoku(board, 0, [line, line, line])
+    second = ReducedWoodoku(board, 2, [line, line, line])
+    assert second.consecutive_clears == 2
+    assert first.zobrist_hash != second.zobrist_hash
+
+    # clearing the top row counts as a clear
+    first.place_piece(line, Position(0, 6))
+    assert first.consecutive_clears == 1
+    assert first.copy().consecutive_clears == 1
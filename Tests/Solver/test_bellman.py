@@ -0,0 +1,69 @@
+from Main.Environment.environment import Environment
+from Main.Game.bitboard_woodoku import BitboardWoodoku
+from Main.Game.classic_woodoku import ClassicWoodoku
+from Main.Game.position import Position
+from Main.Solver.bellman import Bellman
+from Main.Solver.pythagoras import Pythagoras
+from Main.Solver.selector import Selector
+from Main.Util.generate_pieces import get_piece_id
+from Tests.Game.Util.piece_util import get_dot_piece, get_horizontal_line_piece
+
+import pytest
+
+
+@pytest.mark.parametrize("game_type", [ClassicWoodoku, BitboardWoodoku])
+def test_plays_planned_moves(game_type):
+    state = game_type(seed=2)
+    solver = Bellman()
+    move = solver.get_move(state)
+    assert move in Selector.get_legal_moves(state)
+    planned = solver.planned_moves
+    assert len(planned) == 2
+
+    for expected in planned:
+        state.place_piece(*move)
+        move = solver.get_move(state)
+        assert move == expected
+        assert move in Selector.get_legal_moves(state)
+
+
+def test_plans_again_for_other_states():
+    solver = Bellman()
+    solver.get_move(BitboardWoodoku(seed=2))
+    state = BitboardWoodoku(seed=3)
+    assert solver.get_move(state) in Selector.get_legal_moves(state)
+
+
+def test_prefers_clearing_the_row():
+    # the dot should go on the end of the row that the line leaves one short
+    board = [[row == 0 and col < 5 for col in range(9)] for row in range(9)]
+    state = BitboardWoodoku(board, 0, [get_dot_piece(), get_horizontal_line_piece(3)])
+    plan = Bellman().plan(state.occupancy, tuple(get_piece_id(piece) for piece in state.get_available_pieces()), 0)
+    assert plan.occupancy == 0
+    assert {move for _, move in plan.moves} in [
+        {(get_horizontal_line_piece(3), Position(0, 5)), (get_dot_piece(), Position(0, 8))},
+        {(get_horizontal_line_piece(3), Position(0, 6)), (get_dot_piece(), Position(0, 5))}]
+
+
+def test_beats_first_legal_move():
+    assert Environment().run_game(Bellman(), BitboardWoodoku(seed=0)) >\
+        Environment().run_game(Pythagoras(), BitboardWoodoku(seed=0))
+
+
+def test_invalid_beam_width():
+    with pytest.raises(ValueError):
+        Bellman(beam_width=0)
+
+
+def test_plans_again_for_other_consecutive_clears():
+    state = BitboardWoodoku(seed=2)
+    solver = Bellman()
+    state.place_piece(*solver.get_move(state))
+
+    calls = []
+    plan = solver.plan
+    solver.plan = lambda *args: calls.append(args) or plan(*args)  # type: ignore
+    # the same board and pieces as the plan expects, but a different combo
+    other = BitboardWoodoku(state.board, state.consecutive_clears + 1, state.get_available_pieces())
+    assert solver.get_move(other) in Selector.get_legal_moves(other)
+    assert len(calls) == 1
@@ -0,0 +1,144 @@
+from Main.Game.bitboard_woodoku import BitboardWoodoku
+from Main.Game.classic_woodoku import ClassicWoodoku
+from Main.Game.reduced_woodoku import ReducedWoodoku
+from Main.Solver.euler import Euler
+from Main.Solver.selector import Selector
+
+import gc
+import pytest
+
+
+@pytest.mark.parametrize("game_type", [ClassicWoodoku, BitboardWoodoku])
+def test_move_is_legal(game_type):
+    state = game_type(seed=2)
+    board = state.board
+    move = Euler(seconds_per_move=0.05, seed=1).get_move(state)
+    assert move in Selector.get_legal_moves(state)
+    # searching does not change the given state
+    assert state.board == board
+    assert len(state.get_available_pieces()) == 3
+
+
+def test_search_visits_root():
+    root = Euler(seconds_per_move=0.05).search(BitboardWoodoku(seed=2))
+    assert root.times_visited > 0
+    assert root.times_visited == sum(child.times_visited for child in root.children.values())
+
+
+def test_root_parallel():
+    state = BitboardWoodoku(seed=2)
+    with Euler(seconds_per_move=0.05, seed=1, workers=2) as solver:
+        assert solver.get_move(state) in Selector.get_legal_moves(state)
+        assert solver.get_move(state) in Selector.get_legal_moves(state)
+        assert solver.last_stats is not None
+        assert solver.last_stats.iterations == sum(solver.last_stats.root_visits.values())
+
+
+def test_workers_shut_down_with_solver():
+    state = BitboardWoodoku(seed=2)
+    solver = Euler(seconds_per_move=0.05, seed=1, workers=2)
+    solver.get_move(state)
+    pool = solver._Euler__pool  # type: ignore
+    del solver
+    gc.collect()
+    with pytest.raises(RuntimeError):
+        pool.submit(print)
+
+
+@pytest.mark.parametrize("game_type", [ClassicWoodoku, BitboardWoodoku, ReducedWoodoku])
+@pytest.mark.parametrize("kwargs", [{"seconds_per_move": 0},
+                                    {"seconds_per_move": 0.05, "max_nodes": 1},
+                                    {"seconds_per_move": 0.05, "transposition_table_size": 1}])
+def test_moves_without_created_children(game_type, kwargs):
+    state = game_type(seed=1)
+    solver = Euler(seed=1, **kwargs)
+    # with no child of the root created there is no subtree to keep
+    assert solver.get_move(state) in Selector.get_legal_moves(state)
+    assert solver.get_move(state) in Selector.get_legal_moves(state)
+
+
+def test_root_parallel_without_iterations():
+    state = ClassicWoodoku(seed=1)
+    with Euler(seconds_per_move=0, seed=1, workers=2) as solver:
+        assert solver.get_move(state) in Selector.get_legal_moves(state)
+        assert solver.last_stats is not None
+        assert solver.last_stats.iterations == 0
+
+
+def test_transposition_table():
+    state = BitboardWoodoku(seed=2)
+    solver = Euler(seconds_per_move=0.05, seed=1, transposition_table_size=1000)
+    assert solver.get_move(state) in Selector.get_legal_moves(state)
+
+
+def reachable_nodes(root):
+    """Returns the indices of the nodes that can be reached from the root
+    """
+    store = root.store
+    reached = {root.index}
+    queue = [root.index]
+    while (len(queue) != 0):
+        for edge in store.edges(queue.pop()):
+            target = store.edge_target(edge)
+            if (target >= 0 and target not in reached):
+                reached.add(target)
+                queue.append(target)
+    return reached
+
+
+def test_memory_cap_bounds_tree():
+    state = BitboardWoodoku(seed=2)
+    root = Euler(seconds_per_move=0.1, seed=1, max_nodes=30).search(state)
+    assert len(root.store) == 30
+    # the search keeps going with rollouts from the full tree
+    assert root.times_visited > 30
+
+
+def test_memory_cap_counts_reachable_nodes():
+    state = BitboardWoodoku(seed=2)
+    # the transposition table does not cap the tree
+    root = Euler(seconds_per_move=0.1, seed=1, transposition_table_size=10).search(state)
+    assert len(root.store) > 10
+
+    # nodes replaced by transpositions are not kept around
+    root = Euler(seconds_per_move=0.3, seed=1, rollout_depth=0,
+                 transposition_table_size=100000).search(state)
+    assert len(reachable_nodes(root)) == len(root.store)
+
+    root = Euler(seconds_per_move=0.3, seed=1, rollout_depth=0,
+                 transposition_table_size=100000, max_nodes=50).search(state)
+    assert len(reachable_nodes(root)) == len(root.store) == 50
+
+
+def test_reuses_subtree():
+    state = BitboardWoodoku(seed=2)
+    solver = Euler(seconds_per_move=0.05, seed=1)
+    state.place_piece(*solver.get_move(state))
+
+    # the kept subtree was visited once when it was a leaf, before any of
+    # it's children existed
+    root = solver.search(state)
+    assert root.times_visited == sum(child.times_visited for child in root.children.values()) + 1
+
+    # a state that the last move does not lead to starts a new tree
+    root = solver.search(BitboardWoodoku(seed=3))
+    assert root.times_visited == sum(child.times_visited for child in root.children.values())
+
+
+def test_reports_search_stats():
+    reported = []
+    solver = Euler(seconds_per_move=0.1, stats_callback=reported.append)
+    state = ClassicWoodoku(seed=0)
+    move = solver.get_move(state)
+
+    assert reported == [solver.last_stats]
+    stats = reported[0]
+    assert stats.iterations > 0
+    assert stats.rollouts_per_second > 0
+    phases = (stats.selection_seconds + stats.expansion_seconds
+              + stats.rollout_seconds + stats.backpropagation_seconds)
+    assert 0 < phases <= stats.seconds
+    assert stats.max_depth >= 1
+    assert stats.tree_size > len(stats.root_visits) > 0
+    assert move in stats.root_visits
+    assert sum(stats.root_visits.values()) == stats.iterations
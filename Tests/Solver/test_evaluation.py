@@ -0,0 +1,49 @@
+from Main.Game.bitboard import FULL_MASK, ROW_MASKS, mask_to_board
+from Main.Game.bitboard_woodoku import BitboardWoodoku
+from Main.Solver.euler import Euler
+from Main.Solver.evaluation import (BoardFeatures, EvaluationWeights, batch_features, board_features,
+                                    evaluate, evaluate_batch, evaluate_state)
+from Main.Solver.selector import Selector
+
+import numpy as np
+import random
+import pytest
+
+
+def test_features():
+    assert board_features(0) == BoardFeatures(0, 0, 0, 0, 44)
+    assert board_features(FULL_MASK) == BoardFeatures(81, 0, 0, 0, 0)
+
+    # a full top row apart from it's last tile, which is isolated under a
+    # full second row
+    occupancy = (ROW_MASKS[0] | ROW_MASKS[1]) & ~(1 << 8)
+    features = board_features(occupancy)
+    assert features.filled == 17
+    assert features.isolated_holes == 1
+    # only the top row is one tile away from complete
+    assert features.near_complete == 1
+    assert features.fragmentation == 1 + 1 + 9
+    assert features.placeable_pieces == 44
+
+
+def test_batch_matches_single():
+    rng = random.Random(0)
+    masks = [rng.getrandbits(81) & rng.getrandbits(81) for _ in range(30)] + [0, FULL_MASK]
+    boards = np.array([mask_to_board(mask) for mask in masks])
+    assert batch_features(boards).tolist() == [list(board_features(mask)) for mask in masks]
+
+    weights = EvaluationWeights(1, 2, 3, 4, 5)
+    assert evaluate_batch(boards, weights).tolist() ==\
+        pytest.approx([evaluate(mask, weights) for mask in masks])
+
+
+def test_evaluate_state():
+    game = BitboardWoodoku(ROW_MASKS[4])
+    assert evaluate_state(game) == evaluate(ROW_MASKS[4])
+    assert evaluate(0) > evaluate(FULL_MASK)
+
+
+def test_euler_with_static_evaluation():
+    state = BitboardWoodoku(seed=2)
+    solver = Euler(seconds_per_move=0.05, rollout_depth=0, evaluation_weights=EvaluationWeights())
+    assert solver.get_move(state) in Selector.get_legal_moves(state)
@@ -0,0 +1,50 @@
+from Main.Game.bitboard_woodoku import BitboardWoodoku
+from Main.Game.classic_woodoku import ClassicWoodoku
+from Main.Solver.laplace import Laplace
+from Main.Solver.selector import Selector
+
+import pytest
+
+
+@pytest.mark.parametrize("game_type", [ClassicWoodoku, BitboardWoodoku])
+def test_plays_legal_moves(game_type):
+    state = game_type(seed=4)
+    solver = Laplace(samples=2)
+    for _ in range(6):
+        if (state.is_over()):
+            break
+        move = solver.get_move(state)
+        assert move in Selector.get_legal_moves(state)
+        state.place_piece(*move)
+
+
+def test_draws_hands_like_the_game():
+    hands = Laplace(samples=5).draw_hands()
+    assert len(hands) == 5
+    for hand in hands:
+        assert len(set(hand)) == 3
+        assert list(hand) == sorted(hand)
+
+
+def test_memoizes_chance_values():
+    solver = Laplace(samples=3)
+    hands = solver.draw_hands()
+    value = solver.chance_value(0, 0, hands)
+    assert len(solver.estimates) == 1
+    # the memoized estimate is used even for other hands
+    assert solver.chance_value(0, 0, solver.draw_hands()) == value
+    assert solver.estimates.hits == 1
+
+
+def test_penalizes_hands_that_end_the_game():
+    solver = Laplace(samples=3)
+    hands = solver.draw_hands()
+    full = (1 << 81) - 1
+    assert solver.chance_value(full & ~1, 0, hands) < solver.chance_value(0, 0, hands)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        Laplace(candidates=0)
+    with pytest.raises(ValueError):
+        Laplace(samples=0)
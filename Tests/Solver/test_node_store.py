@@ -0,0 +1,72 @@
+from Main.Game.bitboard_woodoku import BitboardWoodoku
+from Main.Solver.node_store import Node, NodeStore
+from Main.Solver.selector import Selector
+from Main.Util.random_stream import RandomStream
+
+
+def test_select_and_back_propagate():
+    store = NodeStore(2)
+    root = store.add_node()
+    moves = Selector.get_legal_moves(BitboardWoodoku())[:3]
+    store.add_children(root, moves)
+    children = [store.edge_target(edge) for edge in store.edges(root)]
+
+    # unvisited children are selected first, in order
+    for child in children:
+        edge = store.select(root)
+        assert store.edge_target(edge) == child
+        store.back_propagate([root, child], 10 * child)
+
+    assert store.visits(root) == 3
+    assert store.rewards(root) == 10 * sum(children)
+    # with equal visits the best average wins both UCB and the final choice
+    assert store.edge_target(store.select(root)) == children[-1]
+    assert store.edge_move(store.best_edge(root)) == moves[-1]
+
+
+def test_subtree_keeps_shared_nodes():
+    store = NodeStore()
+    root = store.add_node()
+    store.add_children(root, Selector.get_legal_moves(BitboardWoodoku())[:2])
+    first, second = [store.edge_target(edge) for edge in list(store.edges(root))[:2]]
+    store.add_children(first, [("a", 0), ("b", 1)])
+    # the second child shares the first child's first child
+    shared = store.edge_target(store.edges(first)[0])
+    store.add_children(second, [("c", 2)], [shared])
+    store.back_propagate([root, first, shared], 5)
+
+    subtree = Node(store.subtree(first), 0)
+    assert len(subtree.store) == 3
+    assert subtree.times_visited == 1
+    assert subtree.total_reward == 5
+    assert list(subtree.children) == [("a", 0), ("b", 1)]
+    assert subtree.children[("a", 0)].times_visited == 1
+    assert subtree.children[("a", 0)].parent == subtree
+
+
+def test_lazy_children_and_progressive_widening():
+    store = NodeStore()
+    root = store.add_node()
+    store.populate_children(root, BitboardWoodoku(), RandomStream(0))
+    assert store.child_count(root) == len(Selector.get_legal_moves(BitboardWoodoku()))
+    # no children exist until they are selected
+    assert len(store) == 1
+    assert Node(store, root).children == {}
+
+    for _ in range(100):
+        child = store.edge_target(store.select(root))
+        store.back_propagate([root, child], 1)
+    # with 99 visits the root may explore ceil(2 * sqrt(99)) = 20 children
+    assert len(Node(store, root).children) == 20
+    assert len(store) == 21
+
+
+def test_best_edge_prefers_created_children():
+    store = NodeStore()
+    root = store.add_node()
+    store.add_children(root, [("a", 0), ("b", 1), ("c", 2)], [-1, -1, -1])
+    # without any child the first move is still returned
+    assert store.best_edge(root) == store.edges(root)[0]
+
+    store.set_edge_target(store.edges(root)[1], store.add_node(root))
+    assert store.best_edge(root) == store.edges(root)[1]
@@ -0,0 +1,42 @@
+from Main.Game.bitboard_woodoku import BitboardWoodoku
+from Main.Game.classic_woodoku import ClassicWoodoku
+from Main.Solver.rollout import RolloutPolicy, rollout_state
+from Main.Solver.selector import Selector
+from Tests.Game.Util.piece_util import get_dot_piece
+
+import random
+import pytest
+
+
+@pytest.mark.parametrize("policy", list(RolloutPolicy))
+def test_rollout_is_deterministic(policy: RolloutPolicy):
+    state = BitboardWoodoku(seed=4)
+    first = rollout_state(state, random.Random(1), policy)
+    assert first > 0
+    assert rollout_state(state, random.Random(1), policy) == first
+    # the state itself is left untouched
+    assert state.occupancy == 0
+    assert len(state.get_available_pieces()) == 3
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_greedy_first_move(seed: int):
+    for game_type in [ClassicWoodoku, BitboardWoodoku]:
+        state = game_type(seed=seed)
+        best = 0
+        for move in Selector.get_legal_moves(state):
+            copy = state.copy()
+            best = max(best, copy.place_piece(*move))
+        assert rollout_state(state, random.Random(0), RolloutPolicy.GREEDY, max_depth=1) == best
+
+
+def test_rollout_depth_and_game_over():
+    full_board = [[True] * 9 for _ in range(9)]
+    assert rollout_state(BitboardWoodoku(full_board), random.Random(0)) == 0
+    assert rollout_state(BitboardWoodoku(), random.Random(0), max_depth=0) == 0
+
+    # the only move left completes the top row
+    board = [[True] * 9 for _ in range(9)]
+    board[0][0] = False
+    state = ClassicWoodoku(board, 1, [get_dot_piece()])
+    assert rollout_state(state, random.Random(0), RolloutPolicy.GREEDY, max_depth=1) == 1 + 18 * 2
@@ -0,0 +1,29 @@
+from Main.Solver.transposition_table import TranspositionTable
+
+import pytest
+
+
+def test_get_and_put():
+    table: TranspositionTable[str] = TranspositionTable(4)
+    assert table.get(1) is None
+    table.put(1, "a")
+    assert table.get(1) == "a"
+    assert table.hits == 1
+    assert len(table) == 1
+
+
+def test_evicts_least_recently_used():
+    table: TranspositionTable[str] = TranspositionTable(2)
+    table.put(1, "a")
+    table.put(2, "b")
+    table.get(1)
+    table.put(3, "c")
+    assert table.get(2) is None
+    assert table.get(1) == "a"
+    assert table.get(3) == "c"
+    assert table.evictions == 1
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        TranspositionTable(0)
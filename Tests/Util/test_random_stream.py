@@ -0,0 +1,39 @@
+from Main.Util.random_stream import RandomStream
+
+import pickle
+import random
+
+
+def test_matches_global_random():
+    random.seed(7)
+    expected = [random.random() for _ in range(10)]
+    stream = RandomStream(7)
+    assert [stream.random() for _ in range(10)] == expected
+
+
+def test_copy():
+    stream = RandomStream(3)
+    stream.random()
+    copy = stream.copy()
+    assert [copy.random() for _ in range(10)] == [stream.random() for _ in range(10)]
+    assert copy.split().random() == stream.split().random()
+
+
+def test_split():
+    first = RandomStream(3)
+    second = RandomStream(3)
+    second.random()
+    # splits only depend on the seed and how many times the stream was split
+    assert first.split().stream_seed == second.split().stream_seed
+    assert first.split().stream_seed != first.split().stream_seed
+    assert RandomStream(3).split().stream_seed != RandomStream(4).split().stream_seed
+
+
+def test_pickle():
+    stream = RandomStream(3)
+    stream.random()
+    stream.split()
+    copy = pickle.loads(pickle.dumps(stream))
+    assert copy.stream_seed == 3
+    assert copy.random() == stream.random()
+    assert copy.split().stream_seed == stream.split().stream_seed